@@ -0,0 +1,146 @@
+import random
+
+from .clock import BUCKET_COOLDOWN, get_clock
+from .logging_utils import log_info, log_warn
+
+BREAKER_THRESHOLD = 4
+BREAKER_PAUSE_S = 60
+BREAKER_MAX_PAUSE_S = 600
+BREAKER_TICK_S = 5
+HISTORY_WINDOW_ROWS = 25
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class BackoffPolicy:
+    """Exponential delays with upward jitter.
+
+    delay(n) = min(max_s, base_s * factor**n), plus up to `jitter` times
+    that on top. Jitter only adds time so a known minimum (e.g. the WAF
+    ban length as base_s) is never undercut, while rows retrying at the
+    same moment still spread out.
+    """
+
+    def __init__(self, base_s, factor=2.0, max_s=None, jitter=0.5, rng=None):
+        self.base_s = base_s
+        self.factor = factor
+        self.max_s = max_s
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt):
+        raw = self.base_s * self.factor ** max(0, attempt)
+        if self.max_s is not None:
+            raw = min(raw, self.max_s)
+        return raw * (1 + self._rng.uniform(0, self.jitter))
+
+
+class CircuitBreaker:
+    """Run-wide breaker for "Server Sibuk" submit responses.
+
+    After `threshold` consecutive busy responses (across rows) it opens:
+    the next submit first waits out a pause, then goes through as a single
+    probe. A successful probe closes the breaker; another busy answer
+    reopens it with the pause backed off. Busy rates per window of rows
+    are kept in `history` for the run stats.
+    """
+
+    def __init__(
+        self,
+        threshold=BREAKER_THRESHOLD,
+        pause=None,
+        clock=None,
+        window_rows=HISTORY_WINDOW_ROWS,
+        on_tick=None,
+    ):
+        self.threshold = threshold
+        self.pause = pause or BackoffPolicy(
+            BREAKER_PAUSE_S, max_s=BREAKER_MAX_PAUSE_S, jitter=0.2
+        )
+        self.clock = clock or get_clock()
+        self.window_rows = window_rows
+        self.on_tick = on_tick
+        self.state = STATE_CLOSED
+        self.consecutive = 0
+        self.trips = 0
+        self.paused_s = 0.0
+        self.attempts = 0
+        self.busy = 0
+        self.history = []
+        self._open_streak = 0
+        self._window = [0, 0, 0]  # rows, attempts, busy
+
+    @property
+    def busy_rate(self):
+        return self.busy / self.attempts if self.attempts else 0.0
+
+    def record(self, busy):
+        """Count one submit response (busy or accepted)."""
+        self.attempts += 1
+        self._window[1] += 1
+        if not busy:
+            if self.state == STATE_HALF_OPEN:
+                log_info("Server responding again; circuit closed.")
+            self.consecutive = 0
+            self._open_streak = 0
+            self.state = STATE_CLOSED
+            return
+        self.busy += 1
+        self._window[2] += 1
+        self.consecutive += 1
+        if self.state == STATE_HALF_OPEN or self.consecutive >= self.threshold:
+            self._open()
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self.trips += 1
+        log_warn(
+            "Server busy repeatedly; pausing submits.",
+            consecutive=self.consecutive,
+            trips=self.trips,
+        )
+
+    def wait_if_open(self):
+        """Before a submit: pause if open and let the submit be the probe."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        wait_s = self.pause.delay(self._open_streak)
+        self._open_streak += 1
+        log_info(f"Circuit open; pausing {wait_s:.0f}s before probing.")
+        remaining = wait_s
+        while remaining > 0:
+            step = min(BREAKER_TICK_S, remaining)
+            self.clock.sleep(step, BUCKET_COOLDOWN)
+            remaining -= step
+            if self.on_tick:
+                self.on_tick(remaining, wait_s)
+        self.paused_s += wait_s
+        self.state = STATE_HALF_OPEN
+        return wait_s
+
+    def row_finished(self):
+        self._window[0] += 1
+        if self._window[0] >= self.window_rows:
+            self._close_window()
+
+    def _close_window(self):
+        _, attempts, busy = self._window
+        if attempts:
+            self.history.append(round(busy / attempts, 2))
+        self._window = [0, 0, 0]
+
+    def stats(self):
+        """Summary fields for the run stats."""
+        if self._window[1]:
+            self._close_window()
+        return {
+            "submit_attempts": self.attempts,
+            "busy_responses": self.busy,
+            "busy_rate": round(self.busy_rate, 3),
+            "breaker_trips": self.trips,
+            "breaker_pause_s": round(self.paused_s, 1),
+            "busy_rate_history": "/".join(f"{rate:.2f}" for rate in self.history)
+            or "-",
+        }
@@ -1,5 +1,4 @@
-import time
-
+from .clock import BUCKET_DELAY, BUCKET_DOM, BUCKET_SERVER, get_clock
 from .logging_utils import log_info, log_warn
 from .settings import (
     AUTO_LOGIN_RESULT_TIMEOUT_S,
@@ -13,10 +12,13 @@ from .settings import (
 
 
 class ActivityMonitor:
-    def __init__(self, page, idle_timeout_ms, stop_event=None, timeout_scale=1.0):
+    def __init__(
+        self, page, idle_timeout_ms, stop_event=None, timeout_scale=1.0, clock=None
+    ):
         self.page = page
+        self.clock = clock or get_clock()
         self.idle_timeout_s = idle_timeout_ms / 1000
-        self.last_activity = time.monotonic()
+        self.last_activity = self.clock.monotonic()
         self.stop_event = stop_event
         self.timeout_scale = timeout_scale if timeout_scale and timeout_scale > 0 else 1.0
 
@@ -25,11 +27,17 @@ class ActivityMonitor:
             raise RuntimeError("Run stopped by user.")
 
     def mark_activity(self, _reason=None):
-        self.last_activity = time.monotonic()
+        self.last_activity = self.clock.monotonic()
+
+    def should_abort(self):
+        """True once the run has to end: stop requested or idle timeout."""
+        if self.stop_event and self.stop_event.is_set():
+            return True
+        return self.clock.monotonic() - self.last_activity > self.idle_timeout_s
 
     def idle_check(self):
         self._check_stop()
-        if time.monotonic() - self.last_activity > self.idle_timeout_s:
+        if self.clock.monotonic() - self.last_activity > self.idle_timeout_s:
             raise RuntimeError(
                 "Idle timeout reached (5 minutes without activity)."
             )
@@ -39,16 +47,28 @@ class ActivityMonitor:
             return None
         return timeout_s * self.timeout_scale
 
-    def wait_for_condition(self, condition, timeout_s=None, poll_ms=500):
+    def wait_for_condition(
+        self, condition, timeout_s=None, poll_ms=500, bucket=BUCKET_DOM
+    ):
+        """Poll `condition` until true or timeout; the wait counts as `bucket`."""
         timeout_s = self.scale_timeout(timeout_s)
-        start = time.monotonic()
-        while True:
-            if condition():
-                return True
-            if timeout_s is not None and time.monotonic() - start > timeout_s:
-                return False
-            self.idle_check()
-            self.page.wait_for_timeout(poll_ms)
+        with self.clock.measure(bucket):
+            start = self.clock.monotonic()
+            while True:
+                if condition():
+                    return True
+                if (
+                    timeout_s is not None
+                    and self.clock.monotonic() - start > timeout_s
+                ):
+                    return False
+                self.idle_check()
+                self.page.wait_for_timeout(poll_ms)
+
+    def pause(self, ms, bucket=BUCKET_DOM):
+        # page.wait_for_timeout keeps Playwright dispatching events.
+        with self.clock.measure(bucket):
+            self.page.wait_for_timeout(ms)
 
     def bot_click(self, selector_or_locator):
         self._check_stop()
@@ -78,13 +98,14 @@ class ActivityMonitor:
         max_retries = 3
         for i in range(max_retries):
             try:
-                self.page.goto(url, wait_until="domcontentloaded")
+                with self.clock.measure(BUCKET_SERVER):
+                    self.page.goto(url, wait_until="domcontentloaded")
                 return
             except Exception as e:
                 if i == max_retries - 1:
                     raise e
                 log_warn(f"Navigation failed (attempt {i+1}/{max_retries}): {e}. Retrying...")
-                time.sleep(2)
+                self.clock.sleep(2, BUCKET_SERVER)
 
 
 def install_user_activity_tracking(page, mark_activity):
@@ -203,11 +224,11 @@ def ensure_on_dirgc(
             return None
 
         # Retry finding fields for up to 10 seconds
-        start_find = time.monotonic()
+        start_find = monitor.clock.monotonic()
         user_loc = None
         pass_loc = None
         
-        while time.monotonic() - start_find < 10:
+        while monitor.clock.monotonic() - start_find < 10:
             # Try main page first
             user_loc = find_input_in_context(page, ["username", "user"], ["username", "user", "email"], ["Username", "Username or email"])
             pass_loc = find_input_in_context(page, ["password", "pwd"], ["password", "pwd"], ["Password"])
@@ -222,7 +243,7 @@ def ensure_on_dirgc(
             if user_loc and pass_loc:
                 break
             
-            page.wait_for_timeout(500)
+            monitor.pause(500)
         
         if not user_loc or not pass_loc:
              log_warn("Login fields not found after waiting; switching to manual login.")
@@ -268,7 +289,7 @@ def ensure_on_dirgc(
                  ".pf-c-alert__title",
              ]
              
-             start = time.monotonic()
+             start = monitor.clock.monotonic()
              while True:
                  if is_on_matchapro():
                      return True
@@ -284,11 +305,11 @@ def ensure_on_dirgc(
                             log_warn("Login error detected in frame.")
                             return False
 
-                 if time.monotonic() - start > monitor.scale_timeout(5):
+                 if monitor.clock.monotonic() - start > monitor.scale_timeout(5):
                      # Assume success if no error appeared quickly, let the caller wait for full load
                      return True
                  
-                 page.wait_for_timeout(500)
+                 monitor.pause(500)
 
         except Exception as e:
              log_warn(f"Error during auto-fill: {e}")
@@ -302,7 +323,7 @@ def ensure_on_dirgc(
             ".pf-c-alert__title",
         ]
 
-        start = time.monotonic()
+        start = monitor.clock.monotonic()
         while True:
             if is_on_matchapro():
                 return True
@@ -310,12 +331,12 @@ def ensure_on_dirgc(
                 locator = page.locator(selector)
                 if locator.count() > 0 and locator.first.is_visible():
                     return False
-            if time.monotonic() - start > monitor.scale_timeout(
+            if monitor.clock.monotonic() - start > monitor.scale_timeout(
                 AUTO_LOGIN_RESULT_TIMEOUT_S
             ):
                 return False
             monitor.idle_check()
-            page.wait_for_timeout(500)
+            monitor.pause(500)
 
     allow_autofill = use_saved_credentials
     autofill_attempted = False
@@ -403,7 +424,17 @@ def ensure_filter_panel_open(page, monitor):
         )
 
 
-def apply_filter(page, monitor, idsbr, nama_usaha, alamat):
+def apply_filter(
+    page, monitor, idsbr, nama_usaha, alamat, strategy="default", outcome=None
+):
+    """Search the card list and return the number of result cards.
+
+    strategy: "default" searches by IDSBR, rechecks non-unique results for
+    slow loading, then falls back to idsbr + nama + alamat; "fast" skips the
+    slow-load recheck; "combined" goes straight to idsbr + nama + alamat and
+    only falls back to IDSBR alone when that finds nothing. The searches
+    performed are appended to outcome["steps"].
+    """
     ensure_filter_panel_open(page, monitor)
 
     def get_results_snapshot():
@@ -439,6 +470,7 @@ def apply_filter(page, monitor, idsbr, nama_usaha, alamat):
             or is_visible(page, ".no-results")
             or results_changed(previous_snapshot),
             timeout_s=timeout_s,
+            bucket=BUCKET_SERVER,
         )
         wait_for_block_ui_clear(page, monitor, timeout_s=timeout_s)
         return page.locator(".usaha-card-header").count()
@@ -453,6 +485,7 @@ def apply_filter(page, monitor, idsbr, nama_usaha, alamat):
             or is_visible(page, ".no-results")
             or results_changed(previous_snapshot),
             timeout_s=timeout_s,
+            bucket=BUCKET_SERVER,
         )
         if not updated:
             return count
@@ -496,16 +529,33 @@ def apply_filter(page, monitor, idsbr, nama_usaha, alamat):
     def search_with(idsbr_value, nama_value, alamat_value):
         previous_snapshot = get_results_snapshot()
         set_filter_values(idsbr_value, nama_value, alamat_value)
-        monitor.wait_for_condition(lambda: False, timeout_s=0.5)
+        monitor.wait_for_condition(lambda: False, timeout_s=0.5, bucket=BUCKET_DELAY)
         return wait_for_results(previous_snapshot)
 
+    if outcome is None:
+        outcome = {}
+    steps = outcome.setdefault("steps", [])
+    outcome["strategy"] = strategy
+
+    if idsbr and strategy == "combined" and (nama_usaha or alamat):
+        steps.append("combined")
+        count = search_with(idsbr, nama_usaha, alamat)
+        if count:
+            return count
+        # Name/address differing from the export must not hide the row.
+        log_warn("No results for idsbr + nama_usaha + alamat; retry with IDSBR only.")
+        steps.append("idsbr")
+        return search_with(idsbr, "", "")
+
     if idsbr:
+        steps.append("idsbr")
         count = search_with(idsbr, "", "")
-        if count > 1:
+        if count > 1 and strategy != "fast":
             log_info(
                 "Results not unique; rechecking for slow loading.",
                 count=count,
             )
+            steps.append("recheck")
             count = retry_results_if_slow(count)
         if count == 1:
             return count
@@ -519,9 +569,11 @@ def apply_filter(page, monitor, idsbr, nama_usaha, alamat):
                     "Multiple results for IDSBR; retry with idsbr + nama_usaha + alamat.",
                     count=count,
                 )
+            steps.append("combined")
             return search_with(idsbr, nama_usaha, alamat)
         return count
 
+    steps.append("name")
     return search_with("", nama_usaha, alamat)
 
 
@@ -0,0 +1,276 @@
+import json
+import os
+import re
+import time
+
+from .browser import apply_filter, wait_for_block_ui_clear
+from .logging_utils import log_info, log_warn
+from .settings import CARD_INDEX_FILE, CARD_INDEX_MAX_AGE_H
+
+STATUS_SUDAH_GC = "sudah_gc"
+STATUS_DUPLIKAT = "duplikat"
+STATUS_BELUM = "belum"
+SKIP_STATUSES = {STATUS_SUDAH_GC: "Sudah GC", STATUS_DUPLIKAT: "Duplikat"}
+
+IDSBR_LABEL_PATTERN = re.compile(r"idsbr\W*(\d{6,})", re.IGNORECASE)
+IDSBR_PATTERN = re.compile(r"\b(\d{6,})\b")
+LOAD_MORE_SELECTORS = (
+    ".load-more",
+    "#load-more",
+    "button:has-text('Muat Lebih')",
+    "button:has-text('Load More')",
+    ".pagination .next:not(.disabled) a",
+    ".page-item.next:not(.disabled) a",
+)
+
+EXTRACT_CARDS_SCRIPT = """
+() => Array.from(document.querySelectorAll('.usaha-card')).map((card) => {
+  const header = card.querySelector('.usaha-card-header');
+  const badge = card.querySelector('.gc-badge');
+  const status = card.querySelector('.usaha-status.tidak-aktif');
+  return {
+    header: header ? header.innerText : '',
+    text: card.innerText || '',
+    sudahGc: !!(badge && badge.innerText.includes('Sudah GC')),
+    duplikat: !!(status && status.innerText.includes('Duplikat')),
+  };
+})
+"""
+
+
+def new_card_index():
+    return {"updated_at": 0, "cards": {}}
+
+
+def load_card_index(path=None):
+    path = path or CARD_INDEX_FILE
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return new_card_index()
+    if not isinstance(data.get("cards"), dict):
+        return new_card_index()
+    return data
+
+
+def save_card_index(index, path=None):
+    path = path or CARD_INDEX_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(index, handle, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def is_fresh(timestamp, max_age_h=CARD_INDEX_MAX_AGE_H, now=None):
+    if max_age_h is None:
+        return True
+    now = time.time() if now is None else now
+    return now - (timestamp or 0) <= max_age_h * 3600
+
+
+def card_status(index, idsbr, max_age_h=CARD_INDEX_MAX_AGE_H, now=None):
+    """Return the indexed status for `idsbr` if the entry is fresh enough."""
+    if not idsbr:
+        return None
+    entry = index["cards"].get(idsbr)
+    if not entry:
+        return None
+    if not is_fresh(entry.get("seen_at"), max_age_h, now):
+        return None
+    return entry.get("status")
+
+
+def complete_harvest_at(index, max_age_h=CARD_INDEX_MAX_AGE_H, now=None):
+    """Start time of the last full harvest if fresh enough, else None.
+
+    Only a full walk of the list says a card is the *only* one with its
+    name and address; an incremental harvest stops early by design.
+    """
+    complete_at = index.get("complete_at")
+    if not complete_at or not is_fresh(complete_at, max_age_h, now):
+        return None
+    return complete_at
+
+
+def update_card(index, idsbr, status, nama="", alamat="", text="", now=None):
+    """Insert or refresh an entry; returns True if anything changed."""
+    if not idsbr:
+        return False
+    now = time.time() if now is None else now
+    entry = index["cards"].get(idsbr)
+    changed = entry is None or entry.get("status") != status
+    if entry is None:
+        entry = index["cards"][idsbr] = {}
+    entry["status"] = status
+    entry["seen_at"] = now
+    if nama:
+        entry["nama"] = nama
+    if alamat:
+        entry["alamat"] = alamat
+    if text:
+        entry["text"] = text
+    index["updated_at"] = now
+    return changed
+
+
+def parse_card(raw):
+    text = " ".join((raw.get("text") or "").split())
+    match = IDSBR_LABEL_PATTERN.search(text) or IDSBR_PATTERN.search(text)
+    if not match:
+        return None
+    header_lines = [
+        line.strip() for line in (raw.get("header") or "").splitlines()
+    ]
+    nama = next((line for line in header_lines if line), "")
+    alamat = ""
+    for line in (raw.get("text") or "").splitlines():
+        label, _, value = line.partition(":")
+        if "alamat" in label.lower() and value.strip():
+            alamat = value.strip()
+            break
+    if raw.get("sudahGc"):
+        status = STATUS_SUDAH_GC
+    elif raw.get("duplikat"):
+        status = STATUS_DUPLIKAT
+    else:
+        status = STATUS_BELUM
+    return {
+        "idsbr": match.group(1),
+        "nama": nama,
+        "alamat": alamat,
+        "text": text,
+        "status": status,
+    }
+
+
+def lookup_card_status(page, monitor, idsbr):
+    """Single IDSBR search; return the card's status or None if not found."""
+    if not idsbr:
+        return None
+    if not apply_filter(page, monitor, idsbr, "", "", strategy="fast"):
+        return None
+    for raw in page.evaluate(EXTRACT_CARDS_SCRIPT) or []:
+        card = parse_card(raw)
+        if card and card["idsbr"] == idsbr:
+            return card["status"]
+    return None
+
+
+def visible_idsbrs(page):
+    idsbrs = set()
+    for raw in page.evaluate(EXTRACT_CARDS_SCRIPT) or []:
+        card = parse_card(raw)
+        if card:
+            idsbrs.add(card["idsbr"])
+    return idsbrs
+
+
+def load_more_cards(page, monitor, seen):
+    """Scroll / click the next page; return True if unseen cards appeared.
+
+    Compares IDSBRs rather than the card count: a "next page" link swaps
+    the list for one of the same length.
+    """
+    page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+    for selector in LOAD_MORE_SELECTORS:
+        locator = page.locator(selector)
+        if locator.count() > 0 and locator.first.is_visible():
+            wait_for_block_ui_clear(page, monitor, timeout_s=15)
+            monitor.bot_click(locator.first)
+            break
+    grew = monitor.wait_for_condition(
+        lambda: not visible_idsbrs(page) <= seen,
+        timeout_s=10,
+    )
+    wait_for_block_ui_clear(page, monitor, timeout_s=15)
+    return grew
+
+
+def harvest_card_index(
+    page,
+    monitor,
+    index_file=None,
+    max_batches=None,
+    stale_batches=3,
+):
+    """Page through the DIRGC card list and record every card's status.
+
+    With `stale_batches`, the harvest stops once that many consecutive
+    batches brought no new or changed cards (incremental refresh); pass
+    None to walk the whole list.
+    """
+    index = load_card_index(index_file)
+    known_before = len(index["cards"])
+    log_info(
+        "Harvesting card index.",
+        known=known_before,
+        updated_at=time.strftime(
+            "%Y-%m-%d %H:%M", time.localtime(index["updated_at"])
+        )
+        if index["updated_at"]
+        else "-",
+    )
+    apply_filter(page, monitor, "", "", "")
+
+    started_at = time.time()
+    seen = set()
+    batches = 0
+    stale = 0
+    changed_total = 0
+    while True:
+        monitor.idle_check()
+        raw_cards = page.evaluate(EXTRACT_CARDS_SCRIPT) or []
+        changed = 0
+        now = time.time()
+        for raw in raw_cards:
+            card = parse_card(raw)
+            if not card or card["idsbr"] in seen:
+                continue
+            seen.add(card["idsbr"])
+            if update_card(
+                index,
+                card["idsbr"],
+                card["status"],
+                nama=card["nama"],
+                alamat=card["alamat"],
+                text=card["text"],
+                now=now,
+            ):
+                changed += 1
+        batches += 1
+        changed_total += changed
+        stale = 0 if changed else stale + 1
+        log_info(
+            "Harvest batch.",
+            batch=batches,
+            cards=len(seen),
+            changed=changed,
+        )
+        save_card_index(index, index_file)
+
+        if max_batches is not None and batches >= max_batches:
+            break
+        if stale_batches is not None and stale >= stale_batches:
+            log_info("No changes in recent batches; stopping harvest.")
+            break
+        if not load_more_cards(page, monitor, seen):
+            if stale_batches is None and max_batches is None:
+                # Whole list walked: cards not seen since started_at are gone.
+                index["complete_at"] = started_at
+                save_card_index(index, index_file)
+            break
+
+    if not seen:
+        log_warn("No cards found while harvesting.")
+    log_info(
+        "Harvest completed.",
+        cards=len(seen),
+        changed=changed_total,
+        total=len(index["cards"]),
+        path=index_file or CARD_INDEX_FILE,
+    )
+    return index
@@ -2,16 +2,34 @@ import argparse
 import os
 import sys
 
-from playwright.sync_api import sync_playwright
-
 from .browser import ActivityMonitor, ensure_on_dirgc, install_user_activity_tracking
+from .card_index import harvest_card_index
 from .credentials import load_credentials
+from .events import EventBus, JsonlEventWriter
+from .failure_trace import TRACE_BUDGET_MB, TRACE_WINDOW_ROWS, FailureTracer
+from .logging_utils import (
+    LEVELS,
+    flush_logs,
+    log_info,
+    set_json_log_file,
+    set_log_level,
+)
+from .match_corpus import MatchRecorder
+from .matching import set_match_recorder
+from .network_timing import NetworkTimingCollector
+from .page_metrics import METRICS_EVERY_ROWS
 from .processor import process_excel_rows
+from .profiling import RunProfiler
+from .session import BrowserSession
 from .settings import (
+    CARD_INDEX_FILE,
+    CARD_INDEX_MAX_AGE_H,
     DEFAULT_CREDENTIALS_FILE,
     DEFAULT_EXCEL_FILE,
     DEFAULT_IDLE_TIMEOUT_MS,
     DEFAULT_WEB_TIMEOUT_S,
+    INPUT_FINGERPRINT_FILE,
+    MATCH_CORPUS_DIR,
 )
 
 
@@ -73,6 +91,164 @@ def build_parser():
         default=DEFAULT_WEB_TIMEOUT_S,
         help="Default timeout (seconds) for web loading and waits.",
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help=(
+            "Only process rows that are new or changed since they were last "
+            "completed (uses stored input fingerprints)."
+        ),
+    )
+    parser.add_argument(
+        "--diff-against",
+        help=(
+            "Previous directory export; only rows that are new or changed "
+            "compared to it are processed."
+        ),
+    )
+    parser.add_argument(
+        "--fingerprint-file",
+        help=(
+            "Input fingerprint store. "
+            f"Defaults to {INPUT_FINGERPRINT_FILE}."
+        ),
+    )
+    parser.add_argument(
+        "--scan-only",
+        action="store_true",
+        help=(
+            "Read-only pre-flight: search and classify rows (not_found, "
+            "ambiguous, sudah_gc, duplikat, ready) without submitting."
+        ),
+    )
+    parser.add_argument(
+        "--harvest",
+        action="store_true",
+        help=(
+            "Page through the DIRGC card list and refresh the local card "
+            "status index instead of processing the Excel file."
+        ),
+    )
+    parser.add_argument(
+        "--harvest-full",
+        action="store_true",
+        help=(
+            "With --harvest, walk the whole list instead of stopping once "
+            "recent batches bring no changes."
+        ),
+    )
+    parser.add_argument(
+        "--use-card-index",
+        action="store_true",
+        help="Skip rows already marked Sudah GC/Duplikat in the card index.",
+    )
+    parser.add_argument(
+        "--card-index-file",
+        help=f"Card status index file. Defaults to {CARD_INDEX_FILE}.",
+    )
+    parser.add_argument(
+        "--card-index-max-age-h",
+        type=float,
+        default=CARD_INDEX_MAX_AGE_H,
+        help="Ignore card index entries older than this many hours.",
+    )
+    parser.add_argument(
+        "--record-matches",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help=(
+            "Record every card matching decision (row values and card "
+            f"texts) to a JSON-lines corpus. Defaults to {MATCH_CORPUS_DIR}/."
+        ),
+    )
+    parser.add_argument(
+        "--events-file",
+        metavar="PATH",
+        help=(
+            "Write the run event stream (row_started, phase_completed, "
+            "row_finished, rate_limited, ...) as JSON lines for metrics."
+        ),
+    )
+    parser.add_argument(
+        "--network-timing",
+        action="store_true",
+        help=(
+            "Record DIRGC request timings (queue, TTFB, download, status, "
+            "size) per row and phase to logs/YYYYMMDD/network_run*.csv."
+        ),
+    )
+    parser.add_argument(
+        "--trace-failures",
+        nargs="?",
+        type=int,
+        const=TRACE_WINDOW_ROWS,
+        metavar="N",
+        help=(
+            "Keep a Playwright trace of the last N rows (default "
+            f"{TRACE_WINDOW_ROWS}) and save it to logs/YYYYMMDD/traces/ only "
+            "when a row ends in error/gagal."
+        ),
+    )
+    parser.add_argument(
+        "--trace-budget-mb",
+        type=int,
+        default=TRACE_BUDGET_MB,
+        help="Delete the oldest saved traces beyond this total size.",
+    )
+    parser.add_argument(
+        "--record-har",
+        metavar="PATH",
+        help=(
+            "Record the DIRGC requests of the run (login excluded) to a HAR "
+            "file, plus session cookies in PATH.state.json, for offline "
+            "replay. Both files grant access to the account; keep them private."
+        ),
+    )
+    parser.add_argument(
+        "--replay-har",
+        metavar="PATH",
+        help=(
+            "Serve the run from a recorded HAR instead of the network; "
+            "requests missing from the recording are aborted."
+        ),
+    )
+    parser.add_argument(
+        "--no-humanize",
+        dest="humanize",
+        action="store_false",
+        help="Skip the random delays between actions (only for HAR replays).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Run the processing loop under cProfile, save run*.prof next to "
+            "the run log and log the hottest functions per category."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-every",
+        type=int,
+        default=METRICS_EVERY_ROWS,
+        metavar="N",
+        help=(
+            "Sample page memory/DOM metrics every N rows and recycle the "
+            "page when it degrades (0 disables)."
+        ),
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=tuple(LEVELS),
+        default="INFO",
+        type=str.upper,
+        help="Minimum log level. DEBUG also prints every match candidate.",
+    )
+    parser.add_argument(
+        "--log-json",
+        metavar="PATH",
+        help="Also write log records as JSON lines to PATH.",
+    )
     parser.add_argument(
         "-k",
         "--keep-open",
@@ -82,6 +258,12 @@ def build_parser():
     return parser
 
 
+def wait_for_enter():
+    # Queued log lines must reach the terminal before the prompt does.
+    flush_logs()
+    input("Press Enter to close the browser...")
+
+
 def validate_row_range(start_row, end_row):
     if start_row is not None and start_row < 1:
         raise ValueError("--start must be >= 1.")
@@ -106,7 +288,31 @@ def run_dirgc(
     stop_event=None,
     progress_callback=None,
     wait_for_close=None,
+    changed_only=False,
+    diff_against=None,
+    fingerprint_file=None,
+    scan_only=False,
+    harvest=False,
+    harvest_full=False,
+    use_card_index=False,
+    card_index_file=None,
+    card_index_max_age_h=None,
+    record_matches=None,
+    event_bus=None,
+    events_file=None,
+    metrics_every=METRICS_EVERY_ROWS,
+    network_timing=False,
+    trace_failures=None,
+    trace_budget_mb=TRACE_BUDGET_MB,
+    record_har=None,
+    replay_har=None,
+    humanize=True,
+    profile=False,
 ):
+    # Imported here so `--help`, the GUI window and tooling that only needs
+    # the parser start without loading Playwright.
+    from playwright.sync_api import sync_playwright
+
     ensure_playwright_browsers()
     credentials_value = credentials
     if not manual_only and credentials_value is None:
@@ -116,69 +322,14 @@ def run_dirgc(
     timeout_scale = web_timeout_s / DEFAULT_WEB_TIMEOUT_S
 
     with sync_playwright() as p:
-        # browser = p.chromium.launch(headless=headless)
-        # context = browser.new_context()
-        # page = context.new_page()
-        browser = p.chromium.launch(
+        session = BrowserSession(
+            p,
             headless=headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-infobars',
-                '--window-position=-5,-5',
-                '--disable-extensions',
-                '--user-agent=Mozilla/5.0 (Linux; Android 12; M2010J19CG Build/SKQ1.211202.001; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/143.0.7499.192 Mobile Safari/537.36'
-            ]
-        )
-        
-        # CONTEXT ANDROID WEBVIEW
-        context = browser.new_context(
-            viewport={'width': 390, 'height': 844},
-            screen={'width': 1080, 'height': 2340},
-            device_scale_factor=2.625,
-            is_mobile=True,
-            has_touch=True,
-            user_agent="Mozilla/5.0 (Linux; Android 12; M2010J19CG Build/SKQ1.211202.001; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/143.0.7499.192 Mobile Safari/537.36",
-            extra_http_headers={
-                "Sec-Ch-Ua": '"Android WebView";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
-                "Sec-Ch-Ua-Mobile": "?1",
-                "Sec-Ch-Ua-Platform": '"Android"',
-            },
-            java_script_enabled=True,
-            permissions=["geolocation"]
+            web_timeout_s=web_timeout_s,
+            record_har_path=record_har,
+            replay_har_path=replay_har,
         )
-        page = context.new_page()
-        page.set_default_timeout(web_timeout_s * 1000)
-        page.set_default_navigation_timeout(web_timeout_s * 1000)
-        
-        # STEALTH SCRIPTS - HAPUS SEMUA DETECTION FLAGS
-        page.add_init_script("""
-            // Hapus webdriver flag
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            
-            // Override Chrome detection
-            window.chrome = {runtime: {}};
-            
-            // Permissions & languages Android
-            Object.defineProperty(navigator, 'permissions', {
-                get: () => ({query: () => Promise.resolve({state: 'granted'})})});
-            
-            // Plugins empty (mobile)
-            Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-            
-            // Languages Indonesia
-            Object.defineProperty(navigator, 'languages', {get: () => ['id-ID', 'id', 'en-US', 'en']});
-            
-            // WebGL fingerprint spoof
-            const getParameter = WebGLRenderingContext.getParameter;
-            WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                if (parameter === 37445) return 'Intel Inc.';
-                if (parameter === 37446) return 'Intel(R) UHD Graphics 630';
-                return getParameter(parameter);
-            };
-        """)
+        page = session.start()
 
         monitor = ActivityMonitor(
             page,
@@ -186,7 +337,41 @@ def run_dirgc(
             stop_event=stop_event,
             timeout_scale=timeout_scale,
         )
-        install_user_activity_tracking(page, monitor.mark_activity)
+        session.attach_monitor(monitor)
+        session.add_page_hook(
+            lambda new_page: install_user_activity_tracking(
+                new_page, monitor.mark_activity
+            )
+        )
+
+        event_writer = None
+        if events_file:
+            event_bus = event_bus or EventBus()
+            event_writer = event_bus.subscribe(JsonlEventWriter(events_file))
+
+        network_collector = None
+        if network_timing:
+            event_bus = event_bus or EventBus()
+            network_collector = event_bus.subscribe(NetworkTimingCollector())
+            session.add_page_hook(network_collector.attach)
+
+        failure_tracer = None
+        if trace_failures:
+            event_bus = event_bus or EventBus()
+            failure_tracer = event_bus.subscribe(
+                FailureTracer(window_rows=trace_failures, budget_mb=trace_budget_mb)
+            )
+            session.add_page_hook(failure_tracer.attach)
+
+        profiler = None
+        if profile:
+            event_bus = event_bus or EventBus()
+            profiler = event_bus.subscribe(RunProfiler())
+
+        match_recorder = None
+        if record_matches is not None:
+            match_recorder = MatchRecorder(record_matches or None)
+            set_match_recorder(match_recorder)
 
         try:
             ensure_on_dirgc(
@@ -195,39 +380,83 @@ def run_dirgc(
                 use_saved_credentials=not manual_only,
                 credentials=credentials_value,
             )
-            process_excel_rows(
-                page,
-                monitor=monitor,
-                excel_file=excel_file,
-                use_saved_credentials=not manual_only,
-                credentials=credentials_value,
-                start_row=start_row,
-                end_row=end_row,
-                progress_callback=progress_callback,
-            )
+            if profiler:
+                profiler.start()
+            if harvest:
+                harvest_card_index(
+                    page,
+                    monitor,
+                    index_file=card_index_file,
+                    stale_batches=None if harvest_full else 3,
+                )
+            else:
+                process_excel_rows(
+                    page,
+                    monitor=monitor,
+                    excel_file=excel_file,
+                    use_saved_credentials=not manual_only,
+                    credentials=credentials_value,
+                    start_row=start_row,
+                    end_row=end_row,
+                    progress_callback=progress_callback,
+                    changed_only=changed_only,
+                    diff_against=diff_against,
+                    fingerprint_file=fingerprint_file,
+                    scan_only=scan_only,
+                    use_card_index=use_card_index,
+                    card_index_file=card_index_file,
+                    card_index_max_age_h=card_index_max_age_h,
+                    event_bus=event_bus,
+                    session=session,
+                    metrics_every=metrics_every,
+                    humanize=humanize,
+                )
         except KeyboardInterrupt:
             if keep_open:
                 if wait_for_close:
                     wait_for_close()
                 else:
-                    input("Press Enter to close the browser...")
+                    wait_for_enter()
             raise
         except RuntimeError as e:
             if "Run stopped by user" in str(e) and keep_open:
                  if wait_for_close:
                     wait_for_close()
                  else:
-                    input("Press Enter to close the browser...")
+                    wait_for_enter()
             raise
-
-        if keep_open:
-            if wait_for_close:
-                wait_for_close()
-            else:
-                input("Press Enter to close the browser...")
-
-        context.close()
-        browser.close()
+        else:
+            if keep_open:
+                if profiler:
+                    # Keep the wait for the user out of the profile.
+                    profiler.stop()
+                if wait_for_close:
+                    wait_for_close()
+                else:
+                    wait_for_enter()
+        finally:
+            if profiler:
+                event_bus.unsubscribe(profiler)
+                profiler.stop()
+            if event_writer:
+                event_bus.unsubscribe(event_writer)
+                event_writer.close()
+            if network_collector:
+                event_bus.unsubscribe(network_collector)
+                network_collector.close()
+            if failure_tracer:
+                event_bus.unsubscribe(failure_tracer)
+                failure_tracer.close()
+            if match_recorder:
+                set_match_recorder(None)
+                match_recorder.close()
+                log_info(
+                    "Match corpus saved.",
+                    count=match_recorder.count,
+                    path=match_recorder.path,
+                )
+            # Also on errors: the HAR is only written when the context closes.
+            session.close()
 
 
 def main():
@@ -238,18 +467,47 @@ def main():
         validate_row_range(args.start_row, args.end_row)
     except ValueError as exc:
         parser.error(str(exc))
+    if not args.humanize and not args.replay_har:
+        parser.error("--no-humanize is only allowed together with --replay-har.")
 
-    run_dirgc(
-        headless=args.headless,
-        manual_only=args.manual_only,
-        credentials_file=args.credentials_file,
-        excel_file=args.excel_file,
-        start_row=args.start_row,
-        end_row=args.end_row,
-        idle_timeout_ms=args.idle_timeout_ms,
-        web_timeout_s=args.web_timeout_s,
-        keep_open=args.keep_open,
-    )
+    set_log_level(args.log_level)
+    if args.log_json:
+        set_json_log_file(args.log_json)
+
+    try:
+        run_dirgc(
+            headless=args.headless,
+            manual_only=args.manual_only,
+            credentials_file=args.credentials_file,
+            excel_file=args.excel_file,
+            start_row=args.start_row,
+            end_row=args.end_row,
+            idle_timeout_ms=args.idle_timeout_ms,
+            web_timeout_s=args.web_timeout_s,
+            keep_open=args.keep_open,
+            changed_only=args.changed_only,
+            diff_against=args.diff_against,
+            fingerprint_file=args.fingerprint_file,
+            scan_only=args.scan_only,
+            harvest=args.harvest,
+            harvest_full=args.harvest_full,
+            use_card_index=args.use_card_index,
+            card_index_file=args.card_index_file,
+            card_index_max_age_h=args.card_index_max_age_h,
+            record_matches=args.record_matches,
+            events_file=args.events_file,
+            metrics_every=args.metrics_every,
+            network_timing=args.network_timing,
+            trace_failures=args.trace_failures,
+            trace_budget_mb=args.trace_budget_mb,
+            record_har=args.record_har,
+            replay_har=args.replay_har,
+            humanize=args.humanize,
+            profile=args.profile,
+        )
+    finally:
+        set_json_log_file(None)
+        flush_logs()
 
 
 def ensure_playwright_browsers():
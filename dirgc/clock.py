@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import defaultdict
+
+BUCKET_DELAY = "delay"
+BUCKET_SERVER = "server"
+BUCKET_DOM = "dom"
+BUCKET_COOLDOWN = "cooldown"
+BUCKET_ACTIVE = "active"
+TIME_BUCKETS = (BUCKET_DELAY, BUCKET_SERVER, BUCKET_DOM, BUCKET_COOLDOWN)
+
+
+class _Span:
+    __slots__ = ("clock", "bucket", "started", "children")
+
+    def __init__(self, clock, bucket):
+        self.clock = clock
+        self.bucket = bucket
+
+    def __enter__(self):
+        self.started = self.clock.monotonic()
+        self.children = 0.0
+        self.clock._stack().append(self)
+        return self
+
+    def __exit__(self, *_exc):
+        stack = self.clock._stack()
+        stack.pop()
+        elapsed = self.clock.monotonic() - self.started
+        # Nested spans keep their own time; the outer one gets the rest.
+        self.clock._add(self.bucket, elapsed - self.children)
+        if stack:
+            stack[-1].children += elapsed
+        return False
+
+
+class Clock:
+    """Time source for the processor and browser helpers.
+
+    Every deliberate wait goes through sleep() or a measure() span tagged
+    with a bucket (delay, server, dom, cooldown), so a run can report
+    where its wall time went; whatever is left is active work. Tests and
+    simulations swap in a FakeClock with set_clock().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.totals = defaultdict(float)
+        self.started = self.monotonic()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def _sleep(self, seconds):
+        time.sleep(seconds)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, bucket, seconds):
+        with self._lock:
+            self.totals[bucket] += max(0.0, seconds)
+
+    def total(self, bucket):
+        """Seconds attributed to `bucket` since reset()."""
+        with self._lock:
+            return self.totals.get(bucket, 0.0)
+
+    def measure(self, bucket):
+        """Context manager attributing the enclosed wall time to `bucket`."""
+        return _Span(self, bucket)
+
+    def sleep(self, seconds, bucket=BUCKET_DELAY):
+        with self.measure(bucket):
+            self._sleep(seconds)
+
+    def reset(self):
+        """Start a new accounting period (one run)."""
+        with self._lock:
+            self.totals = defaultdict(float)
+        self.started = self.monotonic()
+
+    def report(self):
+        """Seconds per bucket since reset(), plus the unattributed rest."""
+        elapsed = self.monotonic() - self.started
+        with self._lock:
+            report = {bucket: self.totals.get(bucket, 0.0) for bucket in TIME_BUCKETS}
+        report[BUCKET_ACTIVE] = max(0.0, elapsed - sum(report.values()))
+        return report
+
+
+class FakeClock(Clock):
+    """Virtual clock: sleeping and page waits only move `now` forward."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+        super().__init__()
+
+    def monotonic(self):
+        return self.now
+
+    def _sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+    def advance(self, seconds):
+        self._sleep(seconds)
+
+
+def format_time_report(report):
+    total = sum(report.values()) or 1.0
+    return {
+        f"time_{bucket}": f"{seconds:.1f}s ({seconds / total:.0%})"
+        for bucket, seconds in report.items()
+    }
+
+
+_CLOCK = Clock()
+
+
+def get_clock():
+    return _CLOCK
+
+
+def set_clock(clock):
+    """Install `clock` process-wide; None restores the real clock."""
+    global _CLOCK
+    _CLOCK = clock or Clock()
+    return _CLOCK
@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+
+RUN_STARTED = "run_started"
+ROW_STARTED = "row_started"
+PHASE_COMPLETED = "phase_completed"
+ROW_FINISHED = "row_finished"
+RATE_LIMITED = "rate_limited"
+COOLDOWN_TICK = "cooldown_tick"
+SESSION_RELOGIN = "session_relogin"
+RUN_FINISHED = "run_finished"
+
+EVENT_KINDS = (
+    RUN_STARTED,
+    ROW_STARTED,
+    PHASE_COMPLETED,
+    ROW_FINISHED,
+    RATE_LIMITED,
+    COOLDOWN_TICK,
+    SESSION_RELOGIN,
+    RUN_FINISHED,
+)
+
+# Row phases in the order PHASE_COMPLETED reports them.
+PHASE_ORDER = ("navigate", "search", "match", "form", "submit")
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    kind: str
+    timestamp: float
+    data: dict = field(default_factory=dict)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def to_dict(self):
+        return {"kind": self.kind, "timestamp": self.timestamp, **self.data}
+
+
+class EventBus:
+    """Synchronous publish/subscribe hub for run events.
+
+    emit() returns immediately when nobody is subscribed, so the processor
+    can publish freely; hot paths that need to build expensive payloads can
+    check `active` first. Subscriber errors are swallowed so a broken
+    consumer never stops a run.
+    """
+
+    def __init__(self):
+        self._subscribers = ()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, callback, kinds=None):
+        kinds = frozenset(kinds) if kinds else None
+        with self._lock:
+            self._subscribers = self._subscribers + ((callback, kinds),)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = tuple(
+                item for item in self._subscribers if item[0] is not callback
+            )
+
+    def emit(self, kind, **data):
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        event = RunEvent(kind, time.time(), data)
+        for callback, kinds in subscribers:
+            if kinds is not None and kind not in kinds:
+                continue
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+
+def progress_adapter(progress_callback):
+    """Wrap the legacy progress_callback(processed, total, excel_row)."""
+
+    def handle(event):
+        if event.kind == RUN_STARTED:
+            progress_callback(0, event["total"], 0)
+        else:
+            progress_callback(event["processed"], event["total"], event["row_excel"])
+
+    return handle
+
+
+class JsonlEventWriter:
+    """Metrics exporter: append every event as one JSON line."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._handle = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._handle.write(line + "\n")
+            if event.kind in (ROW_FINISHED, RUN_FINISHED):
+                self._handle.flush()
+
+    def close(self):
+        with self._lock:
+            self._handle.close()
@@ -1,3 +1,5 @@
+import csv
+import gzip
 import math
 import os
 
@@ -8,6 +10,23 @@ from .settings import (
 )
 
 
+COLUMN_ALIASES = (
+    ("idsbr", ("idsbr",)),
+    ("nama_usaha", ("nama_usaha", "nama usaha", "namausaha", "nama")),
+    ("alamat", ("alamat", "alamat usaha", "alamat_usaha")),
+    ("latitude", ("latitude", "lat")),
+    ("longitude", ("longitude", "long", "lon")),
+    (
+        "hasil_gc",
+        ("hasil_gc", "hasil gc", "hasilgc", "ag", "keberadaanusaha_gc"),
+    ),
+)
+# Column AG (33rd column) holds keberadaanusaha_gc in the SBR export.
+HASIL_GC_FALLBACK_INDEX = 32
+DELIMITED_SUFFIXES = (".csv", ".tsv", ".csv.gz", ".tsv.gz")
+DELIMITER_CANDIDATES = (",", ";", "\t", "|")
+
+
 def normalize_text(value):
     if value is None:
         return ""
@@ -99,67 +118,126 @@ def resolve_excel_path(excel_file):
     )
 
 
-def load_excel_rows(excel_path):
-    path = resolve_excel_path(excel_path)
+def find_columns(headers):
+    """Map record fields to 0-based column indexes for normalized headers."""
+    columns = {}
+    for field, names in COLUMN_ALIASES:
+        columns[field] = None
+        for name in names:
+            for index, header in enumerate(headers):
+                if header_matches(header, name):
+                    columns[field] = index
+                    break
+            if columns[field] is not None:
+                break
+    if columns["hasil_gc"] is None and len(headers) > HASIL_GC_FALLBACK_INDEX:
+        columns["hasil_gc"] = HASIL_GC_FALLBACK_INDEX
+    return columns
 
-    try:
-        import pandas as pd
-    except ImportError:
-        pd = None
 
-    if pd:
+class ExcelRow:
+    """Compact input record; supports ``row["field"]`` access like a dict."""
+
+    __slots__ = (
+        "idsbr",
+        "nama_usaha",
+        "alamat",
+        "latitude",
+        "longitude",
+        "hasil_gc",
+    )
+
+    def __init__(self, idsbr, nama_usaha, alamat, latitude, longitude, hasil_gc):
+        self.idsbr = idsbr
+        self.nama_usaha = nama_usaha
+        self.alamat = alamat
+        self.latitude = latitude
+        self.longitude = longitude
+        self.hasil_gc = hasil_gc
+
+    def __getitem__(self, key):
         try:
-            df = pd.read_excel(path, dtype=str)
-        except Exception:
-            df = None
-        if df is None:
-            pd = None
-    if pd:
-        columns = [normalize_header(col) for col in df.columns]
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
 
-        def find_col(*names):
-            for name in names:
-                for index, column in enumerate(columns):
-                    if header_matches(column, name):
-                        return df.columns[index]
-            return None
+    def __eq__(self, other):
+        if not isinstance(other, ExcelRow):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
 
-        col_idsbr = find_col("idsbr")
-        col_nama = find_col("nama_usaha", "nama usaha", "namausaha", "nama")
-        col_alamat = find_col("alamat", "alamat usaha", "alamat_usaha")
-        col_lat = find_col("latitude", "lat")
-        col_lon = find_col("longitude", "long", "lon")
-        col_hasil = find_col(
-            "hasil_gc",
-            "hasil gc",
-            "hasilgc",
-            "ag",
-            "keberadaanusaha_gc",
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__
         )
+        return f"ExcelRow({fields})"
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def build_record(values, columns):
+    def cell_value(field):
+        index = columns[field]
+        if index is None or index >= len(values):
+            return None
+        return values[index]
+
+    idsbr = normalize_text(cell_value("idsbr"))
+    nama_usaha = normalize_text(cell_value("nama_usaha"))
+    alamat = normalize_text(cell_value("alamat"))
+    if not (idsbr or nama_usaha or alamat):
+        return None
+    return ExcelRow(
+        idsbr,
+        nama_usaha,
+        alamat,
+        normalize_lat_lon(cell_value("latitude"), -90, 90),
+        normalize_lat_lon(cell_value("longitude"), -180, 180),
+        normalize_hasil_gc(cell_value("hasil_gc"))
+        if columns["hasil_gc"] is not None
+        else None,
+    )
+
+
+def is_delimited_path(path):
+    return str(path).lower().endswith(DELIMITED_SUFFIXES)
+
+
+def open_delimited(path):
+    if str(path).lower().endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
 
-        if col_hasil is None and df.shape[1] >= 33:
-            col_hasil = df.columns[32]
-
-        rows = []
-        for _, row in df.iterrows():
-            record = {
-                "idsbr": normalize_text(row[col_idsbr]) if col_idsbr else "",
-                "nama_usaha": normalize_text(row[col_nama]) if col_nama else "",
-                "alamat": normalize_text(row[col_alamat]) if col_alamat else "",
-                "latitude": normalize_lat_lon(row[col_lat], -90, 90)
-                if col_lat
-                else "",
-                "longitude": normalize_lat_lon(row[col_lon], -180, 180)
-                if col_lon
-                else "",
-                "hasil_gc": normalize_hasil_gc(row[col_hasil])
-                if col_hasil is not None
-                else None,
-            }
-            if any([record["idsbr"], record["nama_usaha"], record["alamat"]]):
-                rows.append(record)
-        return rows
 
+def detect_delimiter(path, header_line):
+    lowered = str(path).lower()
+    if lowered.endswith((".tsv", ".tsv.gz")):
+        return "\t"
+    counts = [(header_line.count(char), char) for char in DELIMITER_CANDIDATES]
+    count, char = max(counts)
+    return char if count else ","
+
+
+def iter_delimited_rows(path):
+    """Stream records from a CSV/TSV file (optionally gzip-compressed)."""
+    with open_delimited(path) as handle:
+        header_line = handle.readline()
+        if not header_line:
+            return
+        delimiter = detect_delimiter(path, header_line)
+        headers = next(csv.reader([header_line], delimiter=delimiter), [])
+        columns = find_columns([normalize_header(value) for value in headers])
+        for values in csv.reader(handle, delimiter=delimiter):
+            record = build_record(values, columns)
+            if record:
+                yield record
+
+
+def iter_workbook_rows(path):
     try:
         import openpyxl
     except ImportError as exc:
@@ -171,50 +249,58 @@ def load_excel_rows(excel_path):
     try:
         sheet = workbook.active
         headers = [normalize_header(cell.value) for cell in sheet[1]]
-
-        def header_index(*names):
-            for name in names:
-                for index, header in enumerate(headers):
-                    if header_matches(header, name):
-                        return index + 1
-            return None
-
-        col_idsbr = header_index("idsbr")
-        col_nama = header_index("nama_usaha", "nama usaha", "namausaha", "nama")
-        col_alamat = header_index("alamat", "alamat usaha", "alamat_usaha")
-        col_lat = header_index("latitude", "lat")
-        col_lon = header_index("longitude", "long", "lon")
-        col_hasil = header_index(
-            "hasil_gc",
-            "hasil gc",
-            "hasilgc",
-            "ag",
-            "keberadaanusaha_gc",
-        )
-        if col_hasil is None and sheet.max_column >= 33:
-            col_hasil = 33
-
-        rows = []
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            def cell_value(col_index):
-                if not col_index:
-                    return None
-                if col_index - 1 >= len(row):
-                    return None
-                return row[col_index - 1]
-
-            record = {
-                "idsbr": normalize_text(cell_value(col_idsbr)),
-                "nama_usaha": normalize_text(cell_value(col_nama)),
-                "alamat": normalize_text(cell_value(col_alamat)),
-                "latitude": normalize_lat_lon(cell_value(col_lat), -90, 90),
-                "longitude": normalize_lat_lon(cell_value(col_lon), -180, 180),
-                "hasil_gc": normalize_hasil_gc(cell_value(col_hasil))
-                if col_hasil
-                else None,
-            }
-            if any([record["idsbr"], record["nama_usaha"], record["alamat"]]):
-                rows.append(record)
-        return rows
+        columns = find_columns(headers)
+        for values in sheet.iter_rows(min_row=2, values_only=True):
+            record = build_record(values, columns)
+            if record:
+                yield record
     finally:
         workbook.close()
+
+
+def iter_excel_rows(excel_path):
+    """Yield input records from an Excel workbook or a delimited text file."""
+    path = resolve_excel_path(excel_path)
+    if is_delimited_path(path):
+        yield from iter_delimited_rows(path)
+        return
+
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+
+    df = None
+    if pd:
+        try:
+            df = pd.read_excel(path, dtype=str)
+        except Exception:
+            df = None
+    if df is None:
+        yield from iter_workbook_rows(path)
+        return
+
+    columns = find_columns([normalize_header(col) for col in df.columns])
+    for values in df.itertuples(index=False, name=None):
+        record = build_record(values, columns)
+        if record:
+            yield record
+
+
+def load_excel_rows(excel_path):
+    return list(iter_excel_rows(excel_path))
+
+
+def open_excel_rows(excel_path):
+    """Return (count, rows) with `rows` an iterator over the records.
+
+    Delimited files are counted in one streaming pass and read again
+    lazily, so memory stays flat however long the file is. Workbooks are
+    parsed whole by pandas/openpyxl anyway and are loaded once.
+    """
+    path = resolve_excel_path(excel_path)
+    if is_delimited_path(path):
+        count = sum(1 for _ in iter_delimited_rows(path))
+        return count, iter_delimited_rows(path)
+    rows = load_excel_rows(path)
+    return len(rows), iter(rows)
@@ -0,0 +1,186 @@
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .events import ROW_FINISHED, ROW_STARTED, RUN_FINISHED
+from .logging_utils import log_info, log_warn
+from .run_logs import LOGS_DIR
+
+TRACE_WINDOW_ROWS = 5
+TRACE_BUDGET_MB = 500
+FAILED_STATUSES = ("error", "gagal")
+
+
+def list_traces(logs_dir=LOGS_DIR):
+    # Dot-prefixed zips are chunks still held by a running FailureTracer.
+    traces = [
+        path
+        for path in Path(logs_dir).glob("*/traces/*.zip")
+        if not path.name.startswith(".")
+    ]
+    return sorted(traces, key=lambda path: path.stat().st_mtime)
+
+
+def enforce_trace_budget(budget_mb, logs_dir=LOGS_DIR):
+    """Delete the oldest saved traces until they fit in `budget_mb`."""
+    traces = list_traces(logs_dir)
+    sizes = {path: path.stat().st_size for path in traces}
+    total = sum(sizes.values())
+    limit = budget_mb * 1024 * 1024
+    removed = 0
+    for path in traces:
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= sizes[path]
+        removed += 1
+    return removed
+
+
+class FailureTracer:
+    """Keep Playwright tracing for a rolling window of rows; save on failure.
+
+    Tracing runs in chunks of `window_rows` rows that drove the browser
+    (rows skipped before ROW_STARTED do not count). Finished chunks stay in
+    temporary zips until newer ones cover window_rows rows, so when a row
+    ends as error/gagal the saved trace (one zip, or *_partN.zip in order)
+    covers that row and at least window_rows-1 rows before it, even right
+    after a chunk boundary or a previous failure. Copying, deleting
+    superseded chunks and enforcing the disk budget happen on a background
+    thread.
+
+    Subscribe it to the run's EventBus and register attach() as a
+    BrowserSession page hook (a restarted context gets tracing again).
+    """
+
+    def __init__(
+        self,
+        window_rows=TRACE_WINDOW_ROWS,
+        budget_mb=TRACE_BUDGET_MB,
+        logs_dir=LOGS_DIR,
+    ):
+        self.window_rows = max(1, window_rows)
+        self.budget_mb = budget_mb
+        self.logs_dir = logs_dir
+        self.saved = 0
+        self._context = None
+        self._rows_in_chunk = 0
+        self._row_open = False
+        self._chunks = []
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run_jobs, name="dirgc-trace", daemon=True
+        )
+        self._worker.start()
+
+    def attach(self, page):
+        context = page.context
+        if context is self._context:
+            return
+        self._context = context
+        try:
+            context.tracing.start(screenshots=True, snapshots=True)
+            context.tracing.start_chunk()
+        except Exception as exc:
+            log_warn("Tracing unavailable.", error=str(exc))
+            self._context = None
+            return
+        self._rows_in_chunk = 0
+        # Chunks of the old context describe a page that no longer exists.
+        self._discard_chunks(len(self._chunks))
+
+    def __call__(self, event):
+        if event.kind == ROW_STARTED:
+            self._row_open = True
+        elif event.kind == ROW_FINISHED:
+            if self._row_open:
+                self.row_finished(
+                    event.get("row_excel"), event.get("idsbr"), event.get("status")
+                )
+            self._row_open = False
+        elif event.kind == RUN_FINISHED:
+            self.close()
+
+    def row_finished(self, row_excel, idsbr, status):
+        if self._context is None:
+            return
+        self._rows_in_chunk += 1
+        failed = status in FAILED_STATUSES
+        if not failed and self._rows_in_chunk < self.window_rows:
+            return
+        tracing = self._context.tracing
+        try:
+            date_dir = Path(self.logs_dir) / time.strftime("%Y%m%d") / "traces"
+            date_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = date_dir / f".tmp-{uuid.uuid4().hex}.zip"
+            tracing.stop_chunk(path=str(temp_path))
+            tracing.start_chunk()
+        except Exception as exc:
+            log_warn("Tracing chunk failed.", error=str(exc))
+            self._rows_in_chunk = 0
+            return
+        self._chunks.append((temp_path, self._rows_in_chunk))
+        self._rows_in_chunk = 0
+        if failed:
+            stem = f"row{row_excel}_{idsbr or 'noid'}_{time.strftime('%H%M%S')}"
+            parts = len(self._chunks)
+            for number, (path, _) in enumerate(self._chunks, start=1):
+                suffix = f"_part{number}" if parts > 1 else ""
+                self._jobs.put((path, date_dir / f"{stem}{suffix}.zip"))
+        # Keep only the newest chunks needed so the next failure still sees
+        # window_rows-1 rows before its own chunk.
+        total = sum(rows for _, rows in self._chunks)
+        drop = 0
+        for _, rows in self._chunks:
+            if total - rows < self.window_rows - 1:
+                break
+            total -= rows
+            drop += 1
+        self._discard_chunks(drop)
+
+    def _discard_chunks(self, count):
+        for path, _ in self._chunks[:count]:
+            self._jobs.put((path, None))
+        del self._chunks[:count]
+
+    def _run_jobs(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                temp_path, final_path = job
+                if final_path is None:
+                    os.remove(temp_path)
+                    continue
+                shutil.copyfile(temp_path, final_path)
+                self.saved += 1
+                removed = enforce_trace_budget(self.budget_mb, self.logs_dir)
+                log_info(
+                    "Failure trace saved.",
+                    path=str(final_path),
+                    removed_old=removed or "",
+                )
+            except Exception as exc:
+                log_warn("Failed to save trace.", error=str(exc))
+            finally:
+                self._jobs.task_done()
+
+    def close(self):
+        if self._context is not None:
+            try:
+                self._context.tracing.stop()
+            except Exception:
+                pass
+            self._context = None
+        self._discard_chunks(len(self._chunks))
+        if self._worker.is_alive():
+            self._jobs.put(None)
+            self._worker.join()
@@ -0,0 +1,769 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from .browser import ActivityMonitor
+from .card_index import STATUS_BELUM, STATUS_DUPLIKAT, STATUS_SUDAH_GC
+from .clock import FakeClock, format_time_report
+from .events import RATE_LIMITED, ROW_FINISHED, EventBus
+from .settings import DEFAULT_IDLE_TIMEOUT_MS, TARGET_URL
+
+# Scriptable submit outcomes, in the order the server answers successive
+# submit / "Coba Lagi" clicks of one card. "success" turns into the geotag
+# confirmation when the coordinate fields are empty, like the real form.
+OUTCOME_SUCCESS = "success"
+OUTCOME_CONFIRM = "confirm"
+OUTCOME_BUSY = "busy"
+OUTCOME_BUSY_CLOSE = "busy_close"
+OUTCOME_ERROR = "error"
+OUTCOME_NONE = "none"
+SUBMIT_OUTCOMES = (
+    OUTCOME_SUCCESS,
+    OUTCOME_CONFIRM,
+    OUTCOME_BUSY,
+    OUTCOME_BUSY_CLOSE,
+    OUTCOME_ERROR,
+    OUTCOME_NONE,
+)
+SUCCESS_TEXT = "Data submitted successfully"
+MAX_RESULTS = 20
+SIMULATION_COLUMNS = (
+    "idsbr",
+    "nama_usaha",
+    "alamat",
+    "latitude",
+    "longitude",
+    "hasil_gc",
+)
+
+
+@dataclass
+class FakeCard:
+    idsbr: str
+    nama: str
+    alamat: str
+    status: str = STATUS_BELUM
+    # Submit outcomes still to be served; "success" once exhausted.
+    outcomes: list = field(default_factory=list)
+    # Searches of this card answered with a 429 before results.
+    rate_limits: int = 0
+    retry_after: int = 30
+
+    @property
+    def text(self):
+        if self.status == STATUS_SUDAH_GC:
+            badge = "Sudah GC"
+        else:
+            badge = "Belum GC"
+        lines = [self.nama, f"IDSBR: {self.idsbr}", f"Alamat: {self.alamat}", badge]
+        if self.status == STATUS_DUPLIKAT:
+            lines.append("Duplikat")
+        return "\n".join(lines)
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self._headers = headers or {}
+
+    def all_headers(self):
+        return dict(self._headers)
+
+
+class _Element:
+    __slots__ = (
+        "selectors",
+        "text",
+        "visible",
+        "children",
+        "parent",
+        "on_click",
+        "field",
+    )
+
+    def __init__(self, selectors, text="", visible=True, on_click=None, field=None):
+        self.selectors = selectors
+        self.text = text
+        self.visible = visible
+        self.children = []
+        self.parent = None
+        self.on_click = on_click
+        self.field = field
+
+    def add(self, *children):
+        for child in children:
+            child.parent = self
+            self.children.append(child)
+        return self
+
+    def walk(self):
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+
+def _select(elements, selector, has_text):
+    needle = has_text.lower() if has_text else None
+    return [
+        element
+        for element in elements
+        if selector in element.selectors
+        and (needle is None or needle in element.text.lower())
+    ]
+
+
+class FakeLocator:
+    """Lazy locator: re-resolves against the current fake DOM on every call."""
+
+    def __init__(self, page, resolve):
+        self._page = page
+        self._resolve = resolve
+
+    def _one(self):
+        elements = self._resolve()
+        if not elements:
+            raise TimeoutError("Fake locator matched no element.")
+        return elements[0]
+
+    def count(self):
+        return len(self._resolve())
+
+    @property
+    def first(self):
+        return self.nth(0)
+
+    def nth(self, index):
+        def resolve():
+            elements = self._resolve()
+            return elements[index : index + 1] if index < len(elements) else []
+
+        return FakeLocator(self._page, resolve)
+
+    def locator(self, selector, has_text=None):
+        def resolve():
+            found = []
+            for element in self._resolve():
+                if selector.startswith("xpath=ancestor"):
+                    candidates = [element.parent] if element.parent else []
+                    found.extend(_select(candidates, ".usaha-card", has_text))
+                else:
+                    found.extend(_select(element.walk(), selector, has_text))
+            return found
+
+        return FakeLocator(self._page, resolve)
+
+    def is_visible(self):
+        elements = self._resolve()
+        return bool(elements) and elements[0].visible
+
+    def inner_text(self):
+        return self._one().text
+
+    def click(self, **_kwargs):
+        self._page._click(self._one())
+
+    def fill(self, value):
+        self._page._fill(self._one(), value)
+
+    def input_value(self):
+        element = self._one()
+        return self._page._fields.get(element.field, "")
+
+    def scroll_into_view_if_needed(self):
+        pass
+
+    def evaluate(self, _script, _arg=None):
+        return None
+
+    def press(self, _key):
+        pass
+
+
+class FakeKeyboard:
+    def __init__(self, page):
+        self._page = page
+
+    def press(self, key):
+        if key == "Enter" and self._page._swal:
+            self._page._swal_confirm()
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookie_clears = 0
+
+    def clear_cookies(self):
+        self.cookie_clears += 1
+
+
+class FakePage:
+    """In-memory stand-in for the DIRGC page behind a Playwright Page.
+
+    It implements the subset of the Page/Locator API used by
+    process_excel_rows and the browser.py helpers: locator/count/first/nth/
+    inner_text/is_visible/click/fill, goto, evaluate for the scripts the
+    processor injects, keyboard Enter and "response" listeners. Cards,
+    badges, submit popups and 429 responses are scripted via FakeCard;
+    page waits advance a FakeClock instead of sleeping. Pair it with an
+    ActivityMonitor on the same clock (see simulate()).
+    """
+
+    def __init__(self, cards=(), clock=None, latency_s=0.0):
+        self.clock = clock or FakeClock()
+        self.latency_s = latency_s
+        self.cards = list(cards)
+        self.url = "about:blank"
+        self.context = FakeContext()
+        self.keyboard = FakeKeyboard(self)
+        self.frames = []
+        self.submissions = []
+        self.calls = 0
+        self._listeners = []
+        self._results = None
+        self._expanded = None
+        self._form_card = None
+        self._fields = {}
+        self._swal = None
+
+    # --- Playwright Page API -------------------------------------------
+
+    def locator(self, selector, has_text=None):
+        self.calls += 1
+        return FakeLocator(
+            self, lambda: _select(self._elements(), selector, has_text)
+        )
+
+    def get_by_placeholder(self, _text):
+        return FakeLocator(self, lambda: [])
+
+    def goto(self, url, **_kwargs):
+        self._round_trip()
+        self.url = url
+        self._results = None
+        self._expanded = None
+        self._form_card = None
+        self._swal = None
+
+    def wait_for_timeout(self, ms):
+        self.clock.advance(ms / 1000)
+
+    def click(self, selector, **_kwargs):
+        self.locator(selector).click()
+
+    def fill(self, selector, value):
+        self.locator(selector).fill(value)
+
+    def select_option(self, selector, value=None, label=None, **_kwargs):
+        self.locator(selector).first._one()
+        self._fields["hasil_gc"] = value if value is not None else label
+
+    def evaluate(self, script, arg=None):
+        self.calls += 1
+        if "#search-idsbr" in script and isinstance(arg, dict):
+            self._search(
+                arg.get("idsbrValue"), arg.get("namaValue"), arg.get("alamatValue")
+            )
+        elif "querySelectorAll('.usaha-card')" in script:
+            return [
+                {
+                    "header": card.nama,
+                    "text": card.text,
+                    "sudahGc": card.status == STATUS_SUDAH_GC,
+                    "duplikat": card.status == STATUS_DUPLIKAT,
+                }
+                for card in self._results or ()
+            ]
+        elif "swal2-confirm" in script and self._swal:
+            self._swal_confirm()
+        elif "swal2-container" in script:
+            self._swal = None
+        elif "#tt_hasil_gc" in script and self._form_card:
+            self._fields["hasil_gc"] = arg
+        return None
+
+    def on(self, event, callback):
+        if event == "response":
+            self._listeners.append(callback)
+
+    def expose_function(self, *_args):
+        pass
+
+    def add_init_script(self, *_args):
+        pass
+
+    def is_closed(self):
+        return False
+
+    # --- fake DOM ------------------------------------------------------
+
+    def _round_trip(self):
+        self.calls += 1
+        if self.latency_s:
+            self.clock.advance(self.latency_s)
+
+    def _elements(self):
+        if not self.url.startswith(TARGET_URL):
+            return []
+        roots = [
+            _Element({"#search-idsbr"}),
+            _Element({"#search-nama"}),
+            _Element({"#search-alamat"}),
+        ]
+        if self._results is not None and not self._results:
+            roots.append(_Element({".empty-state"}, "Data tidak ditemukan"))
+        for card in self._results or ():
+            roots.append(self._card_element(card))
+        if self._form_card is not None:
+            roots.extend(self._form_elements())
+        if self._swal is not None:
+            roots.append(self._swal_element())
+        elements = []
+        for root in roots:
+            elements.append(root)
+            elements.extend(root.walk())
+        return elements
+
+    def _card_element(self, card):
+        element = _Element({".usaha-card"}, card.text)
+        element.add(
+            _Element(
+                {".usaha-card-header"},
+                f"{card.nama}\n{card.idsbr}",
+                on_click=lambda: setattr(self, "_expanded", card),
+            ),
+            _Element(
+                {".gc-badge"},
+                "Sudah GC" if card.status == STATUS_SUDAH_GC else "Belum GC",
+            ),
+        )
+        if card.status == STATUS_DUPLIKAT:
+            element.add(_Element({".usaha-status.tidak-aktif"}, "Duplikat"))
+        if card is self._expanded and card.status == STATUS_BELUM:
+            element.add(
+                _Element(
+                    {".btn-tandai"}, "Tandai", on_click=lambda: self._open_form(card)
+                )
+            )
+        return element
+
+    def _form_elements(self):
+        return [
+            _Element({"#tt_hasil_gc"}, field="hasil_gc"),
+            _Element({"#tt_latitude_cek_user"}, field="latitude"),
+            _Element({"#tt_longitude_cek_user"}, field="longitude"),
+            _Element({"button"}, "Ambil Lokasi", on_click=self._geotag),
+            _Element({"#save-tandai-usaha-btn"}, "Simpan", on_click=self._submit),
+        ]
+
+    def _swal_element(self):
+        kind = self._swal
+        buttons = []
+        if kind == OUTCOME_BUSY:
+            title, message = "Server Sibuk", "Silakan coba lagi."
+            buttons = [({".swal2-confirm"}, "Coba Lagi"), ({".swal2-cancel"}, "Tutup")]
+        elif kind == OUTCOME_BUSY_CLOSE:
+            title, message = "Server Sibuk", "Silakan coba lagi."
+            buttons = [({".swal2-cancel"}, "Tutup")]
+        elif kind == OUTCOME_ERROR:
+            title, message = "Error", "Terjadi kesalahan."
+            buttons = [({".swal2-confirm"}, "OK")]
+        elif kind == OUTCOME_CONFIRM:
+            title, message = "Konfirmasi", "Simpan tanpa melakukan geotag?"
+            buttons = [({".swal2-confirm"}, "Ya"), ({".swal2-cancel"}, "Batal")]
+        else:
+            title, message = "Berhasil", SUCCESS_TEXT
+            buttons = [({".swal2-confirm"}, "OK")]
+        popup = _Element({".swal2-popup"}, f"{title}\n{message}")
+        popup.add(_Element({".swal2-title"}, title))
+        if kind == OUTCOME_ERROR:
+            popup.add(_Element({".swal2-icon-error"}))
+        for selectors, text in buttons:
+            if ".swal2-confirm" in selectors:
+                on_click = self._swal_confirm
+            else:
+                on_click = self._swal_cancel
+            popup.add(_Element(selectors, text, on_click=on_click))
+        return _Element({".swal2-container"}).add(popup)
+
+    # --- behaviour -----------------------------------------------------
+
+    def _click(self, element):
+        self._round_trip()
+        if element.on_click is not None:
+            element.on_click()
+
+    def _fill(self, element, value):
+        self._round_trip()
+        if element.field:
+            self._fields[element.field] = "" if value is None else str(value)
+
+    def _search(self, idsbr, nama, alamat):
+        self._round_trip()
+        self._expanded = None
+        self._form_card = None
+        results = []
+        for card in self.cards:
+            if idsbr and card.idsbr != idsbr:
+                continue
+            if nama and nama.lower() not in card.nama.lower():
+                continue
+            if alamat and alamat.lower() not in card.alamat.lower():
+                continue
+            results.append(card)
+        for card in results:
+            if card.rate_limits > 0:
+                card.rate_limits -= 1
+                response = FakeResponse(429, {"retry-after": str(card.retry_after)})
+                for listener in list(self._listeners):
+                    listener(response)
+        self._results = results[:MAX_RESULTS]
+
+    def _open_form(self, card):
+        self._form_card = card
+        self._fields = {"hasil_gc": "", "latitude": "", "longitude": ""}
+
+    def _geotag(self):
+        self._fields["latitude"] = self._fields["latitude"] or "2.8400"
+        self._fields["longitude"] = self._fields["longitude"] or "117.3700"
+
+    def _submit(self):
+        card = self._form_card
+        if card is None or self._swal is not None:
+            # Popup open: the click lands on the overlay.
+            return
+        outcome = card.outcomes.pop(0) if card.outcomes else OUTCOME_SUCCESS
+        if outcome == OUTCOME_SUCCESS and not (
+            self._fields.get("latitude") or self._fields.get("longitude")
+        ):
+            outcome = OUTCOME_CONFIRM
+        if outcome == OUTCOME_SUCCESS:
+            self._accept(card)
+        self._swal = None if outcome == OUTCOME_NONE else outcome
+
+    def _accept(self, card):
+        card.status = STATUS_SUDAH_GC
+        self.submissions.append(card.idsbr)
+
+    def _swal_confirm(self):
+        kind = self._swal
+        self._swal = None
+        if kind == OUTCOME_BUSY:
+            # "Coba Lagi" submits the form again.
+            self._submit()
+        elif kind == OUTCOME_CONFIRM:
+            self._accept(self._form_card)
+            self._swal = OUTCOME_SUCCESS
+        elif kind == OUTCOME_SUCCESS:
+            self._form_card = None
+            self._expanded = None
+
+    def _swal_cancel(self):
+        self._swal = None
+
+
+def build_simulation(
+    rows,
+    seed=1,
+    busy_rate=0.1,
+    error_rate=0.02,
+    no_popup_rate=0.01,
+    rate_limit_rate=0.0,
+    gc_rate=0.1,
+    missing_rate=0.02,
+    no_coords_rate=0.2,
+):
+    """Return (input rows, cards) for a randomized run of `rows` rows."""
+    rng = random.Random(seed)
+    input_rows = []
+    cards = []
+    for index in range(rows):
+        idsbr = str(90000000 + index)
+        nama = f"TOKO SIMULASI {index}"
+        alamat = f"JL. PERCOBAAN NO. {index % 200 + 1}, TANJUNG SELOR"
+        coords = ("", "") if rng.random() < no_coords_rate else ("2.84", "117.37")
+        input_rows.append((idsbr, nama, alamat, *coords, 1))
+        if rng.random() < missing_rate:
+            continue
+        card = FakeCard(idsbr, nama, alamat)
+        if rng.random() < gc_rate:
+            card.status = STATUS_SUDAH_GC
+        while rng.random() < busy_rate:
+            card.outcomes.append(rng.choice((OUTCOME_BUSY, OUTCOME_BUSY_CLOSE)))
+        if rng.random() < error_rate:
+            card.outcomes.append(OUTCOME_ERROR)
+        if rng.random() < no_popup_rate:
+            card.outcomes.append(OUTCOME_NONE)
+        if rng.random() < rate_limit_rate:
+            card.rate_limits = 1
+        cards.append(card)
+    return input_rows, cards
+
+
+# (description, input row, card or None, expected (status, note))
+BRANCH_SCENARIOS = (
+    (
+        "success with coordinates",
+        ("2.84", "117.37"),
+        dict(outcomes=[]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "geotag confirmation without coordinates",
+        ("", ""),
+        dict(outcomes=[]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "busy then Coba Lagi succeeds",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_BUSY, OUTCOME_SUCCESS]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "busy closed then resubmitted",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_BUSY_CLOSE, OUTCOME_SUCCESS]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "error popup dismissed then resubmitted",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_ERROR, OUTCOME_SUCCESS]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "no popup then resubmitted",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_NONE, OUTCOME_SUCCESS]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "busy streak trips the breaker, probe after the pause succeeds",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_BUSY_CLOSE] * 5 + [OUTCOME_SUCCESS]),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "server busy on every retry",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_BUSY_CLOSE] * 30),
+        ("gagal", "Server Sibuk / No Response"),
+    ),
+    (
+        "geotag confirmation although coordinates were given",
+        ("2.84", "117.37"),
+        dict(outcomes=[OUTCOME_CONFIRM]),
+        ("gagal", "Anomali dialog geotag"),
+    ),
+    (
+        "429 on search, row still submitted, next row cools down",
+        ("2.84", "117.37"),
+        dict(rate_limits=1),
+        ("berhasil", "Submit sukses"),
+    ),
+    (
+        "already Sudah GC",
+        ("2.84", "117.37"),
+        dict(status=STATUS_SUDAH_GC),
+        ("skipped", "Sudah GC"),
+    ),
+    (
+        "Duplikat",
+        ("2.84", "117.37"),
+        dict(status=STATUS_DUPLIKAT),
+        ("skipped", "Duplikat"),
+    ),
+    (
+        "not found",
+        ("2.84", "117.37"),
+        None,
+        ("gagal", "No results found"),
+    ),
+)
+
+
+def build_branch_scenarios():
+    input_rows = []
+    cards = []
+    expected = []
+    for index, (description, coords, card_fields, outcome) in enumerate(
+        BRANCH_SCENARIOS
+    ):
+        idsbr = str(80000000 + index)
+        nama = f"TOKO SKENARIO {index}"
+        alamat = f"JL. CABANG NO. {index + 1}"
+        input_rows.append((idsbr, nama, alamat, *coords, 1))
+        if card_fields is not None:
+            fields = dict(card_fields)
+            fields["outcomes"] = list(fields.get("outcomes", []))
+            cards.append(FakeCard(idsbr, nama, alamat, **fields))
+        expected.append((description, outcome))
+    return input_rows, cards, expected
+
+
+def write_simulation_input(path, input_rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(SIMULATION_COLUMNS)
+        writer.writerows(input_rows)
+
+
+def simulate(input_rows, cards, workdir=None, latency_s=0.0, quiet=True):
+    """Run process_excel_rows against a FakePage in a scratch directory.
+
+    Returns wall/virtual seconds, per-row results (status, note), the
+    submissions the fake server accepted and the number of 429 cooldowns.
+    """
+    from .logging_utils import flush_logs, set_console_output
+    from .processor import process_excel_rows
+
+    workdir = workdir or tempfile.mkdtemp(prefix="dirgc-sim-")
+    os.makedirs(workdir, exist_ok=True)
+    page = FakePage(cards, latency_s=latency_s)
+    monitor = ActivityMonitor(page, DEFAULT_IDLE_TIMEOUT_MS, clock=page.clock)
+    results = []
+    rate_limits = []
+    bus = EventBus()
+    bus.subscribe(
+        lambda event: results.append((event.get("status"), event.get("note"))),
+        kinds=(ROW_FINISHED,),
+    )
+    bus.subscribe(rate_limits.append, kinds=(RATE_LIMITED,))
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    if quiet:
+        set_console_output(False)
+    started = time.perf_counter()
+    try:
+        write_simulation_input("input.csv", input_rows)
+        # The processor sleeps and measures on monitor.clock (the page's).
+        process_excel_rows(
+            page,
+            monitor=monitor,
+            excel_file="input.csv",
+            use_saved_credentials=False,
+            credentials=None,
+            event_bus=bus,
+            humanize=False,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        flush_logs()
+        if quiet:
+            set_console_output(True)
+        os.chdir(previous_cwd)
+    return {
+        "workdir": workdir,
+        "rows": len(results),
+        "seconds": elapsed,
+        "virtual_s": page.clock.monotonic(),
+        "time_report": page.clock.report(),
+        "rows_per_s": len(results) / elapsed if elapsed else 0.0,
+        "ms_per_row": elapsed / len(results) * 1000 if results else 0.0,
+        "page_calls": page.calls,
+        "results": results,
+        "submissions": page.submissions,
+        "rate_limits": len(rate_limits),
+    }
+
+
+def check_branches(workdir=None):
+    """Run every scripted scenario once; return a list of failure lines."""
+    input_rows, cards, expected = build_branch_scenarios()
+    result = simulate(input_rows, cards, workdir=workdir)
+    failures = []
+    for (description, wanted), actual in zip(expected, result["results"]):
+        if tuple(actual) != wanted:
+            failures.append(f"{description}: expected {wanted}, got {tuple(actual)}")
+    if len(result["results"]) != len(expected):
+        failures.append(
+            f"expected {len(expected)} rows, got {len(result['results'])}"
+        )
+    submissions = result["submissions"]
+    duplicates = {idsbr for idsbr in submissions if submissions.count(idsbr) > 1}
+    if duplicates:
+        failures.append(f"submitted more than once: {', '.join(sorted(duplicates))}")
+    if result["rate_limits"] != 1:
+        failures.append(f"expected 1 rate-limit cooldown, got {result['rate_limits']}")
+    return failures, result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Simulate process_excel_rows against an in-memory DIRGC page to "
+            "measure orchestration overhead per row, or check every submit "
+            "branch with --check."
+        )
+    )
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--busy-rate", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Virtual latency added to each navigation, search and click.",
+    )
+    parser.add_argument("--workdir", help="Directory for logs/config (default: temp).")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Run the scripted branch scenarios and report mismatches.",
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.check:
+        failures, result = check_branches(workdir=args.workdir)
+        print(
+            f"{len(BRANCH_SCENARIOS)} scenarios, {result['virtual_s']:.0f}s virtual "
+            f"in {result['seconds'] * 1000:.0f} ms"
+        )
+        for line in failures:
+            print(f"FAIL {line}")
+        sys.exit(1 if failures else 0)
+    input_rows, cards = build_simulation(
+        args.rows,
+        seed=args.seed,
+        busy_rate=args.busy_rate,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    result = simulate(
+        input_rows, cards, workdir=args.workdir, latency_s=args.latency_ms / 1000
+    )
+    statuses = {}
+    for status, _ in result["results"]:
+        statuses[status] = statuses.get(status, 0) + 1
+    print(
+        f"rows={result['rows']} {result['ms_per_row']:.2f} ms/row "
+        f"({result['rows_per_s']:.0f} rows/s), virtual {result['virtual_s']:.0f}s, "
+        f"{result['page_calls'] / max(1, result['rows']):.1f} page calls/row"
+    )
+    print(
+        "statuses: "
+        + ", ".join(f"{key}={value}" for key, value in sorted(statuses.items()))
+    )
+    print(f"rate-limit cooldowns: {result['rate_limits']}")
+    print(
+        "virtual time: "
+        + ", ".join(
+            f"{key[5:]}={value}"
+            for key, value in format_time_report(result["time_report"]).items()
+        )
+    )
+    print(f"logs: {result['workdir']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,49 @@
 
 import os
-import json
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QBoxLayout, QFormLayout, 
     QPlainTextEdit, QFileDialog
 )
-from PyQt5.QtCore import Qt, QUrl
+from PyQt5.QtCore import Qt, QTimer, QUrl
 from PyQt5.QtGui import QDesktopServices
 from qfluentwidgets import (
     TitleLabel, BodyLabel, SubtitleLabel, PushButton, PrimaryPushButton, 
     LineEdit, SwitchButton, SpinBox, InfoBar, InfoBarPosition
 )
 
-from dirgc.settings import DEFAULT_EXCEL_FILE, LAST_RUN_STATE_FILE
-from dirgc.run_logs import get_last_processed_row
-from dirgc.gui.components.cards import build_card
+from dirgc.settings import DEFAULT_EXCEL_FILE
+from dirgc.gui.components.cards import build_card, setup_form_layout
 from dirgc.gui.components.option_row import OptionRow
+from dirgc.gui.workers.inspect_worker import InspectWorker
 from dirgc.gui.workers.run_worker import RunWorker
 from dirgc.gui.state.settings_manager import SettingsManager
 from dirgc.gui.state.run_config import RunConfig
+from dirgc.gui.state.run_stats import format_duration
 from dirgc.gui.utils.dialogs import DialogHelper
 from dirgc.gui.utils.styling import build_footer_label, RESPONSIVE_BREAKPOINT
 
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_VIEW_MAX_LINES = 5000
+DASHBOARD_REFRESH_MS = 1000
+
 class RunPage(QWidget):
     def __init__(self, sso_page=None, parent=None):
         super().__init__(parent)
         self.setObjectName("runPage")
         self._worker = None
+        self._inspect_workers = set()
+        self._inspection = None
+        self._inspection_path = None
+        self._inspection_error = None
+        # Start clicked while the inspection was running.
+        self._start_pending = False
+        self._log_file_path = None
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_logs)
+        self._dashboard_timer = QTimer(self)
+        self._dashboard_timer.setInterval(DASHBOARD_REFRESH_MS)
+        self._dashboard_timer.timeout.connect(self._refresh_dashboard)
         self._sso_page = sso_page
         self._recent_excels = SettingsManager.load().get("recent_excels", [])
 
@@ -56,6 +73,7 @@ class RunPage(QWidget):
         right_layout.setContentsMargins(0, 0, 0, 0)
         right_layout.setSpacing(16)
         right_layout.addWidget(self._build_run_card())
+        right_layout.addWidget(self._build_dashboard_card())
         right_layout.addWidget(self._build_log_card(), stretch=1)
 
         self._content_layout.addWidget(left_col, stretch=2)
@@ -92,13 +110,17 @@ class RunPage(QWidget):
             self.excel_input.editingFinished.connect(self._on_excel_edit_finished)
             
             browse_btn = PushButton("Browse")
-            browse_btn.clicked.connect(lambda: self._browse_file(self.excel_input, "Excel (*.xlsx *.xls)"))
+            browse_btn.clicked.connect(lambda: self._browse_file(self.excel_input, "Data (*.xlsx *.xls *.csv *.tsv *.csv.gz *.tsv.gz)"))
             
             # Recent files handling (simplified)
             # We could add a combobox here if needed like original app
             
+            self.inspect_label = BodyLabel("-")
+            self.inspect_label.setWordWrap(True)
+
             form.addRow("Excel File:", self.excel_input)
             form.addRow("", browse_btn)
+            form.addRow("Info:", self.inspect_label)
             layout.addLayout(form)
             
         card, _ = build_card("Files", build)
@@ -109,6 +131,8 @@ class RunPage(QWidget):
             self.manual_switch = SwitchButton("Off")
             self.headless_switch = SwitchButton("Off")
             self.keep_open_switch = SwitchButton("Off")
+            self.scan_only_switch = SwitchButton("Off")
+            self.profile_switch = SwitchButton("Off")
             
             self.range_switch = SwitchButton("Off")
             self.range_switch.checkedChanged.connect(self._toggle_range)
@@ -138,6 +162,8 @@ class RunPage(QWidget):
             layout.addWidget(OptionRow("Manual Only", "Skip auto-fill/submit", self.manual_switch))
             layout.addWidget(OptionRow("Headless", "Run background", self.headless_switch))
             layout.addWidget(OptionRow("Keep Open", "Don't close browser", self.keep_open_switch))
+            layout.addWidget(OptionRow("Scan Only", "Cek data tanpa submit", self.scan_only_switch))
+            layout.addWidget(OptionRow("Profile", "Simpan profil cProfile (.prof)", self.profile_switch))
             
             layout.addWidget(OptionRow("Limit Range", "Start - End rows", self.range_switch))
             layout.addLayout(range_controls)
@@ -169,10 +195,31 @@ class RunPage(QWidget):
         card, _ = build_card("Control", build)
         return card
 
+    def _build_dashboard_card(self):
+        def build(layout):
+            form = setup_form_layout()
+            self.rate_label = BodyLabel("-")
+            self.eta_label = BodyLabel("-")
+            self.counts_label = BodyLabel("-")
+            self.counts_label.setWordWrap(True)
+            self.cooldown_label = BodyLabel("-")
+            self.phase_label = BodyLabel("-")
+            form.addRow("Kecepatan:", self.rate_label)
+            form.addRow("ETA:", self.eta_label)
+            form.addRow("Status:", self.counts_label)
+            form.addRow("Cooldown:", self.cooldown_label)
+            form.addRow("Fase:", self.phase_label)
+            layout.addLayout(form)
+
+        card, _ = build_card("Dashboard", build)
+        return card
+
     def _build_log_card(self):
         def build(layout):
             self.log_output = QPlainTextEdit()
             self.log_output.setReadOnly(True)
+            # Keep only the tail in the view; the full log is on disk.
+            self.log_output.setMaximumBlockCount(LOG_VIEW_MAX_LINES)
             self.log_output.setStyleSheet("font-family: Consolas, monospace; font-size: 12px;")
             
             layout.addWidget(self.log_output)
@@ -181,10 +228,14 @@ class RunPage(QWidget):
             actions = QHBoxLayout()
             open_logs_btn = PushButton("Buka Folder Logs")
             open_logs_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath("logs"))))
+            self.open_log_file_btn = PushButton("Buka Log Lengkap")
+            self.open_log_file_btn.clicked.connect(self._open_log_file)
+            self.open_log_file_btn.setEnabled(False)
             clear_logs_btn = PushButton("Bersihkan Log")
             clear_logs_btn.clicked.connect(self.log_output.clear)
             
             actions.addWidget(open_logs_btn)
+            actions.addWidget(self.open_log_file_btn)
             actions.addWidget(clear_logs_btn)
             layout.addLayout(actions)
 
@@ -194,21 +245,43 @@ class RunPage(QWidget):
         return card
 
     def _confirm_start(self):
-        # Resume Logic
-        last_row = 0
-        if os.path.exists(LAST_RUN_STATE_FILE):
-             try:
-                 with open(LAST_RUN_STATE_FILE, "r") as f:
-                     state = json.load(f)
-                     last_row = int(state.get("last_row", 0))
-             except Exception:
-                 pass
-        
-        if last_row == 0:
-            last_row = get_last_processed_row()
+        # Resume Logic: uses the background inspection so the dialog opens
+        # without parsing Excel or run logs on the UI thread.
+        path = self._current_excel_path()
+        if self._inspection_path != path or (
+            self._inspection is None and self._inspection_error is None
+        ):
+            InfoBar.info(
+                "Memeriksa file",
+                "File input sedang diperiksa; proses dilanjutkan setelah selesai.",
+                parent=self,
+                position=InfoBarPosition.TOP,
+                duration=3000,
+            )
+            self._start_pending = True
+            self.start_button.setEnabled(False)
+            if self._inspection_path != path:
+                self._inspect_excel()
+            return
+        if self._inspection_error:
+            InfoBar.error(
+                "File tidak valid",
+                self._inspection_error,
+                parent=self,
+                position=InfoBarPosition.TOP,
+                duration=5000,
+            )
+            return
 
+        inspection = self._inspection
+        last_row = inspection["last_row"]
         if last_row > 0:
-            result = DialogHelper.resume_dialog(self, last_row)
+            result = DialogHelper.resume_dialog(
+                self,
+                last_row,
+                remaining=inspection["remaining_after_resume"],
+                done=inspection["done"],
+            )
             if result == "resume":
                 self.range_switch.setChecked(True)
                 next_start = last_row + 1
@@ -240,7 +313,9 @@ class RunPage(QWidget):
             idle_timeout_ms=self.idle_spin.value() * 1000,
             web_timeout_s=self.web_timeout_spin.value(),
             range_enabled=self.range_switch.isChecked(),
-            keep_open=self.keep_open_switch.isChecked()
+            keep_open=self.keep_open_switch.isChecked(),
+            scan_only=self.scan_only_switch.isChecked(),
+            profile=self.profile_switch.isChecked(),
         )
 
         self.start_button.setEnabled(False)
@@ -249,9 +324,13 @@ class RunPage(QWidget):
         self.log_output.appendPlainText("=== START RUN ===")
         
         self._worker = RunWorker(config, self._sso_page)
-        self._worker.log_emitted.connect(self._append_log)
+        self._log_file_path = self._worker.log_file_path
+        self.open_log_file_btn.setEnabled(True)
+        self._worker.progress.connect(self._update_progress)
         self._worker.finished.connect(self._run_finished)
         self._worker.start()
+        self._log_timer.start()
+        self._dashboard_timer.start()
 
     def _confirm_stop(self):
         if DialogHelper.confirm(self, "Hentikan", "Yakin stop?"):
@@ -261,22 +340,114 @@ class RunPage(QWidget):
                  self.stop_button.setEnabled(False)
 
     def _run_finished(self):
+        self._log_timer.stop()
+        self._flush_logs()
+        self._dashboard_timer.stop()
+        self._refresh_dashboard()
         self.status_label.setText("Status: finished")
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.log_output.appendPlainText("=== FINISHED ===")
+        # Run history changed; refresh resume info in the background.
+        self._inspect_excel()
+
+    def _update_progress(self, processed, total, excel_row):
+        if self._worker and self._worker.isRunning():
+            self.status_label.setText(
+                f"Status: running ({processed}/{total}, baris {excel_row})"
+            )
+
+    def _current_excel_path(self):
+        return self.excel_input.text() or DEFAULT_EXCEL_FILE
+
+    def _inspect_excel(self):
+        path = self._current_excel_path()
+        self._inspection_path = path
+        self._inspection = None
+        self._inspection_error = None
+        self.inspect_label.setText("Memeriksa file...")
+        worker = InspectWorker(path, self)
+        worker.inspected.connect(self._on_inspected)
+        worker.failed.connect(self._on_inspect_failed)
+        worker.finished.connect(lambda: self._inspect_workers.discard(worker))
+        self._inspect_workers.add(worker)
+        worker.start()
+
+    def _on_inspected(self, path, result):
+        if path != self._inspection_path:
+            return # stale result for a previous path
+        self._inspection = result
+        text = (
+            f"{result['total_rows']} baris, {result['done']} sudah selesai, "
+            f"{result['remaining']} tersisa"
+        )
+        if result["warnings"]:
+            text += "\nPeringatan: " + "; ".join(result["warnings"])
+        self.inspect_label.setText(text)
+        self._resume_pending_start()
+
+    def _on_inspect_failed(self, path, message):
+        if path != self._inspection_path:
+            return
+        self._inspection_error = message
+        self.inspect_label.setText(f"Gagal membaca file: {message}")
+        self._resume_pending_start()
+
+    def _resume_pending_start(self):
+        if not self._start_pending:
+            return
+        self._start_pending = False
+        self.start_button.setEnabled(True)
+        self._confirm_start()
+
+    def _refresh_dashboard(self):
+        if not self._worker:
+            return
+        snap = self._worker.stats.snapshot()
+        rate = snap["rows_per_min"]
+        self.rate_label.setText(
+            f"{rate:.1f} baris/menit ({snap['processed']}/{snap['total']})"
+            if rate is not None
+            else f"- ({snap['processed']}/{snap['total']})"
+        )
+        self.eta_label.setText(
+            f"{format_duration(snap['eta_s'])} "
+            f"(berjalan {format_duration(snap['elapsed_s'])})"
+        )
+        counts = snap["status_counts"]
+        self.counts_label.setText(
+            ", ".join(f"{key}: {counts[key]}" for key in sorted(counts)) or "-"
+        )
+        self.cooldown_label.setText(
+            f"{format_duration(snap['cooldown_s'])} ({snap['rate_limits']}x 429)"
+        )
+        self.phase_label.setText(snap["phase"])
+
+    def _flush_logs(self):
+        if not self._worker:
+            return
+        lines = self._worker.drain_logs()
+        if lines:
+            self.log_output.appendPlainText("\n".join(lines))
 
-    def _append_log(self, text):
-        self.log_output.appendPlainText(text)
+    def _open_log_file(self):
+        if self._log_file_path and os.path.exists(self._log_file_path):
+            QDesktopServices.openUrl(
+                QUrl.fromLocalFile(os.path.abspath(self._log_file_path))
+            )
 
     def _browse_file(self, input_widget, filter):
         path, _ = QFileDialog.getOpenFileName(self, "Select", "", filter)
         if path:
             input_widget.setText(path)
             self._save_settings()
+            if input_widget is self.excel_input:
+                self._inspect_excel()
 
     def _on_excel_edit_finished(self):
         self._save_settings()
+        if self._current_excel_path() != self._inspection_path:
+            self._inspect_excel()
 
     def _toggle_range(self):
         enabled = self.range_switch.isChecked()
@@ -292,6 +463,8 @@ class RunPage(QWidget):
             self.manual_switch.setChecked(opts.get("manual_only", False))
             self.headless_switch.setChecked(opts.get("headless", False))
             self.keep_open_switch.setChecked(opts.get("keep_open", False))
+            self.scan_only_switch.setChecked(opts.get("scan_only", False))
+            self.profile_switch.setChecked(opts.get("profile", False))
             self.range_switch.setChecked(opts.get("range_enabled", False))
             self.start_spin.setValue(opts.get("start_row", 1))
             self.end_spin.setValue(opts.get("end_row", 100))
@@ -303,6 +476,7 @@ class RunPage(QWidget):
             self.excel_input.setText(path)
             
         self._toggle_range()
+        self._inspect_excel()
 
     def _save_settings(self):
         data = SettingsManager.load()
@@ -311,6 +485,8 @@ class RunPage(QWidget):
             "manual_only": self.manual_switch.isChecked(),
             "headless": self.headless_switch.isChecked(),
             "keep_open": self.keep_open_switch.isChecked(),
+            "scan_only": self.scan_only_switch.isChecked(),
+            "profile": self.profile_switch.isChecked(),
             "range_enabled": self.range_switch.isChecked(),
             "start_row": self.start_spin.value(),
             "end_row": self.end_spin.value(),
@@ -13,3 +13,5 @@ class RunConfig:
     web_timeout_s: int
     range_enabled: bool
     keep_open: bool
+    scan_only: bool = False
+    profile: bool = False
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import Counter, deque
+
+from dirgc.events import (
+    COOLDOWN_TICK,
+    PHASE_COMPLETED,
+    PHASE_ORDER,
+    RATE_LIMITED,
+    ROW_FINISHED,
+    ROW_STARTED,
+    RUN_FINISHED,
+    RUN_STARTED,
+    SESSION_RELOGIN,
+)
+
+RATE_WINDOW_S = 300
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    seconds = max(0, int(round(seconds)))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class RunStatsTracker:
+    """Aggregate run events into dashboard numbers.
+
+    Subscribed to the worker's EventBus, so it runs on the worker thread and
+    only updates counters; the UI polls snapshot() on its own timer instead
+    of receiving a signal per event.
+    """
+
+    def __init__(self, window_s=RATE_WINDOW_S):
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = None
+            self.finished_at = None
+            self.total = 0
+            self.processed = 0
+            self.status_counts = Counter()
+            self.phase = "-"
+            self.rate_limits = 0
+            self._finished_times = deque()
+            self._cooldown_s = 0.0
+            self._cooldown_since = None
+            self._row_open = False
+
+    def _end_cooldown(self, timestamp):
+        if self._cooldown_since is not None:
+            self._cooldown_s += max(0.0, timestamp - self._cooldown_since)
+            self._cooldown_since = None
+
+    def __call__(self, event):
+        kind = event.kind
+        ts = event.timestamp
+        with self._lock:
+            if kind == RUN_STARTED:
+                self.started_at = ts
+                self.total = int(event.get("total") or 0)
+                self.phase = "start"
+            elif kind == ROW_STARTED:
+                self._end_cooldown(ts)
+                self._row_open = True
+                self.phase = PHASE_ORDER[0]
+            elif kind == PHASE_COMPLETED:
+                phase = event.get("phase")
+                if phase in PHASE_ORDER[:-1]:
+                    self.phase = PHASE_ORDER[PHASE_ORDER.index(phase) + 1]
+                else:
+                    self.phase = "finalize"
+            elif kind == ROW_FINISHED:
+                self._end_cooldown(ts)
+                self.processed = int(event.get("processed") or 0)
+                self.status_counts[event.get("status") or "unknown"] += 1
+                # Rows skipped before ROW_STARTED (history, unchanged input,
+                # journal, card index) take no time; they would inflate the
+                # rate and make the ETA too optimistic.
+                if self._row_open:
+                    self._finished_times.append(ts)
+                self._row_open = False
+                self.phase = "-"
+            elif kind == RATE_LIMITED:
+                self.rate_limits += 1
+                if self._cooldown_since is None:
+                    self._cooldown_since = ts
+                self.phase = "cooldown"
+            elif kind == COOLDOWN_TICK:
+                if self._cooldown_since is None:
+                    self._cooldown_since = ts
+                if (event.get("remaining_s") or 0) <= 0:
+                    # Last tick of a 429 cooldown or breaker pause.
+                    self._end_cooldown(ts)
+            elif kind == SESSION_RELOGIN:
+                self._end_cooldown(ts)
+                self.phase = "relogin"
+            elif kind == RUN_FINISHED:
+                self._end_cooldown(ts)
+                self.finished_at = ts
+                self.phase = "selesai"
+
+    def snapshot(self, now=None):
+        """Return a dict of display values computed at `now`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.finished_at is not None:
+                now = self.finished_at
+            times = self._finished_times
+            while times and times[0] < now - self.window_s:
+                times.popleft()
+            rate = None
+            if self.started_at is not None and times:
+                span = min(self.window_s, now - self.started_at)
+                if span > 0:
+                    rate = len(times) * 60.0 / span
+            remaining = max(0, self.total - self.processed)
+            eta = None
+            if rate and remaining:
+                eta = remaining * 60.0 / rate
+            elif self.total and not remaining:
+                eta = 0.0
+            cooldown = self._cooldown_s
+            if self._cooldown_since is not None:
+                cooldown += max(0.0, now - self._cooldown_since)
+            elapsed = None
+            if self.started_at is not None:
+                elapsed = now - self.started_at
+            return {
+                "processed": self.processed,
+                "total": self.total,
+                "rows_per_min": rate,
+                "eta_s": eta,
+                "elapsed_s": elapsed,
+                "status_counts": dict(self.status_counts),
+                "cooldown_s": cooldown,
+                "rate_limits": self.rate_limits,
+                "phase": self.phase,
+            }
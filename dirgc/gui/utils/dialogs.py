@@ -13,9 +13,13 @@ class DialogHelper:
         return w.exec_() == QMessageBox.Yes
 
     @staticmethod
-    def resume_dialog(parent, last_row):
+    def resume_dialog(parent, last_row, remaining=None, done=None):
+        summary = ""
+        if remaining is not None and done is not None:
+            summary = f"{remaining} baris tersisa, {done} sudah selesai.\n"
         message = (
-            f"Ditemukan pengerjaan terakhir sampai baris {last_row}.\n\n"
+            f"Ditemukan pengerjaan terakhir sampai baris {last_row}.\n"
+            f"{summary}\n"
             f"Klik Yes untuk LANJUT dari baris {last_row + 1}.\n"
             f"Klik No untuk mulai sesuai settingan di layar."
         )
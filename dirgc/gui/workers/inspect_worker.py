@@ -0,0 +1,19 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from dirgc.input_inspect import inspect_input
+
+class InspectWorker(QThread):
+    """Parse/validate the input file and compute resume info off the UI thread."""
+    inspected = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, excel_file, parent=None):
+        super().__init__(parent)
+        self.excel_file = excel_file
+
+    def run(self):
+        try:
+            result = inspect_input(self.excel_file)
+        except Exception as exc:
+            self.failed.emit(self.excel_file, str(exc))
+            return
+        self.inspected.emit(self.excel_file, result)
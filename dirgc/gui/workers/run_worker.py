@@ -1,12 +1,13 @@
 
 import threading
 from PyQt5.QtCore import QThread, pyqtSignal
-from dirgc.cli import run_dirgc
-from dirgc.logging_utils import set_log_handler
+from dirgc.events import ROW_FINISHED, EventBus
+from dirgc.logging_utils import DIVIDER_LEN, set_log_handler
+from dirgc.run_logs import build_run_log_path
+from dirgc.gui.state.run_stats import RunStatsTracker
 
 class RunWorker(QThread):
     progress = pyqtSignal(int, int, int)
-    log_emitted = pyqtSignal(str)
 
     def __init__(self, config, sso_page=None):
         super().__init__()
@@ -14,8 +15,25 @@ class RunWorker(QThread):
         self._stop_event = threading.Event()
         self._close_event = threading.Event()
         self._sso_page = sso_page
+        self.event_bus = EventBus()
+        self.event_bus.subscribe(self._handle_event)
+        self.stats = RunStatsTracker()
+        self.event_bus.subscribe(self.stats)
+        # Log lines are buffered here and drained by the UI on a timer;
+        # the full history goes to log_file_path.
+        self._log_lock = threading.Lock()
+        self._log_buffer = []
+        self._log_file = None
+        self.log_file_path = str(build_run_log_path(prefix="gui", suffix=".log"))
 
     def run(self):
+        # Deferred so opening the window does not pay for Playwright.
+        from dirgc.cli import run_dirgc
+
+        try:
+            self._log_file = open(self.log_file_path, "a", encoding="utf-8")
+        except OSError:
+            self._log_file = None
         set_log_handler(self.handle_log)
         try:
             creds = None
@@ -42,9 +60,11 @@ class RunWorker(QThread):
                 idle_timeout_ms=self._config.idle_timeout_ms,
                 web_timeout_s=self._config.web_timeout_s,
                 keep_open=self._config.keep_open,
+                scan_only=self._config.scan_only,
+                profile=self._config.profile,
                 credentials=creds,
                 stop_event=self._stop_event,
-                progress_callback=self._emit_progress,
+                event_bus=self.event_bus,
                 wait_for_close=self._wait_for_close
                 if self._config.keep_open
                 else None,
@@ -53,6 +73,9 @@ class RunWorker(QThread):
             raise
         finally:
             set_log_handler(None)
+            if self._log_file:
+                self._log_file.close()
+                self._log_file = None
 
     def _wait_for_close(self):
         # We need to signal the UI to maybe show a "release" button or just wait?
@@ -70,11 +93,26 @@ class RunWorker(QThread):
         self._stop_event.set()
 
     def handle_log(self, line, **kwargs):
-        self.log_emitted.emit(line)
+        lines = [line]
         if kwargs.get('spacer'):
-            self.log_emitted.emit("")
+            lines.append("")
         if kwargs.get('divider'):
-            self.log_emitted.emit("-" * 72) # Match DIVIDER_LEN
+            lines.append("-" * DIVIDER_LEN)
+        with self._log_lock:
+            self._log_buffer.extend(lines)
+        if self._log_file:
+            self._log_file.write("\n".join(lines) + "\n")
+            self._log_file.flush()
 
-    def _emit_progress(self, processed, total, excel_row):
-        self.progress.emit(int(processed), int(total), int(excel_row))
+    def drain_logs(self):
+        """Return and clear the lines logged since the previous call."""
+        with self._log_lock:
+            lines = self._log_buffer
+            self._log_buffer = []
+        return lines
+
+    def _handle_event(self, event):
+        if event.kind == ROW_FINISHED:
+            self.progress.emit(
+                int(event["processed"]), int(event["total"]), int(event["row_excel"])
+            )
@@ -0,0 +1,147 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from .events import PHASE_COMPLETED, ROW_FINISHED, EventBus
+
+
+class ReplayTimings:
+    """EventBus subscriber collecting row and phase durations."""
+
+    def __init__(self):
+        self.rows = []
+        self.statuses = defaultdict(int)
+        self.phases = defaultdict(list)
+
+    def __call__(self, event):
+        if event.kind == PHASE_COMPLETED:
+            self.phases[event.get("phase")].append(event.get("duration") or 0.0)
+        elif event.kind == ROW_FINISHED:
+            self.statuses[event.get("status") or "unknown"] += 1
+            # Skipped rows never touch the page; they would flatten the median.
+            if event.get("status") != "skipped":
+                self.rows.append(event.get("duration") or 0.0)
+
+
+def run_replay(
+    har_path,
+    excel_file,
+    start_row=None,
+    end_row=None,
+    headless=True,
+    humanize=False,
+    workdir=None,
+):
+    """Run process_excel_rows against a recorded HAR in a scratch directory.
+
+    config/ and logs/ are relative paths, so the run is executed from
+    `workdir` (a fresh temporary directory by default): the journal, run
+    log, last-run state and fingerprints of the real installation are not
+    touched, and no row is skipped because it was completed before.
+    """
+    from .cli import ensure_playwright_browsers, run_dirgc
+
+    # Resolve a ./playwright-browsers bundle before leaving the current dir.
+    ensure_playwright_browsers()
+
+    har_path = os.path.abspath(har_path)
+    excel_file = os.path.abspath(excel_file)
+    workdir = workdir or tempfile.mkdtemp(prefix="dirgc-replay-")
+    os.makedirs(workdir, exist_ok=True)
+    timings = ReplayTimings()
+    event_bus = EventBus()
+    event_bus.subscribe(timings, kinds=(PHASE_COMPLETED, ROW_FINISHED))
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    started = time.perf_counter()
+    try:
+        run_dirgc(
+            headless=headless,
+            excel_file=excel_file,
+            start_row=start_row,
+            end_row=end_row,
+            replay_har=har_path,
+            humanize=humanize,
+            event_bus=event_bus,
+            metrics_every=0,
+        )
+    finally:
+        os.chdir(previous_cwd)
+    elapsed = time.perf_counter() - started
+    rows = timings.rows
+    return {
+        "workdir": workdir,
+        "seconds": elapsed,
+        "rows": len(rows),
+        "statuses": dict(timings.statuses),
+        "ms_per_row": statistics.median(rows) * 1000 if rows else 0.0,
+        "ms_per_row_max": max(rows) * 1000 if rows else 0.0,
+        "rows_per_s": len(rows) / sum(rows) if rows and sum(rows) else 0.0,
+        "phase_ms": {
+            phase: statistics.median(values) * 1000
+            for phase, values in timings.phases.items()
+            if values
+        },
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Replay a HAR recorded with `--record-har` through the full row "
+            "pipeline offline and report per-row overhead."
+        )
+    )
+    parser.add_argument("har", help="HAR file recorded with --record-har.")
+    parser.add_argument("excel", help="The Excel file used for the recording.")
+    parser.add_argument("--start-row", type=int)
+    parser.add_argument("--end-row", type=int)
+    parser.add_argument(
+        "--headed", action="store_true", help="Show the browser window."
+    )
+    parser.add_argument(
+        "--humanize",
+        action="store_true",
+        help="Keep the random delays (measures wall time of a real run).",
+    )
+    parser.add_argument(
+        "--workdir", help="Directory for logs/config of the replay (default: temp)."
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    result = run_replay(
+        args.har,
+        args.excel,
+        start_row=args.start_row,
+        end_row=args.end_row,
+        headless=not args.headed,
+        humanize=args.humanize,
+        workdir=args.workdir,
+    )
+    statuses = ", ".join(
+        f"{status}={count}" for status, count in sorted(result["statuses"].items())
+    )
+    phases = ", ".join(
+        f"{phase}={ms:.0f}ms" for phase, ms in sorted(result["phase_ms"].items())
+    )
+    print(
+        f"rows={result['rows']} median={result['ms_per_row']:.0f} ms/row "
+        f"max={result['ms_per_row_max']:.0f} ms "
+        f"({result['rows_per_s']:.2f} rows/s, total {result['seconds']:.1f}s)"
+    )
+    print(f"statuses: {statuses or '-'}")
+    print(f"phases (median): {phases or '-'}")
+    print(f"logs: {result['workdir']}")
+    if not result["rows"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import csv
+import hashlib
+import os
+
+from .excel import iter_excel_rows
+from .settings import INPUT_FINGERPRINT_FILE
+
+FINGERPRINT_FIELDS = (
+    "idsbr",
+    "nama_usaha",
+    "alamat",
+    "latitude",
+    "longitude",
+    "hasil_gc",
+)
+OUTPUT_COLUMNS = FINGERPRINT_FIELDS
+
+
+def row_key(row):
+    """IDSBR when present, otherwise name + address."""
+    if row.idsbr:
+        return row.idsbr
+    return f"~{row.nama_usaha.lower()}|{row.alamat.lower()}"
+
+
+def row_fingerprint(row):
+    payload = "\x1f".join(
+        "" if getattr(row, field) is None else str(getattr(row, field))
+        for field in FINGERPRINT_FIELDS
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_rows(rows):
+    return {row_key(row): row_fingerprint(row) for row in rows}
+
+
+def load_fingerprints(path=None):
+    path = path or INPUT_FINGERPRINT_FILE
+    fingerprints = {}
+    if not os.path.exists(path):
+        return fingerprints
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        for record in csv.reader(handle):
+            if len(record) >= 2:
+                fingerprints[record[0]] = record[1]
+    return fingerprints
+
+
+def save_fingerprints(fingerprints, path=None):
+    path = path or INPUT_FINGERPRINT_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        for key, fingerprint in fingerprints.items():
+            writer.writerow((key, fingerprint))
+    os.replace(temp_path, path)
+
+
+def write_rows_csv(rows, output_path):
+    with open(output_path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(OUTPUT_COLUMNS)
+        for row in rows:
+            writer.writerow(
+                [
+                    "" if getattr(row, field) is None else getattr(row, field)
+                    for field in OUTPUT_COLUMNS
+                ]
+            )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare a new directory export against a previous one and "
+            "write only new or changed rows."
+        )
+    )
+    parser.add_argument("excel_file", help="New export (xlsx/csv/tsv/gz).")
+    parser.add_argument(
+        "-a",
+        "--against",
+        help=(
+            "Previous export to compare with. Defaults to the fingerprints "
+            f"of completed rows in {INPUT_FINGERPRINT_FILE}."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="CSV file to write the new/changed rows to.",
+    )
+    parser.add_argument(
+        "--fingerprint-file",
+        default=INPUT_FINGERPRINT_FILE,
+        # Read-only here: the store lists rows the processor completed, so
+        # only process_excel_rows writes it.
+        help="Fingerprint store of completed rows to compare with.",
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.against:
+        previous = fingerprint_rows(iter_excel_rows(args.against))
+    else:
+        previous = load_fingerprints(args.fingerprint_file)
+
+    counts = {"total": 0, "new": 0, "changed": 0}
+
+    # Single streaming pass; only the fingerprint map is held in memory.
+    def changed_rows():
+        for row in iter_excel_rows(args.excel_file):
+            counts["total"] += 1
+            key = row_key(row)
+            fingerprint = row_fingerprint(row)
+            old = previous.get(key)
+            if old == fingerprint:
+                continue
+            counts["new" if old is None else "changed"] += 1
+            yield row
+
+    write_rows_csv(changed_rows(), args.output)
+    print(
+        f"new={counts['new']} changed={counts['changed']} "
+        f"unchanged={counts['total'] - counts['new'] - counts['changed']} "
+        f"output={args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .excel import iter_excel_rows, resolve_excel_path
+from .run_logs import LOGS_DIR, get_completed_idsbrs, get_last_processed_row
+from .settings import LAST_RUN_STATE_FILE
+
+HISTORY_DAYS = 30
+
+_CACHE_LOCK = threading.Lock()
+_ROWS_CACHE = {}
+_HISTORY_CACHE = {}
+
+
+def file_key(path):
+    """Cache key that changes whenever the file is replaced or edited."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def history_key(days_back=HISTORY_DAYS):
+    """Cache key for run history: newest mtime of the state file and logs."""
+    newest = 0
+    count = 0
+    candidates = [Path(LAST_RUN_STATE_FILE)]
+    today = datetime.now()
+    for day_offset in range(days_back):
+        folder = Path(LOGS_DIR) / (today - timedelta(days=day_offset)).strftime("%Y%m%d")
+        if folder.exists():
+            candidates.extend(folder.glob("run*_*.csv"))
+            candidates.extend(folder.glob("run*_*.xlsx"))
+    for path in candidates:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        count += 1
+        newest = max(newest, mtime)
+    return (newest, count)
+
+
+def read_resume_row():
+    """Last processed Excel row from the state file, else from run logs."""
+    last_row = 0
+    if os.path.exists(LAST_RUN_STATE_FILE):
+        try:
+            with open(LAST_RUN_STATE_FILE, "r") as f:
+                last_row = int(json.load(f).get("last_row", 0))
+        except Exception:
+            last_row = 0
+    if last_row == 0:
+        last_row = get_last_processed_row()
+    return last_row
+
+
+def summarize_rows(path):
+    """Parse and validate the input once; keep only what the GUI needs."""
+    idsbrs = []
+    missing_idsbr = 0
+    missing_hasil_gc = 0
+    missing_coords = 0
+    for row in iter_excel_rows(path):
+        idsbrs.append(row.idsbr)
+        if not row.idsbr:
+            missing_idsbr += 1
+        if row.hasil_gc is None:
+            missing_hasil_gc += 1
+        if not row.latitude or not row.longitude:
+            missing_coords += 1
+    warnings = []
+    if missing_idsbr:
+        warnings.append(f"{missing_idsbr} baris tanpa IDSBR")
+    if missing_hasil_gc:
+        warnings.append(f"{missing_hasil_gc} baris tanpa kode hasil_gc valid")
+    if missing_coords:
+        warnings.append(f"{missing_coords} baris tanpa koordinat")
+    return {"idsbrs": tuple(idsbrs), "warnings": warnings}
+
+
+def _cached(cache, key, build):
+    with _CACHE_LOCK:
+        if key in cache:
+            return cache[key]
+    value = build()
+    with _CACHE_LOCK:
+        cache.clear()
+        cache[key] = value
+    return value
+
+
+def inspect_input(excel_file):
+    """Return row counts, validation warnings and resume info for a file.
+
+    Parsing is cached per (path, mtime, size) and run history per newest
+    log mtime, so repeated calls for an unchanged setup are cheap. Raises
+    FileNotFoundError/RuntimeError for unreadable input.
+    """
+    path = resolve_excel_path(excel_file)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    summary = _cached(_ROWS_CACHE, file_key(path), lambda: summarize_rows(path))
+    history = _cached(
+        _HISTORY_CACHE,
+        history_key(),
+        lambda: {
+            "last_row": read_resume_row(),
+            "completed": frozenset(get_completed_idsbrs(HISTORY_DAYS)),
+        },
+    )
+
+    idsbrs = summary["idsbrs"]
+    completed = history["completed"]
+    last_row = history["last_row"]
+    done = sum(1 for idsbr in idsbrs if idsbr and idsbr in completed)
+    remaining_after_resume = sum(
+        1
+        for idsbr in idsbrs[min(last_row, len(idsbrs)):]
+        if not (idsbr and idsbr in completed)
+    )
+    return {
+        "path": path,
+        "total_rows": len(idsbrs),
+        "done": done,
+        "remaining": len(idsbrs) - done,
+        "last_row": last_row,
+        "remaining_after_resume": remaining_after_resume,
+        "warnings": list(summary["warnings"]),
+    }
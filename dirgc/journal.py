@@ -0,0 +1,113 @@
+import json
+import os
+import time
+
+from .settings import ROW_JOURNAL_FILE
+
+STATE_SEARCHING = "searching"
+STATE_SUBMITTING = "submitting"
+STATE_CONFIRMED = "confirmed"
+JOURNAL_STATES = (STATE_SEARCHING, STATE_SUBMITTING, STATE_CONFIRMED)
+COMPACT_MIN_LINES = 1000
+
+
+class RowJournal:
+    """Append-only write-ahead journal of per-row submission state.
+
+    Each transition is one JSON line, flushed and fsync'd before the action
+    it announces, so after a crash the last line for a row tells whether
+    the submit may have reached the server:
+
+    - searching: nothing was sent yet; the row is simply processed again.
+    - submitting: the submit was clicked but no outcome was seen; the row
+      is "in doubt" and needs a verification lookup.
+    - confirmed: the server accepted it (or it was already GC); skip.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ROW_JOURNAL_FILE
+        self.states = {}
+        self._handle = None
+        self._lines = 0
+
+    @classmethod
+    def load(cls, path=None):
+        journal = cls(path)
+        journal._replay()
+        if journal._lines >= COMPACT_MIN_LINES and journal._lines > 2 * len(
+            journal.states
+        ):
+            journal.compact()
+        return journal
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write.
+                    continue
+                key = entry.get("key")
+                if key and entry.get("state") in JOURNAL_STATES:
+                    self.states[key] = entry
+                    self._lines += 1
+
+    def compact(self):
+        """Rewrite the journal with only the latest entry per row."""
+        self.close()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            for entry in self.states.values():
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+        self._lines = len(self.states)
+
+    def state(self, key):
+        entry = self.states.get(key)
+        return entry["state"] if entry else None
+
+    def is_confirmed(self, key):
+        return self.state(key) == STATE_CONFIRMED
+
+    def is_in_doubt(self, key):
+        return self.state(key) == STATE_SUBMITTING
+
+    def record(self, key, state, **fields):
+        """Durably append a state transition for `key`."""
+        if not key:
+            return
+        entry = {"key": key, "state": state, "ts": time.time(), **fields}
+        if self._handle is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._handle = open(self.path, "a", encoding="utf-8")
+            if self._ends_torn():
+                self._handle.write("\n")
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.states[key] = entry
+        self._lines += 1
+
+    def _ends_torn(self):
+        # A crash mid-write leaves a partial line; start on a fresh one.
+        try:
+            with open(self.path, "rb") as handle:
+                handle.seek(0, os.SEEK_END)
+                if handle.tell() == 0:
+                    return False
+                handle.seek(-1, os.SEEK_END)
+                return handle.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -1,5 +1,9 @@
+import atexit
+import json
 import os
+import queue
 import sys
+import threading
 import time
 
 
@@ -19,13 +23,26 @@ FIELD_ORDER = (
     "path",
 )
 DIVIDER_LEN = 72
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "ERROR": 40,
+}
 LEVEL_COLORS = {
+    "DEBUG": "\x1b[36m",
     "INFO": "\x1b[32m",
     "WARN": "\x1b[33m",
     "ERROR": "\x1b[31m",
 }
 RESET_COLOR = "\x1b[0m"
 _LOG_HANDLER = None
+_LOG_LEVEL = LEVELS["INFO"]
+_CONSOLE_ENABLED = True
+_JSON_SINK = None
+_QUEUE = queue.Queue()
+_WORKER = None
+_WORKER_LOCK = threading.Lock()
 
 
 def normalize_log_value(value):
@@ -58,7 +75,7 @@ def format_log_fields(fields):
 
 
 def colorize_level(level):
-    if not sys.stdout.isatty():
+    if not sys.stdout or not sys.stdout.isatty():
         return level
     if os.getenv("NO_COLOR"):
         return level
@@ -68,39 +85,126 @@ def colorize_level(level):
     return f"{color}{level}{RESET_COLOR}"
 
 
-def log(level, message, **fields):
+def set_log_level(level):
+    """Set the minimum level (name or number); lower records are dropped."""
+    global _LOG_LEVEL
+    if isinstance(level, str):
+        level = LEVELS[level.upper()]
+    _LOG_LEVEL = level
+
+
+def log_enabled(level):
+    """Check before building expensive log messages."""
+    return LEVELS.get(level, LEVELS["INFO"]) >= _LOG_LEVEL
+
+
+def set_console_output(enabled):
+    global _CONSOLE_ENABLED
+    _CONSOLE_ENABLED = bool(enabled)
+
+
+def set_json_log_file(path):
+    """Also write every record as one JSON object per line (None disables)."""
+    global _JSON_SINK
+    flush_logs()
+    if _JSON_SINK:
+        _JSON_SINK.close()
+        _JSON_SINK = None
+    if path:
+        directory = os.path.dirname(str(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _JSON_SINK = open(path, "a", encoding="utf-8")
+
+
+def _ensure_worker():
+    global _WORKER
+    if _WORKER is not None:
+        return
+    with _WORKER_LOCK:
+        if _WORKER is None:
+            worker = threading.Thread(
+                target=_drain_queue, name="dirgc-log", daemon=True
+            )
+            worker.start()
+            _WORKER = worker
+
+
+def _drain_queue():
+    while True:
+        record = _QUEUE.get()
+        try:
+            _write_record(*record)
+        except Exception:
+            pass
+        finally:
+            _QUEUE.task_done()
+
+
+def _write_record(level, message, fields, created):
+    # Runs on the logging thread: all formatting and I/O happen here, and
+    # only for the sinks that are enabled.
+    handler = _LOG_HANDLER
+    json_sink = _JSON_SINK
+    console = _CONSOLE_ENABLED and sys.stdout is not None
+    if not (handler or json_sink or console):
+        return
+
     spacer = bool(fields.pop("_spacer", False))
     divider = bool(fields.pop("_divider", False))
-    timestamp = time.strftime("%H:%M:%S")
-    suffix = format_log_fields(fields)
-    level_text = colorize_level(level)
-    if _LOG_HANDLER:
-        line = format_log_line(level, message, fields, timestamp)
-        _LOG_HANDLER(line, spacer=spacer, divider=divider)
-    if spacer:
-        print()
-    if divider:
-        print("-" * DIVIDER_LEN)
-    if suffix:
-        print(f"[{timestamp}] {level_text}: {message} | {suffix}")
-    else:
-        print(f"[{timestamp}] {level_text}: {message}")
-
-
-def format_log_line(level, message, fields, timestamp=None):
-    if timestamp is None:
-        timestamp = time.strftime("%H:%M:%S")
+    timestamp = time.strftime("%H:%M:%S", time.localtime(created))
     suffix = format_log_fields(fields)
-    if suffix:
-        return f"[{timestamp}] {level}: {message} | {suffix}"
-    return f"[{timestamp}] {level}: {message}"
+    tail = f"{message} | {suffix}" if suffix else message
+
+    if handler:
+        handler(f"[{timestamp}] {level}: {tail}", spacer=spacer, divider=divider)
+    if console:
+        if spacer:
+            print()
+        if divider:
+            print("-" * DIVIDER_LEN)
+        print(f"[{timestamp}] {colorize_level(level)}: {tail}", flush=True)
+    if json_sink:
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created)),
+            "level": level,
+            "message": message,
+        }
+        for key, value in fields.items():
+            payload[key] = (
+                value
+                if value is None or isinstance(value, (bool, int, float, str))
+                else str(value)
+            )
+        json_sink.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        json_sink.flush()
+
+
+def log(level, message, **fields):
+    if LEVELS.get(level, LEVELS["INFO"]) < _LOG_LEVEL:
+        return
+    _ensure_worker()
+    _QUEUE.put((level, message, fields, time.time()))
+
+
+def flush_logs():
+    """Block until every queued record has been written."""
+    if _WORKER is None or threading.current_thread() is _WORKER:
+        return
+    _QUEUE.join()
 
 
 def set_log_handler(handler):
     global _LOG_HANDLER
+    # Deliver pending records to the handler they were logged under.
+    flush_logs()
     _LOG_HANDLER = handler
 
 
+def log_debug(message, **fields):
+    log("DEBUG", message, **fields)
+
+
 def log_info(message, **fields):
     log("INFO", message, **fields)
 
@@ -111,3 +215,6 @@ def log_warn(message, **fields):
 
 def log_error(message, **fields):
     log("ERROR", message, **fields)
+
+
+atexit.register(flush_logs)
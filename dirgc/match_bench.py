@@ -0,0 +1,198 @@
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+from .match_corpus import load_corpus
+from .matching import (
+    _match_tokens,
+    _normalize_text,
+    choose_card,
+    haystack_tokens,
+)
+
+SAMPLE_NAMES = (
+    "TOKO SUMBER REJEKI",
+    "WARUNG MAKAN BU SRI",
+    "CV. KARYA MANDIRI JAYA",
+    "UD. TANI MAKMUR",
+    "BENGKEL MOTOR ANUGERAH",
+    "KIOS PULSA BERKAH 2",
+    "APOTEK KIMIA FARMA 0312",
+    "RUMAH MAKAN PADANG SIMPANG RAYA",
+)
+SAMPLE_STREETS = (
+    "JL. JENDERAL SUDIRMAN",
+    "JL. SENGKAWIT",
+    "JL. DIPONEGORO GG. MAWAR",
+    "JL. MURUTU RT 05",
+    "JL. KATAMSO",
+    "JL. SABANAR LAMA",
+)
+SAMPLE_AREAS = (
+    "TANJUNG SELOR HILIR, BULUNGAN",
+    "TANJUNG SELOR HULU, BULUNGAN",
+    "TANJUNG PALAS, BULUNGAN",
+)
+
+
+def build_sample_cards(count, seed=1):
+    """Card texts shaped like DIRGC result cards (name, IDSBR, address)."""
+    rng = random.Random(seed)
+    cards = []
+    for index in range(count):
+        idsbr = str(10000000 + index)
+        nama = rng.choice(SAMPLE_NAMES)
+        alamat = (
+            f"{rng.choice(SAMPLE_STREETS)} NO. {rng.randint(1, 200)}, "
+            f"{rng.choice(SAMPLE_AREAS)}"
+        )
+        text = (
+            f"{nama}\nIDSBR: {idsbr}\n{alamat}\n"
+            "KBLI 47111 - Perdagangan Eceran Berbagai Macam Barang\n"
+            f"{rng.choice(('Belum GC', 'Sudah GC'))}"
+        )
+        cards.append({"idsbr": idsbr, "nama": nama, "alamat": alamat, "text": text})
+    return cards
+
+
+def clear_caches():
+    _normalize_text.cache_clear()
+    _match_tokens.cache_clear()
+    haystack_tokens.cache_clear()
+
+
+def run_normalization_benchmark(rows=2000, cards_per_row=8, cold=False, seed=1):
+    rng = random.Random(seed)
+    cards = build_sample_cards(400, seed=seed)
+    queries = [rng.choice(cards) for _ in range(rows)]
+    results = [
+        [card["text"] for card in rng.sample(cards, cards_per_row)]
+        for _ in range(rows)
+    ]
+    clear_caches()
+    start = time.perf_counter()
+    for query, texts in zip(queries, results):
+        if cold:
+            clear_caches()
+        # The real matcher, so the benchmark cannot drift from it.
+        choose_card(texts, query["idsbr"], query["nama"], query["alamat"])
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "cards": rows * cards_per_row,
+        "seconds": elapsed,
+        "us_per_card": elapsed / (rows * cards_per_row) * 1e6,
+        "rows_per_s": rows / elapsed if elapsed else 0.0,
+    }
+
+
+def run_corpus_benchmark(records, repeat=1):
+    """Replay recorded decisions through choose_card.
+
+    Reports match/ambiguity rates and per-row matching time, and lists
+    records whose decision differs from the recorded one (regressions).
+    """
+    records = list(records)
+    reasons = Counter()
+    regressions = []
+    clear_caches()
+    start = time.perf_counter()
+    for iteration in range(max(1, repeat)):
+        for number, record in enumerate(records, start=1):
+            selected, reason, _ = choose_card(
+                record["texts"],
+                record["idsbr"],
+                record["nama_usaha"],
+                record["alamat"],
+            )
+            if iteration:
+                continue
+            reasons[reason] += 1
+            if (selected, reason) != (record.get("selected"), record.get("reason")):
+                regressions.append(
+                    {
+                        "record": number,
+                        "idsbr": record["idsbr"] or "-",
+                        "expected": f"{record.get('reason')}@{record.get('selected')}",
+                        "actual": f"{reason}@{selected}",
+                    }
+                )
+    elapsed = time.perf_counter() - start
+    rows = len(records)
+    evaluated = rows * max(1, repeat)
+    return {
+        "rows": rows,
+        "match_rate": reasons["matched"] / rows if rows else 0.0,
+        "ambiguity_rate": reasons["ambiguous"] / rows if rows else 0.0,
+        "reasons": dict(reasons),
+        "us_per_row": elapsed / evaluated * 1e6 if evaluated else 0.0,
+        "rows_per_s": evaluated / elapsed if elapsed else 0.0,
+        "regressions": regressions,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark match text normalization and scoring, or replay a "
+            "recorded match corpus as a regression suite."
+        )
+    )
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cards-per-row", type=int, default=8)
+    parser.add_argument(
+        "--corpus",
+        nargs="+",
+        help="Recorded match corpus (JSON lines from --record-matches).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Replay the corpus this many times for timing.",
+    )
+    return parser
+
+
+def report_corpus(args):
+    result = run_corpus_benchmark(load_corpus(args.corpus), repeat=args.repeat)
+    reasons = ", ".join(
+        f"{reason}={count}" for reason, count in sorted(result["reasons"].items())
+    )
+    print(
+        f"rows={result['rows']} match_rate={result['match_rate']:.1%} "
+        f"ambiguity_rate={result['ambiguity_rate']:.1%} "
+        f"({result['us_per_row']:.1f} us/row, {result['rows_per_s']:.0f} rows/s)"
+    )
+    print(f"reasons: {reasons or '-'}")
+    regressions = result["regressions"]
+    for item in regressions[:20]:
+        print(
+            f"REGRESSION record={item['record']} idsbr={item['idsbr']} "
+            f"expected={item['expected']} actual={item['actual']}"
+        )
+    if regressions:
+        print(f"{len(regressions)} decision(s) differ from the corpus.")
+        return 1
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.corpus:
+        sys.exit(report_corpus(args))
+    for label, cold in (("warm", False), ("cold", True)):
+        result = run_normalization_benchmark(
+            rows=args.rows, cards_per_row=args.cards_per_row, cold=cold
+        )
+        print(
+            f"{label}: {result['cards']} cards in {result['seconds'] * 1000:.1f} ms "
+            f"({result['us_per_card']:.2f} us/card, "
+            f"{result['rows_per_s']:.0f} rows/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+import time
+
+from .settings import MATCH_CORPUS_DIR
+
+
+def build_corpus_path(now=None):
+    now = now or time.localtime()
+    return os.path.join(
+        MATCH_CORPUS_DIR, time.strftime("matches_%Y%m%d_%H%M%S.jsonl", now)
+    )
+
+
+class MatchRecorder:
+    """Append every select_matching_card decision to a JSON-lines corpus.
+
+    Install with matching.set_match_recorder(); each line holds the row
+    values, the raw card texts and the decision, which is enough to replay
+    choose_card offline.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or build_corpus_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._handle = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, idsbr, nama_usaha, alamat, texts, reason, selected):
+        line = json.dumps(
+            {
+                "idsbr": idsbr or "",
+                "nama_usaha": nama_usaha or "",
+                "alamat": alamat or "",
+                "texts": list(texts),
+                "reason": reason,
+                "selected": selected,
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._handle.close()
+
+
+def load_corpus(paths):
+    """Yield corpus records from one or more JSON-lines files."""
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
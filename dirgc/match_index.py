@@ -0,0 +1,93 @@
+from .card_index import is_fresh
+from .matching import contains_tokens, match_tokens, normalize_match_text
+from .settings import CARD_INDEX_MAX_AGE_H
+
+
+class MatchIndex:
+    """Token inverted index over normalized card name/address texts.
+
+    Used to resolve rows without IDSBR to a candidate IDSBR offline, so the
+    server query can be a precise IDSBR lookup instead of a name/address
+    search. Resolution follows the same acceptance rules as
+    select_matching_card and refuses to guess when the result is ambiguous.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._haystacks = {}
+
+    def __len__(self):
+        return len(self._haystacks)
+
+    @classmethod
+    def from_card_index(cls, card_index, max_age_h=CARD_INDEX_MAX_AGE_H, now=None):
+        """Index the fresh cards seen by the last full harvest.
+
+        Cards missing from that harvest may have been removed or renamed on
+        the server; keeping them would make a name look unique offline.
+        """
+        index = cls()
+        complete_at = card_index.get("complete_at") or 0
+        for idsbr, entry in card_index["cards"].items():
+            seen_at = entry.get("seen_at", 0)
+            if seen_at < complete_at or not is_fresh(seen_at, max_age_h, now):
+                continue
+            index.add(
+                idsbr,
+                entry.get("nama", ""),
+                entry.get("alamat", ""),
+                entry.get("text", ""),
+            )
+        return index
+
+    def add(self, idsbr, *texts):
+        if not idsbr:
+            return
+        haystack = normalize_match_text(" ".join(t for t in texts if t))
+        if not haystack:
+            return
+        previous = self._haystacks.get(idsbr)
+        if previous:
+            haystack = f"{previous} {haystack}"
+        self._haystacks[idsbr] = haystack
+        for token in set(haystack.split()):
+            self._postings.setdefault(token, set()).add(idsbr)
+
+    def _candidates(self, tokens):
+        # Intersect the rarest postings first; exact tokens only. Partial
+        # (substring) matches are left to the server-side search.
+        postings = [self._postings.get(token) for token in tokens]
+        if not postings or any(not posting for posting in postings):
+            return set()
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def resolve(self, nama_usaha, alamat):
+        """Return (idsbr, reason); idsbr is None unless exactly one card fits."""
+        nama_tokens = match_tokens(nama_usaha) if nama_usaha else []
+        alamat_tokens = match_tokens(alamat) if alamat else []
+        if nama_tokens:
+            candidates = self._candidates(nama_tokens)
+        elif alamat_tokens:
+            candidates = self._candidates(alamat_tokens)
+        else:
+            return None, "empty"
+        if not candidates:
+            return None, "not_found"
+
+        if nama_tokens and alamat_tokens:
+            candidates = {
+                idsbr
+                for idsbr in candidates
+                if contains_tokens(self._haystacks[idsbr], alamat_tokens)
+            }
+            if not candidates:
+                return None, "not_found"
+        if len(candidates) > 1:
+            return None, "ambiguous"
+        return next(iter(candidates)), "resolved"
@@ -1,40 +1,64 @@
 import re
+from functools import lru_cache
 
 from .browser import wait_for_block_ui_clear
-from .logging_utils import log_info, log_warn
+from .logging_utils import log_debug, log_enabled, log_info, log_warn
 from .settings import MAX_MATCH_LOGS
 
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+NORMALIZE_CACHE_SIZE = 4096
+_MATCH_RECORDER = None
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_text(text):
+    text = text.strip().lower()
+    if not text:
+        return ""
+    return " ".join(NON_ALNUM_PATTERN.sub(" ", text).split())
+
 
 def normalize_match_text(value):
     if value is None:
         return ""
-    text = str(value).strip().lower()
-    if not text:
-        return ""
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return " ".join(text.split())
+    return _normalize_text(str(value))
 
 
-def match_tokens(value):
-    normalized = normalize_match_text(value)
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _match_tokens(text):
+    normalized = _normalize_text(text)
     if not normalized:
-        return []
-    tokens = normalized.split()
-    filtered = []
-    for token in tokens:
-        if token.isdigit():
-            filtered.append(token)
-        elif len(token) >= 3:
-            filtered.append(token)
+        return ()
+    filtered = tuple(
+        token
+        for token in normalized.split()
+        if token.isdigit() or len(token) >= 3
+    )
     if not filtered:
-        return [normalized]
+        return (normalized,)
     return filtered
 
 
+def match_tokens(value):
+    if value is None:
+        return ()
+    return _match_tokens(str(value))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def haystack_tokens(haystack):
+    """Token set of a normalized haystack, for O(1) whole-word lookups."""
+    return frozenset(haystack.split())
+
+
 def contains_tokens(haystack, tokens):
     if not tokens:
         return False
-    return all(token in haystack for token in tokens)
+    # Whole-word hits are answered by the token set; only tokens that are
+    # not a full word fall back to the substring scan (e.g. "jaya" inside
+    # "jayaraya"), which keeps the original matching semantics.
+    words = haystack_tokens(haystack)
+    return all(token in words or token in haystack for token in tokens)
 
 
 def join_tokens(tokens):
@@ -56,56 +80,43 @@ def summarize_match(index, flags, score, text, max_len=140):
     )
 
 
-def select_matching_card(page, monitor, idsbr, nama_usaha, alamat):
-    header_locator = page.locator(".usaha-card-header")
-    count = header_locator.count()
-    if count == 0:
-        return None
-
-    wait_for_block_ui_clear(page, monitor, timeout_s=15)
+def score_card(text, idsbr_norm, nama_tokens, alamat_tokens):
+    haystack = normalize_match_text(text)
+    flags = {
+        "idsbr": bool(idsbr_norm and idsbr_norm in haystack),
+        "nama": contains_tokens(haystack, nama_tokens),
+        "alamat": contains_tokens(haystack, alamat_tokens),
+    }
+    score = 0
+    if flags["idsbr"]:
+        score += 3
+    if flags["nama"]:
+        score += 2
+    if flags["alamat"]:
+        score += 1
+    return flags, score
+
+
+def choose_card(texts, idsbr, nama_usaha, alamat):
+    """Pick the card matching a row from the result card texts.
+
+    Pure function (no page access), shared by select_matching_card and the
+    offline corpus harness. Returns (selected_index, reason, ranked) where
+    reason is matched, no_results, mismatch, no_match, ambiguous or invalid
+    and ranked is the candidate list in the order used for the decision.
+    """
+    if not texts:
+        return None, "no_results", []
 
     idsbr_norm = normalize_match_text(idsbr)
     nama_tokens = match_tokens(nama_usaha)
     alamat_tokens = match_tokens(alamat)
 
     candidates = []
-    for idx in range(count):
-        header = header_locator.nth(idx)
-        card_scope = header.locator(
-            "xpath=ancestor::*[contains(@class, 'usaha-card')]"
-        )
-        if card_scope.count() == 0:
-            card_scope = header
-        try:
-            text = card_scope.inner_text()
-        except Exception:
-            try:
-                text = header.inner_text()
-            except Exception:
-                text = ""
-
-        haystack = normalize_match_text(text)
-        flags = {
-            "idsbr": bool(idsbr_norm and idsbr_norm in haystack),
-            "nama": contains_tokens(haystack, nama_tokens),
-            "alamat": contains_tokens(haystack, alamat_tokens),
-        }
-        score = 0
-        if flags["idsbr"]:
-            score += 3
-        if flags["nama"]:
-            score += 2
-        if flags["alamat"]:
-            score += 1
-
+    for idx, text in enumerate(texts):
+        flags, score = score_card(text, idsbr_norm, nama_tokens, alamat_tokens)
         candidates.append(
-            {
-                "header": header,
-                "card": card_scope,
-                "flags": flags,
-                "score": score,
-                "text": text,
-            }
+            {"index": idx, "flags": flags, "score": score, "text": text}
         )
 
     def is_acceptable(flags):
@@ -119,36 +130,10 @@ def select_matching_card(page, monitor, idsbr, nama_usaha, alamat):
             return True
         return False
 
-    if count == 1:
-        candidate = candidates[0]
-        if is_acceptable(candidate["flags"]):
-            log_info("Single result matched.")
-            log_info(
-                summarize_match(
-                    0,
-                    candidate["flags"],
-                    candidate["score"],
-                    candidate["text"],
-                )
-            )
-            return candidate["header"], candidate["card"]
-        
-        # Log summary first to provide context for the mismatch
-        log_info(
-            summarize_match(
-                0,
-                candidate["flags"],
-                candidate["score"],
-                candidate["text"],
-            )
-        )
-        log_warn(
-            "Single result mismatch; skipping.",
-            idsbr=idsbr_norm or "-",
-            nama_tokens=join_tokens(nama_tokens),
-            alamat_tokens=join_tokens(alamat_tokens),
-        )
-        return None
+    if len(candidates) == 1:
+        if is_acceptable(candidates[0]["flags"]):
+            return 0, "matched", candidates
+        return None, "mismatch", candidates
 
     idsbr_matches = [c for c in candidates if c["flags"]["idsbr"]]
     if idsbr_matches:
@@ -156,67 +141,115 @@ def select_matching_card(page, monitor, idsbr, nama_usaha, alamat):
 
     candidates.sort(key=lambda c: c["score"], reverse=True)
     if not candidates or candidates[0]["score"] == 0:
-        log_warn(
-            "No matching result found; skipping.",
-            idsbr=idsbr_norm or "-",
-            nama_tokens=join_tokens(nama_tokens),
-            alamat_tokens=join_tokens(alamat_tokens),
-        )
-        for idx, candidate in enumerate(candidates[:MAX_MATCH_LOGS]):
-            log_info(
-                summarize_match(
-                    idx,
-                    candidate["flags"],
-                    candidate["score"],
-                    candidate["text"],
-                )
-            )
-        return None
+        return None, "no_match", candidates
     if len(candidates) > 1 and candidates[0]["score"] == candidates[1]["score"]:
-        log_warn("Ambiguous match (multiple results); skipping.")
-        log_info(
-            summarize_match(
-                0,
-                candidates[0]["flags"],
-                candidates[0]["score"],
-                candidates[0]["text"],
-            )
-        )
-        log_info(
-            summarize_match(
-                1,
-                candidates[1]["flags"],
-                candidates[1]["score"],
-                candidates[1]["text"],
-            )
-        )
-        return None
+        return None, "ambiguous", candidates
 
     best = candidates[0]
     if not is_acceptable(best["flags"]):
-        log_warn(
-            "Best match failed validation; skipping.",
-            idsbr=idsbr_norm or "-",
-            nama_tokens=join_tokens(nama_tokens),
-            alamat_tokens=join_tokens(alamat_tokens),
+        return None, "invalid", candidates
+    return best["index"], "matched", candidates
+
+
+def set_match_recorder(recorder):
+    """Install an object with record(...) that receives every decision."""
+    global _MATCH_RECORDER
+    _MATCH_RECORDER = recorder
+
+
+def log_candidate(index, candidate):
+    if not log_enabled("DEBUG"):
+        return
+    log_debug(
+        summarize_match(
+            index,
+            candidate["flags"],
+            candidate["score"],
+            candidate["text"],
         )
-        log_info(
-            summarize_match(
-                0,
-                best["flags"],
-                best["score"],
-                best["text"],
-            )
+    )
+
+
+def select_matching_card(page, monitor, idsbr, nama_usaha, alamat, outcome=None):
+    """Return (header, card) for the matching result card, or None.
+
+    When `outcome` is a dict, the reason for the decision is stored in
+    outcome["reason"]: matched, no_results, mismatch, no_match, ambiguous
+    or invalid.
+    """
+    if outcome is None:
+        outcome = {}
+    header_locator = page.locator(".usaha-card-header")
+    count = header_locator.count()
+    if count == 0:
+        outcome["reason"] = "no_results"
+        return None
+
+    wait_for_block_ui_clear(page, monitor, timeout_s=15)
+
+    headers = []
+    cards = []
+    texts = []
+    for idx in range(count):
+        header = header_locator.nth(idx)
+        card_scope = header.locator(
+            "xpath=ancestor::*[contains(@class, 'usaha-card')]"
         )
+        if card_scope.count() == 0:
+            card_scope = header
+        try:
+            text = card_scope.inner_text()
+        except Exception:
+            try:
+                text = header.inner_text()
+            except Exception:
+                text = ""
+        headers.append(header)
+        cards.append(card_scope)
+        texts.append(text)
+
+    selected, reason, ranked = choose_card(texts, idsbr, nama_usaha, alamat)
+    outcome["reason"] = reason
+    if _MATCH_RECORDER:
+        try:
+            _MATCH_RECORDER.record(
+                idsbr, nama_usaha, alamat, texts, reason, selected
+            )
+        except Exception as exc:
+            log_warn("Failed to record match decision.", error=str(exc))
+
+    mismatch_fields = {
+        "idsbr": normalize_match_text(idsbr) or "-",
+        "nama_tokens": join_tokens(match_tokens(nama_usaha)),
+        "alamat_tokens": join_tokens(match_tokens(alamat)),
+    }
+
+    if count == 1:
+        if reason == "matched":
+            log_info("Single result matched.")
+            log_candidate(0, ranked[0])
+            return headers[0], cards[0]
+
+        # Log summary first to provide context for the mismatch
+        log_candidate(0, ranked[0])
+        log_warn("Single result mismatch; skipping.", **mismatch_fields)
+        return None
+
+    if reason == "no_match":
+        log_warn("No matching result found; skipping.", **mismatch_fields)
+        for idx, candidate in enumerate(ranked[:MAX_MATCH_LOGS]):
+            log_candidate(idx, candidate)
+        return None
+    if reason == "ambiguous":
+        log_warn("Ambiguous match (multiple results); skipping.")
+        log_candidate(0, ranked[0])
+        log_candidate(1, ranked[1])
+        return None
+    if reason == "invalid":
+        log_warn("Best match failed validation; skipping.", **mismatch_fields)
+        log_candidate(0, ranked[0])
         return None
 
     log_info("Best match selected.")
-    log_info(
-        summarize_match(
-            0,
-            best["flags"],
-            best["score"],
-            best["text"],
-        )
-    )
-    return best["header"], best["card"]
+    log_candidate(0, ranked[0])
+    return headers[selected], cards[selected]
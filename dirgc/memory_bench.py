@@ -0,0 +1,146 @@
+import argparse
+import csv
+import gzip
+import os
+import random
+import tempfile
+import tracemalloc
+
+from .excel import iter_excel_rows, load_excel_rows, open_excel_rows
+from .run_logs import RUN_LOG_COLUMNS
+
+INPUT_COLUMNS = ("idsbr", "nama_usaha", "alamat", "latitude", "longitude", "hasil_gc")
+SAMPLE_PREFIXES = ("TOKO", "WARUNG", "CV.", "UD.", "BENGKEL", "KIOS", "APOTEK")
+SAMPLE_WORDS = ("SUMBER", "REJEKI", "MAKMUR", "JAYA", "BERKAH", "ANUGERAH", "MANDIRI")
+SAMPLE_STREETS = ("JL. JENDERAL SUDIRMAN", "JL. SENGKAWIT", "JL. KATAMSO", "JL. MURUTU")
+
+
+def write_sample_input(path, rows, seed=1):
+    """SBR-like input file; gzip-compressed when `path` ends in .gz."""
+    rng = random.Random(seed)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(INPUT_COLUMNS)
+        for index in range(rows):
+            writer.writerow(
+                (
+                    str(10000000 + index),
+                    f"{rng.choice(SAMPLE_PREFIXES)} {rng.choice(SAMPLE_WORDS)} "
+                    f"{rng.choice(SAMPLE_WORDS)}",
+                    f"{rng.choice(SAMPLE_STREETS)} NO. {rng.randint(1, 200)}, "
+                    "TANJUNG SELOR, BULUNGAN",
+                    f"{rng.uniform(2.5, 3.2):.6f}",
+                    f"{rng.uniform(116.8, 117.6):.6f}",
+                    rng.choice((1, 2, 3, 4, 99)),
+                )
+            )
+
+
+def measure(build):
+    """Peak traced MB while `build()` runs and its result is held."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        result = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak / (1024 * 1024)
+
+
+def run_log_entry(row, excel_row):
+    return (
+        excel_row,
+        row.idsbr,
+        row.nama_usaha,
+        row.alamat,
+        row.hasil_gc if row.hasil_gc is not None else "",
+        row.latitude,
+        row.longitude,
+        "berhasil",
+        "Submit sukses",
+    )
+
+
+def run_memory_benchmark(path):
+    """Peak MB per representation of the same input and run log."""
+
+    def consume_stream():
+        _, rows = open_excel_rows(path)
+        return sum(1 for _ in rows)
+
+    # Run log entries share their strings with the input rows, so those
+    # are loaded before tracing: only the containers are measured.
+    rows = load_excel_rows(path)
+
+    def run_log_tuples():
+        return [
+            run_log_entry(row, number) for number, row in enumerate(rows, start=1)
+        ]
+
+    def run_log_dicts():
+        return [
+            dict(zip(RUN_LOG_COLUMNS, run_log_entry(row, number)))
+            for number, row in enumerate(rows, start=1)
+        ]
+
+    return {
+        "input_dicts": measure(
+            lambda: [row.as_dict() for row in iter_excel_rows(path)]
+        ),
+        "input_rows": measure(lambda: load_excel_rows(path)),
+        "input_stream": measure(consume_stream),
+        "run_log_dicts": measure(run_log_dicts),
+        "run_log_tuples": measure(run_log_tuples),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure peak memory (tracemalloc) of input and run log rows: "
+            "dicts vs slotted rows vs streaming."
+        )
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument(
+        "--input",
+        help="Existing input file to measure instead of a generated one.",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true", help="Generate a .csv.gz sample."
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    path = args.input
+    temp_dir = None
+    if not path:
+        temp_dir = tempfile.TemporaryDirectory(prefix="dirgc-membench-")
+        path = os.path.join(
+            temp_dir.name, "input.csv.gz" if args.gzip else "input.csv"
+        )
+        write_sample_input(path, args.rows)
+    try:
+        result = run_memory_benchmark(path)
+    finally:
+        if temp_dir:
+            temp_dir.cleanup()
+    print(f"input: {path if args.input else f'{args.rows} generated rows'}")
+    print(
+        f"input rows:   dicts {result['input_dicts']:.1f} MB, "
+        f"slotted {result['input_rows']:.1f} MB, "
+        f"streamed {result['input_stream']:.2f} MB"
+    )
+    print(
+        f"run log rows: dicts {result['run_log_dicts']:.1f} MB, "
+        f"tuples {result['run_log_tuples']:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
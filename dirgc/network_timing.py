@@ -0,0 +1,221 @@
+import csv
+import statistics
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .events import (
+    PHASE_COMPLETED,
+    PHASE_ORDER,
+    ROW_FINISHED,
+    ROW_STARTED,
+    RUN_FINISHED,
+    RUN_STARTED,
+)
+from .logging_utils import log_info, log_warn
+from .settings import MATCHAPRO_HOST
+
+MAX_PENDING_REQUESTS = 1000
+NETWORK_LOG_COLUMNS = (
+    "row_excel",
+    "phase",
+    "method",
+    "path",
+    "type",
+    "status",
+    "queue_ms",
+    "ttfb_ms",
+    "download_ms",
+    "total_ms",
+    "bytes",
+)
+
+
+def build_network_log_path(run_log_path):
+    """run3_0930.csv -> network_run3_0930.csv, next to the run log.
+
+    The name must not start with "run": run log globs (run*_*.csv) would
+    pick it up as a run log for resume and completed-IDSBR lookups.
+    """
+    path = Path(run_log_path)
+    return path.with_name(f"network_{path.stem}.csv")
+
+
+def request_timing(started, response, finished_at):
+    """Split one request into queue/TTFB/download milliseconds.
+
+    `started` is the requestWillBeSent monotonic timestamp (seconds),
+    `response` the CDP Response object and `finished_at` the
+    loadingFinished timestamp. Timing offsets inside response["timing"]
+    are milliseconds relative to its requestTime.
+    """
+    timing = response.get("timing") or {}
+    total_ms = (finished_at - started) * 1000 if started is not None else None
+    if not timing:
+        return None, None, None, total_ms
+    request_time = timing.get("requestTime", started or 0)
+    offsets = [
+        timing.get(key, -1) for key in ("dnsStart", "connectStart", "sendStart")
+    ]
+    first_offset = next((value for value in offsets if value >= 0), 0)
+    queue_ms = first_offset
+    if started is not None:
+        queue_ms += max(0.0, (request_time - started) * 1000)
+    ttfb_ms = timing.get("receiveHeadersEnd", 0) - timing.get("sendEnd", 0)
+    headers_at = request_time + timing.get("receiveHeadersEnd", 0) / 1000
+    download_ms = max(0.0, (finished_at - headers_at) * 1000)
+    return queue_ms, ttfb_ms, download_ms, total_ms
+
+
+class NetworkTimingCollector:
+    """Opt-in CDP recorder of DIRGC request timings per row and phase.
+
+    Subscribe it to the run's EventBus (for row/phase attribution and the
+    run log path) and register attach() as a BrowserSession page hook so
+    pages opened after a restart are covered too. Only requests to the
+    DIRGC host are kept; rows are written to network_run*.csv as they
+    finish.
+    """
+
+    def __init__(self, host=MATCHAPRO_HOST):
+        self.host = host
+        self.path = None
+        self.count = 0
+        self._handle = None
+        self._writer = None
+        self._row_excel = ""
+        self._phase = ""
+        self._pending = {}
+        self._ttfb_by_phase = defaultdict(list)
+
+    def attach(self, page):
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.send("Network.enable")
+        except Exception as exc:
+            log_warn("Network timing unavailable for page.", error=str(exc))
+            return
+        cdp.on("Network.requestWillBeSent", self._on_request)
+        cdp.on("Network.responseReceived", self._on_response)
+        cdp.on("Network.loadingFinished", self._on_finished)
+        cdp.on("Network.loadingFailed", self._on_failed)
+
+    def __call__(self, event):
+        kind = event.kind
+        if kind == RUN_STARTED:
+            self._open(event.get("run_log_path"))
+        elif kind == ROW_STARTED:
+            if len(self._pending) > MAX_PENDING_REQUESTS:
+                # Requests that never finish (aborted navigations, streams).
+                self._pending.clear()
+            self._row_excel = event.get("row_excel", "")
+            self._phase = PHASE_ORDER[0]
+        elif kind == PHASE_COMPLETED:
+            phase = event.get("phase")
+            if phase in PHASE_ORDER[:-1]:
+                self._phase = PHASE_ORDER[PHASE_ORDER.index(phase) + 1]
+            else:
+                self._phase = "finalize"
+        elif kind == ROW_FINISHED:
+            self._phase = ""
+            if self._handle:
+                self._handle.flush()
+        elif kind == RUN_FINISHED:
+            self.close()
+
+    def _open(self, run_log_path):
+        if self._handle or not run_log_path:
+            return
+        self.path = build_network_log_path(run_log_path)
+        self._handle = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(NETWORK_LOG_COLUMNS)
+
+    def _on_request(self, params):
+        url = params.get("request", {}).get("url", "")
+        if urlsplit(url).hostname != self.host:
+            return
+        self._pending[params["requestId"]] = {
+            "row_excel": self._row_excel,
+            "phase": self._phase,
+            "method": params["request"].get("method", ""),
+            "path": urlsplit(url).path,
+            "type": params.get("type", ""),
+            "started": params.get("timestamp"),
+            "response": {},
+        }
+
+    def _on_response(self, params):
+        entry = self._pending.get(params.get("requestId"))
+        if entry is not None:
+            entry["response"] = params.get("response") or {}
+
+    def _on_finished(self, params):
+        entry = self._pending.pop(params.get("requestId"), None)
+        if entry is None:
+            return
+        queue_ms, ttfb_ms, download_ms, total_ms = request_timing(
+            entry["started"], entry["response"], params.get("timestamp", 0)
+        )
+        self._write(
+            entry,
+            entry["response"].get("status", ""),
+            queue_ms,
+            ttfb_ms,
+            download_ms,
+            total_ms,
+            int(params.get("encodedDataLength", 0)),
+        )
+        if ttfb_ms is not None:
+            self._ttfb_by_phase[entry["phase"] or "-"].append(ttfb_ms)
+
+    def _on_failed(self, params):
+        entry = self._pending.pop(params.get("requestId"), None)
+        if entry is None:
+            return
+        total_ms = None
+        if entry["started"] is not None:
+            total_ms = (params.get("timestamp", 0) - entry["started"]) * 1000
+        status = "canceled" if params.get("canceled") else "failed"
+        self._write(entry, status, None, None, None, total_ms, 0)
+
+    def _write(self, entry, status, queue_ms, ttfb_ms, download_ms, total_ms, size):
+        if self._writer is None:
+            return
+        self._writer.writerow(
+            (
+                entry["row_excel"],
+                entry["phase"],
+                entry["method"],
+                entry["path"],
+                entry["type"],
+                status,
+                *("" if value is None else f"{value:.1f}" for value in (
+                    queue_ms, ttfb_ms, download_ms, total_ms
+                )),
+                size,
+            )
+        )
+        self.count += 1
+
+    def summary(self):
+        """Median TTFB (ms) and request count per phase."""
+        return {
+            phase: (statistics.median(values), len(values))
+            for phase, values in self._ttfb_by_phase.items()
+            if values
+        }
+
+    def close(self):
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        self._writer = None
+        fields = {
+            f"ttfb_{phase}": f"{median:.0f}ms/{count}"
+            for phase, (median, count) in sorted(self.summary().items())
+        }
+        log_info(
+            "Network timing saved.", count=self.count, path=str(self.path), **fields
+        )
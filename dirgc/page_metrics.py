@@ -0,0 +1,148 @@
+import statistics
+from collections import deque
+
+from .logging_utils import log_info, log_warn
+
+METRICS_EVERY_ROWS = 25
+HEAP_LIMIT_MB = 300
+NODES_LIMIT = 60000
+LISTENERS_LIMIT = 30000
+LATENCY_WINDOW = 20
+LATENCY_DRIFT_RATIO = 1.5
+TRACKED_METRICS = ("JSHeapUsedSize", "Nodes", "JSEventListeners", "Documents")
+
+
+class PageMetricsMonitor:
+    """Sample renderer metrics between rows and recycle a degrading page.
+
+    Every `every_rows` processed rows it reads CDP Performance.getMetrics
+    (JS heap, DOM nodes, event listeners), logs the change since the page
+    was opened, and asks the BrowserSession for a fresh page when a limit
+    is exceeded or the median row time has drifted past `drift_ratio`
+    times the median of the page's first rows. Row times are compared per
+    outcome (a skip is much faster than a submit), so a change in the mix
+    of outcomes is not mistaken for a slower page.
+    """
+
+    def __init__(
+        self,
+        session,
+        every_rows=METRICS_EVERY_ROWS,
+        heap_limit_mb=HEAP_LIMIT_MB,
+        nodes_limit=NODES_LIMIT,
+        listeners_limit=LISTENERS_LIMIT,
+        drift_ratio=LATENCY_DRIFT_RATIO,
+        window=LATENCY_WINDOW,
+    ):
+        self.session = session
+        self.every_rows = every_rows
+        self.heap_limit_mb = heap_limit_mb
+        self.nodes_limit = nodes_limit
+        self.listeners_limit = listeners_limit
+        self.drift_ratio = drift_ratio
+        self.window = window
+        self.recycles = 0
+        self.samples = []
+        self._cdp = None
+        self._cdp_page = None
+        self._reset()
+
+    def _reset(self):
+        self._rows = 0
+        self._sampled_at = 0
+        self._first = None
+        self._baseline = {}
+        self._recent = {}
+
+    def record_row(self, duration_s, status=None):
+        self._rows += 1
+        baseline = self._baseline.setdefault(status, [])
+        if len(baseline) < self.window:
+            baseline.append(duration_s)
+        else:
+            recent = self._recent.get(status)
+            if recent is None:
+                recent = self._recent[status] = deque(maxlen=self.window)
+            recent.append(duration_s)
+
+    def sample(self):
+        """Return {metric: value} for the current page, or None on failure."""
+        page = self.session.page
+        try:
+            if self._cdp_page is not page:
+                # New page (e.g. after a crash restart): new trend baseline.
+                self._first = None
+                self._cdp = None
+            if self._cdp is None:
+                self._cdp = self.session.context.new_cdp_session(page)
+                self._cdp.send("Performance.enable")
+                self._cdp_page = page
+            result = self._cdp.send("Performance.getMetrics")
+        except Exception as exc:
+            log_warn("Failed to read page metrics.", error=str(exc))
+            self._cdp = None
+            return None
+        values = {item["name"]: item["value"] for item in result.get("metrics", [])}
+        return {name: values.get(name, 0) for name in TRACKED_METRICS}
+
+    def _latency_drift(self):
+        """Largest recent/baseline median ratio over outcomes with full windows."""
+        drift = None
+        for status, recent in self._recent.items():
+            if len(recent) < self.window:
+                continue
+            baseline = statistics.median(self._baseline[status])
+            if baseline <= 0:
+                continue
+            ratio = statistics.median(recent) / baseline
+            drift = ratio if drift is None else max(drift, ratio)
+        return drift
+
+    def check(self):
+        """Sample if due; return a recycle reason or None."""
+        if not self.every_rows or self._rows - self._sampled_at < self.every_rows:
+            return None
+        self._sampled_at = self._rows
+        metrics = self.sample()
+        drift = self._latency_drift()
+        if metrics is not None:
+            if self._first is None:
+                self._first = metrics
+            heap_mb = metrics["JSHeapUsedSize"] / (1024 * 1024)
+            heap_delta_mb = (
+                metrics["JSHeapUsedSize"] - self._first["JSHeapUsedSize"]
+            ) / (1024 * 1024)
+            self.samples.append(dict(metrics, rows=self._rows, drift=drift))
+            log_info(
+                "Page metrics.",
+                rows=self._rows,
+                heap_mb=f"{heap_mb:.1f}",
+                heap_delta_mb=f"{heap_delta_mb:+.1f}",
+                nodes=int(metrics["Nodes"]),
+                nodes_delta=f"{int(metrics['Nodes'] - self._first['Nodes']):+d}",
+                listeners=int(metrics["JSEventListeners"]),
+                latency_drift=f"{drift:.2f}x" if drift else "-",
+            )
+            if heap_mb > self.heap_limit_mb:
+                return f"heap {heap_mb:.0f} MB > {self.heap_limit_mb} MB"
+            if metrics["Nodes"] > self.nodes_limit:
+                return f"nodes {int(metrics['Nodes'])} > {self.nodes_limit}"
+            if metrics["JSEventListeners"] > self.listeners_limit:
+                return (
+                    f"listeners {int(metrics['JSEventListeners'])} > "
+                    f"{self.listeners_limit}"
+                )
+        if drift and drift > self.drift_ratio:
+            return f"row latency {drift:.2f}x baseline"
+        return None
+
+    def maybe_recycle(self):
+        """Call between rows; returns True if the page was replaced."""
+        reason = self.check()
+        if not reason:
+            return False
+        self.session.recycle_page(reason)
+        self.recycles += 1
+        self._cdp = None
+        self._reset()
+        return True
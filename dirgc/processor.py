@@ -1,3 +1,9 @@
+import itertools
+import json
+import os
+import time
+
+from .backoff import BackoffPolicy, CircuitBreaker
 from .browser import (
     apply_filter,
     ensure_on_dirgc,
@@ -5,11 +11,93 @@ from .browser import (
     is_visible,
     wait_for_block_ui_clear,
 )
-from .excel import load_excel_rows
+from .card_index import (
+    SKIP_STATUSES,
+    STATUS_BELUM,
+    STATUS_DUPLIKAT,
+    STATUS_SUDAH_GC,
+    card_status,
+    complete_harvest_at,
+    load_card_index,
+    lookup_card_status,
+    save_card_index,
+    update_card,
+)
+from .clock import (
+    BUCKET_COOLDOWN,
+    BUCKET_DOM,
+    BUCKET_SERVER,
+    format_time_report,
+)
+from .events import (
+    COOLDOWN_TICK,
+    PHASE_COMPLETED,
+    RATE_LIMITED,
+    ROW_FINISHED,
+    ROW_STARTED,
+    RUN_FINISHED,
+    RUN_STARTED,
+    SESSION_RELOGIN,
+    EventBus,
+    progress_adapter,
+)
+from .excel import iter_excel_rows, open_excel_rows
+from .input_diff import (
+    fingerprint_rows,
+    load_fingerprints,
+    row_fingerprint,
+    row_key,
+    save_fingerprints,
+)
+from .journal import STATE_CONFIRMED, STATE_SEARCHING, STATE_SUBMITTING, RowJournal
 from .logging_utils import log_error, log_info, log_warn
+from .match_index import MatchIndex
 from .matching import select_matching_card
-from .run_logs import build_run_log_path, write_run_log
-from .settings import TARGET_URL
+from .page_metrics import METRICS_EVERY_ROWS, PageMetricsMonitor
+from .run_logs import (
+    RunLogWriter,
+    build_run_log_path,
+    get_completed_idsbrs,
+    write_run_log,
+)
+from .search_strategy import SearchPlanner
+from .settings import (
+    CARD_INDEX_FILE,
+    CARD_INDEX_MAX_AGE_H,
+    LAST_RUN_STATE_FILE,
+    TARGET_URL,
+)
+
+COOLDOWN_TICK_S = 5
+MAX_ROW_ATTEMPTS = 3
+MAX_SERVER_BUSY_RETRIES = 10
+# USER CONFIRMED: Ban duration is 10 minutes from last request.
+# We wait at least 11 minutes (660s) to be safe, doubling per repeat hit.
+RATE_LIMIT_BASE_S = 660
+RATE_LIMIT_MAX_S = 3600
+# Per-row wait after a "Server Sibuk" answer: ~2s, 3s, 4.5s ... capped.
+SUBMIT_RETRY_BASE_S = 2
+SUBMIT_RETRY_MAX_S = 15
+
+SCAN_STATUSES = ("ready", "not_found", "ambiguous", "sudah_gc", "duplikat")
+# (status, note) outcomes that reveal a card's current badge status.
+CARD_STATUS_BY_OUTCOME = {
+    ("berhasil", "Submit sukses"): STATUS_SUDAH_GC,
+    ("berhasil", "Submit terkonfirmasi (journal)"): STATUS_SUDAH_GC,
+    ("skipped", "Sudah GC"): STATUS_SUDAH_GC,
+    ("skipped", "Duplikat"): STATUS_DUPLIKAT,
+    ("sudah_gc", "Sudah GC"): STATUS_SUDAH_GC,
+    ("duplikat", "Duplikat"): STATUS_DUPLIKAT,
+    ("ready", "Siap submit"): STATUS_BELUM,
+    ("ready", "Hasil GC tidak valid/kosong"): STATUS_BELUM,
+}
+SCAN_REASON_NOTES = {
+    "no_results": "No results found",
+    "mismatch": "Single result mismatch",
+    "no_match": "No matching result",
+    "ambiguous": "Ambiguous match (multiple results)",
+    "invalid": "Best match failed validation",
+}
 
 
 def process_excel_rows(
@@ -21,36 +109,40 @@ def process_excel_rows(
     start_row=None,
     end_row=None,
     progress_callback=None,
+    changed_only=False,
+    diff_against=None,
+    fingerprint_file=None,
+    scan_only=False,
+    use_card_index=False,
+    card_index_file=None,
+    card_index_max_age_h=None,
+    event_bus=None,
+    journal_file=None,
+    session=None,
+    metrics_every=METRICS_EVERY_ROWS,
+    humanize=True,
 ):
-    run_log_path = build_run_log_path()
+    # Scan mode only searches and classifies rows; it never opens the Tandai
+    # form, skips humanization delays and writes scan*.csv instead of run*.csv
+    # so resume detection and completed-ID history are unaffected.
+    # humanize=False drops the random hesitation/row delays as well; it is
+    # meant for offline HAR replays, not for runs against the live server.
+    run_log_path = build_run_log_path(prefix="scan" if scan_only else "run")
     run_log_rows = []
     try:
-        rows = load_excel_rows(excel_file)
+        total_rows, rows = open_excel_rows(excel_file)
     except Exception as exc:
         log_error("Failed to load Excel file.")
-        run_log_rows.append(
-            {
-                "no": 0,
-                "idsbr": "",
-                "nama_usaha": "",
-                "alamat": "",
-                "keberadaanusaha_gc": "",
-                "latitude": "",
-                "longitude": "",
-                "status": "error",
-                "catatan": str(exc),
-            }
-        )
+        run_log_rows.append((0, "", "", "", "", "", "", "error", str(exc)))
         write_run_log(run_log_rows, run_log_path)
         log_info("Run log saved.", path=str(run_log_path))
         return
-    if not rows:
+    if not total_rows:
         log_warn("No rows found in Excel file.")
         write_run_log(run_log_rows, run_log_path)
         log_info("Run log saved.", path=str(run_log_path))
         return
 
-    total_rows = len(rows)
     start_row = 1 if start_row is None else start_row
     end_row = total_rows if end_row is None else end_row
     if start_row < 1 or end_row < 1:
@@ -88,8 +180,16 @@ def process_excel_rows(
         )
         end_row = total_rows
 
-    rows = rows[start_row - 1 : end_row]
-    selected_rows = len(rows)
+    rows = itertools.islice(rows, start_row - 1, end_row)
+    selected_rows = end_row - start_row + 1
+    run_log = RunLogWriter(run_log_path)
+
+    def log_row(entry):
+        # Each finished row goes to disk right away so resume works.
+        try:
+            run_log.append(entry)
+        except Exception as e:
+            log_warn(f"Failed to write intermediate log: {e}")
     stats = {
         "total": selected_rows,
         "processed": 0,
@@ -100,25 +200,55 @@ def process_excel_rows(
         "hasil_gc_set": 0,
         "hasil_gc_skipped": 0,
         "skipped": 0,
+        "skipped_unchanged": 0,
+        "searches": 0,
+        "journal_verified": 0,
+        "browser_restarts": 0,
+        "page_recycles": 0,
     }
+    if scan_only:
+        for scan_status in SCAN_STATUSES:
+            stats[f"scan_{scan_status}"] = 0
     log_info(
-        "Start processing rows.",
+        "Start scanning rows (read-only)." if scan_only else "Start processing rows.",
         total=selected_rows,
         start_row=start_row,
         end_row=end_row,
     )
+    # progress_callback is kept for existing callers; it is fed from the
+    # event stream like any other consumer.
+    events = event_bus or EventBus()
+    progress_handler = None
     if progress_callback:
-        try:
-            progress_callback(0, selected_rows, 0)
-        except Exception:
-            pass
+        progress_handler = events.subscribe(
+            progress_adapter(progress_callback), kinds=(RUN_STARTED, ROW_FINISHED)
+        )
+    # Waits are attributed to time buckets on the monitor's clock; the
+    # breakdown is part of the final summary.
+    clock = monitor.clock
+    clock.reset()
+    run_started_at = clock.monotonic()
+    events.emit(
+        RUN_STARTED,
+        total=selected_rows,
+        start_row=start_row,
+        end_row=end_row,
+        scan_only=scan_only,
+        run_log_path=str(run_log_path),
+    )
 
-    import json
-    import time
-    import os
-    from .settings import LAST_RUN_STATE_FILE
-    from .settings import LAST_RUN_STATE_FILE
-    from .run_logs import get_completed_idsbrs
+    def emit_row_finished(batch_index, excel_row, idsbr, status, note, started_at=None):
+        events.emit(
+            ROW_FINISHED,
+            row=batch_index,
+            row_excel=excel_row,
+            total=selected_rows,
+            processed=stats["processed"],
+            idsbr=idsbr,
+            status=status,
+            note=note,
+            duration=clock.monotonic() - started_at if started_at else 0.0,
+        )
 
     # --- RATE LIMIT DETECTION ---
     is_rate_limited = False
@@ -142,20 +272,41 @@ def process_excel_rows(
             except:
                 pass
             
-    # Attach listener
+    # Attach listener (and re-attach to pages opened after a restart)
     page.on("response", on_response)
+    restarts_at_start = 0
+    if session is not None:
+        session.add_page_hook(
+            lambda new_page: new_page.on("response", on_response), apply_now=False
+        )
+        restarts_at_start = session.restarts
+    page_metrics = None
+    if session is not None and metrics_every:
+        page_metrics = PageMetricsMonitor(session, every_rows=metrics_every)
 
     # Exponential Backoff State
-    # USER CONFIRMED: Ban duration is 10 minutes from last request.
-    # We set wait to 11 minutes (660s) to be safe.
-    base_wait = 660 
-    current_wait = base_wait
+    rate_limit_backoff = BackoffPolicy(
+        RATE_LIMIT_BASE_S, max_s=RATE_LIMIT_MAX_S, jitter=0.1
+    )
+    rate_limit_hits = 0
+    submit_backoff = BackoffPolicy(
+        SUBMIT_RETRY_BASE_S, factor=1.5, max_s=SUBMIT_RETRY_MAX_S
+    )
+    # Shared by all rows: a busy server pauses the run instead of every
+    # row spending its own retries on it.
+    busy_breaker = CircuitBreaker(
+        clock=clock,
+        on_tick=lambda remaining, total: events.emit(
+            COOLDOWN_TICK, remaining_s=remaining, total_s=total
+        ),
+    )
 
     def handle_rate_limit():
-        nonlocal is_rate_limited, rate_limit_wait, current_wait
+        nonlocal is_rate_limited, rate_limit_wait, rate_limit_hits
         if is_rate_limited:
-            # Use server time if provided and larger than our base, else use our backoff
-            wait_time = max(rate_limit_wait, current_wait) if rate_limit_wait > 0 else current_wait
+            # Server Retry-After when larger than our backoff
+            wait_time = max(rate_limit_wait, rate_limit_backoff.delay(rate_limit_hits))
+            wait_time = int(round(wait_time))
             
             log_warn(f"⚠️ RATE LIMIT DETECTED (F5 Firewall Block).")
             
@@ -166,11 +317,17 @@ def process_excel_rows(
             except Exception as e:
                 log_warn(f"Failed to clear cookies: {e}")
 
+            events.emit(RATE_LIMITED, wait_s=wait_time)
             log_info(f"Cooling down for {wait_time}s (F5 Block Duration)...")
-            time.sleep(wait_time)
+            remaining = wait_time
+            while remaining > 0:
+                step = min(COOLDOWN_TICK_S, remaining)
+                clock.sleep(step, BUCKET_COOLDOWN)
+                remaining -= step
+                events.emit(COOLDOWN_TICK, remaining_s=remaining, total_s=wait_time)
             
-            # Increase backoff for next time if we get hit again quickly
-            current_wait = min(current_wait * 2, 3600) # Cap at 1 hour
+            # Increase backoff for next time if we get hit again
+            rate_limit_hits += 1
 
             is_rate_limited = False
             rate_limit_wait = 0 # Reset server header value
@@ -185,23 +342,60 @@ def process_excel_rows(
     completed_ids = get_completed_idsbrs()
     log_info(f"Loaded {len(completed_ids)} completed IDs from history.")
 
-    for offset, row in enumerate(rows):
+    # Fingerprints of rows completed in earlier runs; updated as rows finish.
+    fingerprints = load_fingerprints(fingerprint_file)
+    baseline = None
+    if diff_against:
+        log_info("Fingerprinting previous export.", path=str(diff_against))
+        baseline = fingerprint_rows(iter_excel_rows(diff_against))
+    elif changed_only:
+        baseline = fingerprints
+    if baseline is not None:
+        log_info(f"Loaded {len(baseline)} fingerprints for input diff.")
+    fingerprints_dirty = 0
+
+    card_index = None
+    if use_card_index:
+        card_index = load_card_index(card_index_file)
+        log_info(
+            f"Loaded {len(card_index['cards'])} cards from card index.",
+            path=str(card_index_file or CARD_INDEX_FILE),
+        )
+    card_index_dirty = 0
+    search_planner = SearchPlanner.load()
+    # Write-ahead journal of submit state; scan mode never submits.
+    journal = None if scan_only else RowJournal.load(journal_file)
+    # Offline name/address -> IDSBR resolution for rows without IDSBR.
+    # Built on the first row without IDSBR, only from a full harvest.
+    match_index = None
+    match_index_checked = False
+
+    offset = -1
+    retry_row = False
+    row_attempt = 0
+    row = None
+    while True:
+        if retry_row:
+            row_attempt += 1
+        else:
+            offset += 1
+            row_attempt = 1
+            row = next(rows, None)
+        retry_row = False
+        if row is None:
+            break
+
         # 0. Check Rate Limit Signal from previous request
         if handle_rate_limit():
-            log_info("Resuming after pause. Re-checking login state...")
-            # Re-login because cookies were cleared
-            ensure_on_dirgc(
-                page, 
-                monitor, 
-                use_saved_credentials, 
-                credentials
-            )
-
+            # Cookies were cleared; the navigate step of the next processed
+            # row logs in again inside the row's crash/retry guard.
+            log_info("Resuming after pause. Login is re-checked on the next row.")
+            events.emit(SESSION_RELOGIN, reason="rate_limit")
 
         batch_index = offset + 1
         excel_row = start_row + offset
         
-        idsbr = str(row["idsbr"])
+        idsbr = row.idsbr
         
         # Check against blacklist
         if idsbr in completed_ids:
@@ -209,23 +403,164 @@ def process_excel_rows(
                 f"Skipping row (Already completed in previous runs).", 
                 row=batch_index, total=selected_rows, row_excel=excel_row, idsbr=idsbr
             )
-            # Emit progress even if skipped
-            if progress_callback:
-                progress_callback(stats["processed"], selected_rows, excel_row)
             stats["processed"] += 1
             stats["skipped"] += 1
+            # Emit progress even if skipped
+            emit_row_finished(
+                batch_index, excel_row, idsbr, "skipped", "Already completed"
+            )
             continue
 
+        key = row_key(row)
+        fingerprint = row_fingerprint(row)
+        if baseline is not None and baseline.get(key) == fingerprint:
+            log_info(
+                "Skipping row (Unchanged since previous export).",
+                row=batch_index, total=selected_rows, row_excel=excel_row, idsbr=idsbr or "-"
+            )
+            stats["processed"] += 1
+            stats["skipped_unchanged"] += 1
+            emit_row_finished(
+                batch_index, excel_row, idsbr, "skipped", "Unchanged"
+            )
+            continue
+
+        in_doubt = False
+        if journal is not None:
+            if journal.is_confirmed(key):
+                log_info(
+                    "Skipping row (Submit confirmed in journal).",
+                    row=batch_index, total=selected_rows, row_excel=excel_row, idsbr=idsbr or "-"
+                )
+                stats["processed"] += 1
+                stats["skipped"] += 1
+                emit_row_finished(
+                    batch_index, excel_row, idsbr, "skipped", "Already submitted"
+                )
+                continue
+            in_doubt = journal.is_in_doubt(key)
+
+        resolved_note = ""
+        if not idsbr and card_index is not None and not match_index_checked:
+            match_index_checked = True
+            max_age_h = (
+                CARD_INDEX_MAX_AGE_H
+                if card_index_max_age_h is None
+                else card_index_max_age_h
+            )
+            if complete_harvest_at(card_index, max_age_h):
+                match_index = MatchIndex.from_card_index(card_index, max_age_h)
+                log_info(f"Built match index from {len(match_index)} cards.")
+            else:
+                log_warn(
+                    "Card index is not a fresh full harvest (--harvest-full); "
+                    "rows without IDSBR are searched by name and address."
+                )
+        if not idsbr and match_index is not None:
+            resolved, reason = match_index.resolve(row.nama_usaha, row.alamat)
+            if resolved:
+                log_info(
+                    "Resolved IDSBR from local match index.",
+                    row_excel=excel_row,
+                    idsbr=resolved,
+                )
+                idsbr = resolved
+                resolved_note = "IDSBR dari match index"
+            else:
+                log_info(
+                    "Match index could not resolve IDSBR.",
+                    row_excel=excel_row,
+                    reason=reason,
+                )
+
+        indexed_status = None
+        if card_index is not None:
+            indexed_status = card_status(
+                card_index,
+                idsbr,
+                CARD_INDEX_MAX_AGE_H
+                if card_index_max_age_h is None
+                else card_index_max_age_h,
+            )
+        if indexed_status in SKIP_STATUSES:
+            # Known from the harvested card index: no search round trip.
+            note = f"{SKIP_STATUSES[indexed_status]} (card index)"
+            log_info(
+                f"Skipping row ({note}).",
+                row=batch_index, total=selected_rows, row_excel=excel_row, idsbr=idsbr
+            )
+            stats["processed"] += 1
+            if indexed_status == STATUS_SUDAH_GC:
+                stats["skipped_gc"] += 1
+            else:
+                stats["skipped_duplikat"] += 1
+            if scan_only:
+                stats[f"scan_{indexed_status}"] += 1
+            else:
+                fingerprints[key] = fingerprint
+                fingerprints_dirty += 1
+            log_row(
+                (
+                    excel_row,
+                    idsbr,
+                    row.nama_usaha,
+                    row.alamat,
+                    row.hasil_gc if row.hasil_gc is not None else "",
+                    row.latitude,
+                    row.longitude,
+                    indexed_status if scan_only else "skipped",
+                    f"{note} ({resolved_note})" if resolved_note else note,
+                )
+            )
+            emit_row_finished(
+                batch_index,
+                excel_row,
+                idsbr,
+                indexed_status if scan_only else "skipped",
+                note,
+            )
+            continue
+
+        if page_metrics is not None and page_metrics.maybe_recycle():
+            # Safe point between rows: the next navigate step loads DIRGC
+            # on the fresh page with the context's cookies.
+            page = session.page
+        if session is not None and session.ensure_healthy():
+            # Crashed, closed or hung since the last row; ensure_on_dirgc
+            # below logs in again on the new page.
+            page = session.page
+
         stats["processed"] += 1
         status = None
         note = ""
+        row_started_at = clock.monotonic()
+        row_cooldown_at = clock.total(BUCKET_COOLDOWN)
+        phase_started_at = row_started_at
+        events.emit(
+            ROW_STARTED,
+            row=batch_index,
+            total=selected_rows,
+            row_excel=excel_row,
+            idsbr=idsbr,
+        )
+
+        def end_phase(phase):
+            nonlocal phase_started_at
+            now = clock.monotonic()
+            events.emit(
+                PHASE_COMPLETED,
+                row_excel=excel_row,
+                phase=phase,
+                duration=now - phase_started_at,
+            )
+            phase_started_at = now
 
         # idsbr already str above
-        nama_usaha = row["nama_usaha"]
-        alamat = row["alamat"]
-        latitude = row["latitude"]
-        longitude = row["longitude"]
-        hasil_gc = row["hasil_gc"]
+        nama_usaha = row.nama_usaha
+        alamat = row.alamat
+        latitude = row.latitude
+        longitude = row.longitude
+        hasil_gc = row.hasil_gc
 
         log_info(
             "Processing row.",
@@ -236,26 +571,75 @@ def process_excel_rows(
             row_excel=excel_row,
             idsbr=idsbr or "-",
         )
-        ensure_on_dirgc(
-            page,
-            monitor=monitor,
-            use_saved_credentials=use_saved_credentials,
-            credentials=credentials,
-        )
 
         try:
+            # Inside the guard: a crash or hang while navigating restarts
+            # the session and retries the row like any later step.
+            ensure_on_dirgc(
+                page,
+                monitor=monitor,
+                use_saved_credentials=use_saved_credentials,
+                credentials=credentials,
+            )
+            end_phase("navigate")
+            if in_doubt and idsbr:
+                # The previous run died after clicking submit: one lookup
+                # decides whether it landed instead of redoing the row.
+                verified_status = lookup_card_status(page, monitor, idsbr)
+                stats["searches"] += 1
+                if verified_status == STATUS_SUDAH_GC:
+                    log_info("In-doubt submit confirmed (Sudah GC).", idsbr=idsbr)
+                    stats["journal_verified"] += 1
+                    status = "berhasil"
+                    note = "Submit terkonfirmasi (journal)"
+                    continue
+                log_info(
+                    "In-doubt submit not found on server; processing row.",
+                    idsbr=idsbr,
+                )
+            if journal is not None:
+                journal.record(key, STATE_SEARCHING, row_excel=excel_row)
             log_info(
                 "Applying filter.",
                 idsbr=idsbr or "-",
                 nama_usaha=nama_usaha or "-",
                 alamat=alamat or "-",
             )
-            result_count = apply_filter(page, monitor, idsbr, nama_usaha, alamat)
-            log_info("Filter results.", count=result_count)
+            search_strategy = search_planner.choose(
+                idsbr, bool(nama_usaha or alamat)
+            )
+            search_outcome = {}
+            result_count = apply_filter(
+                page,
+                monitor,
+                idsbr,
+                nama_usaha,
+                alamat,
+                strategy=search_strategy,
+                outcome=search_outcome,
+            )
+            stats["searches"] += len(search_outcome.get("steps", ()))
+            end_phase("search")
+            log_info(
+                "Filter results.",
+                count=result_count,
+                strategy=search_strategy,
+                searches="+".join(search_outcome.get("steps", ())),
+            )
 
+            match_outcome = {}
+            # An IDSBR from the match index only narrows the search; the
+            # card must still match the row's own name and address.
             selection = select_matching_card(
-                page, monitor, idsbr, nama_usaha, alamat
+                page, monitor, row.idsbr, nama_usaha, alamat, outcome=match_outcome
             )
+            search_planner.record(idsbr, search_outcome, bool(selection))
+            end_phase("match")
+            if not selection and scan_only:
+                reason = match_outcome.get("reason")
+                status = "ambiguous" if reason == "ambiguous" else "not_found"
+                note = SCAN_REASON_NOTES.get(reason, "No results found")
+                continue
             if not selection:
                 log_warn("No results found; skipping.", idsbr=idsbr or "-")
                 stats["skipped_no_results"] += 1
@@ -273,6 +657,24 @@ def process_excel_rows(
             if card_scope.count() == 0:
                 card_scope = page
 
+            if scan_only:
+                if card_scope.locator(".gc-badge", has_text="Sudah GC").count() > 0:
+                    status = "sudah_gc"
+                    note = "Sudah GC"
+                elif card_scope.locator(
+                    ".usaha-status.tidak-aktif", has_text="Duplikat"
+                ).count() > 0:
+                    status = "duplikat"
+                    note = "Duplikat"
+                else:
+                    status = "ready"
+                    note = (
+                        "Siap submit"
+                        if hasil_gc is not None
+                        else "Hasil GC tidak valid/kosong"
+                    )
+                continue
+
             if (
                 card_scope.locator(".gc-badge", has_text="Sudah GC").count()
                 > 0
@@ -401,7 +803,7 @@ def process_excel_rows(
                     monitor.bot_click(geotag_locator.first)
                     # Wait and handle permission prompt handling is done by browser context usually
                     # But we might need to wait for fields to actually fill?
-                    time.sleep(2) 
+                    clock.sleep(2, BUCKET_DOM)
 
             if status == "gagal" and note == "Hasil GC tidak valid/kosong":
                 monitor.bot_goto(TARGET_URL)
@@ -427,6 +829,7 @@ def process_excel_rows(
                 monitor.bot_goto(TARGET_URL)
                 continue
 
+            end_phase("form")
             wait_for_block_ui_clear(page, monitor, timeout_s=15)
             # Skip scrolling into view for submit button as it might be in a fixed modal footer
             # try:
@@ -434,15 +837,22 @@ def process_excel_rows(
             # except Exception:
             #     pass
             
+            if journal is not None:
+                journal.record(
+                    key, STATE_SUBMITTING, idsbr=idsbr, row_excel=excel_row
+                )
+
             # --- START SUBMIT RETRY LOGIC FOR 'SERVER SIBUK' ---
-            max_server_busy_retries = 10
+            max_server_busy_retries = MAX_SERVER_BUSY_RETRIES
             submit_success = False
+            busy_count = 0
             
             for attempt in range(max_server_busy_retries + 1):
                 try:
                    # HUMANIZATION: Hesitate before submit
-                   import random
-                   time.sleep(random.uniform(0.5, 1.5))
+                   if humanize:
+                       import random
+                       clock.sleep(random.uniform(0.5, 1.5))
                    
                    monitor.bot_click(submit_locator.first)
                 except Exception as exc:
@@ -480,11 +890,19 @@ def process_excel_rows(
                         return True
                     return False
 
-                monitor.wait_for_condition(find_any_swal, timeout_s=15)
+                monitor.wait_for_condition(
+                    find_any_swal, timeout_s=15, bucket=BUCKET_SERVER
+                )
                 
                 if swal_result == "busy":
-                    log_warn(f"Server Busy detected (Attempt {attempt+1}/{max_server_busy_retries}). Retrying in 3s...")
-                    time.sleep(3)
+                    busy_breaker.record(busy=True)
+                    # A tripped breaker pauses the whole run, then this
+                    # retry is its probe; otherwise back off per row.
+                    if not busy_breaker.wait_if_open():
+                        retry_delay = submit_backoff.delay(busy_count)
+                        log_warn(f"Server Busy detected (Attempt {attempt+1}/{max_server_busy_retries}). Retrying in {retry_delay:.1f}s...")
+                        clock.sleep(retry_delay, BUCKET_COOLDOWN)
+                    busy_count += 1
                     
                     # Click 'Coba Lagi' if available, otherwise just retry submit loop
                     retry_btn = page.locator(".swal2-confirm", has_text="Coba Lagi")
@@ -499,25 +917,33 @@ def process_excel_rows(
                         # But to be safe, if we click Coba Lagi, we should then wait for swal again.
                         
                         # Let's try to just continue the loop effectively acting as re-wait
-                        monitor.wait_for_condition(lambda: False, timeout_s=2)
+                        monitor.wait_for_condition(
+                            lambda: page.locator(".swal2-title", has_text=busy_title).count() == 0,
+                            timeout_s=2,
+                            bucket=BUCKET_SERVER,
+                        )
                         continue 
                     else:
                         # Close popup and click submit again
                         close_btn = page.locator(".swal2-cancel", has_text="Tutup")
                         if close_btn.count() > 0:
                             monitor.bot_click(close_btn.first)
-                        monitor.wait_for_condition(lambda: False, timeout_s=1)
+                        monitor.wait_for_condition(
+                            lambda: page.locator(".swal2-popup").count() == 0,
+                            timeout_s=1,
+                            bucket=BUCKET_SERVER,
+                        )
                         continue
 
                 elif swal_result == "error":
                     log_warn(f"Generic Error popup detected (Attempt {attempt+1}). Attempting aggressive close keys...")
-                    time.sleep(1) # Wait slightly for any animation
+                    clock.sleep(1, BUCKET_DOM) # Wait slightly for any animation
                     
                     # 1. Try Keyboard Enter (Fastest)
                     try:
                         log_info("Action: Press Enter")
                         page.keyboard.press("Enter")
-                        time.sleep(0.5)
+                        clock.sleep(0.5, BUCKET_DOM)
                     except Exception as e:
                         log_warn(f"Action Failed (Enter): {e}")
 
@@ -528,7 +954,7 @@ def process_excel_rows(
                             const btn = document.querySelector('button.swal2-confirm');
                             if(btn) btn.click();
                         """)
-                        time.sleep(0.5)
+                        clock.sleep(0.5, BUCKET_DOM)
                     except Exception as e:
                         log_warn(f"Action Failed (JS Click): {e}")
                     
@@ -550,6 +976,7 @@ def process_excel_rows(
                     continue
 
                 elif swal_result in ["confirm", "success"]:
+                     busy_breaker.record(busy=False)
                      submit_success = True
                      break
                 else:
@@ -585,7 +1012,9 @@ def process_excel_rows(
                 # Find success
                 def find_success_final():
                     return page.locator(".swal2-popup", has_text=success_text).count() > 0
-                if not monitor.wait_for_condition(find_success_final, timeout_s=30): # Increased timeout for final success
+                if not monitor.wait_for_condition(
+                    find_success_final, timeout_s=30, bucket=BUCKET_SERVER
+                ): # Increased timeout for final success
                      status = "gagal"; note = "Dialog sukses tidak muncul"
                      monitor.bot_goto(TARGET_URL); continue
 
@@ -604,96 +1033,179 @@ def process_excel_rows(
             )
             if not page.url.startswith(TARGET_URL):
                 monitor.bot_goto(TARGET_URL)
+            end_phase("submit")
             status = "berhasil"
             note = "Submit sukses"
         except Exception as exc:
-            log_error(
-                "Error while processing row.",
-                idsbr=idsbr or "-",
-                error=str(exc),
-            )
-            status = "error"
-            note = str(exc)
-        finally:
-            run_log_rows.append(
-                {
-                    "no": excel_row,
-                    "idsbr": idsbr or "",
-                    "nama_usaha": nama_usaha or "",
-                    "alamat": alamat or "",
-                    "keberadaanusaha_gc": hasil_gc if hasil_gc is not None else "",
-                    "latitude": latitude or "",
-                    "longitude": longitude or "",
-                    "status": status or "error",
-                    "catatan": note,
-                }
-            )
-            # Save log immediately processed row to ensure resume works
-            try:
-                write_run_log(run_log_rows, run_log_path)
-            except Exception as e:
-                log_warn(f"Failed to write intermediate log: {e}")
-
-            summary_status = status or "error"
-            summary_note = note or "-"
-            summary_fields = {
-                "row": batch_index,
-                "row_excel": excel_row,
-                "idsbr": idsbr or "-",
-                "status": summary_status,
-                "note": summary_note,
-            }
-            if summary_status == "berhasil":
-                log_info("Row summary.", **summary_fields)
-            elif summary_status in {"gagal", "skipped"}:
-                log_warn("Row summary.", **summary_fields)
+            if monitor.should_abort():
+                # Stop request or idle timeout ends the run, not the row.
+                raise
+            failure = None
+            if session is not None and row_attempt < MAX_ROW_ATTEMPTS:
+                failure = session.check_health()
+            if failure:
+                log_warn(
+                    "Browser failed during row; restarting and retrying.",
+                    idsbr=idsbr or "-",
+                    reason=failure,
+                    error=str(exc),
+                )
+                session.restart(failure)
+                page = session.page
+                stats["processed"] -= 1
+                retry_row = True
             else:
-                log_error("Row summary.", **summary_fields)
-            
-            # --- PERSISTENT STATE SAVING ---
-            try:
-                state_data = {
-                    "last_excel": str(excel_file),
-                    "last_row": excel_row,
-                    "timestamp": time.time()
-                }
-                os.makedirs(os.path.dirname(LAST_RUN_STATE_FILE), exist_ok=True)
-                with open(LAST_RUN_STATE_FILE, "w") as f:
-                    json.dump(state_data, f)
-            except Exception:
-                pass
-            # -------------------------------
+                log_error(
+                    "Error while processing row.",
+                    idsbr=idsbr or "-",
+                    error=str(exc),
+                )
+                status = "error"
+                note = str(exc)
+        finally:
+            # A row interrupted by a browser crash is retried on a fresh page;
+            # only the final attempt is logged and counted.
+            if not retry_row:
+                busy_breaker.row_finished()
+                if journal is not None and (
+                    status == "berhasil"
+                    or (status == "skipped" and note in ("Sudah GC", "Duplikat"))
+                ):
+                    try:
+                        journal.record(key, STATE_CONFIRMED, status=status, note=note)
+                    except Exception as e:
+                        log_warn("Failed to write row journal.", error=str(e))
+                # Tuple in RUN_LOG_COLUMNS order.
+                log_row(
+                    (
+                        excel_row,
+                        idsbr or "",
+                        nama_usaha or "",
+                        alamat or "",
+                        hasil_gc if hasil_gc is not None else "",
+                        latitude or "",
+                        longitude or "",
+                        status or "error",
+                        f"{note} ({resolved_note})" if resolved_note else note,
+                    )
+                )
+                if scan_only and status in SCAN_STATUSES:
+                    stats[f"scan_{status}"] += 1
+                elif status in ("berhasil", "skipped"):
+                    fingerprints[key] = fingerprint
+                    fingerprints_dirty += 1
+                    if fingerprints_dirty >= 50:
+                        try:
+                            save_fingerprints(fingerprints, fingerprint_file)
+                            fingerprints_dirty = 0
+                        except Exception as e:
+                            log_warn("Failed to save input fingerprints.", error=str(e))
 
-            # --- PERSISTENT STATE SAVING ---
-            try:
-                state_data = {
-                    "last_excel": str(excel_file),
-                    "last_row": excel_row,
-                    "timestamp": time.time()
+                observed_status = CARD_STATUS_BY_OUTCOME.get((status, note))
+                if card_index is not None and observed_status:
+                    if update_card(
+                        card_index, idsbr, observed_status, nama=nama_usaha, alamat=alamat
+                    ):
+                        card_index_dirty += 1
+                    if card_index_dirty >= 50:
+                        try:
+                            save_card_index(card_index, card_index_file)
+                            card_index_dirty = 0
+                        except Exception as e:
+                            log_warn("Failed to save card index.", error=str(e))
+
+                summary_status = status or "error"
+                summary_note = note or "-"
+                summary_fields = {
+                    "row": batch_index,
+                    "row_excel": excel_row,
+                    "idsbr": idsbr or "-",
+                    "status": summary_status,
+                    "note": summary_note,
                 }
-                os.makedirs(os.path.dirname(LAST_RUN_STATE_FILE), exist_ok=True)
-                with open(LAST_RUN_STATE_FILE, "w") as f:
-                    json.dump(state_data, f)
-                # log_info("State saved.", row=excel_row) # Optional debug
-            except Exception as e:
-                log_warn("Failed to save state.", error=str(e))
-            # -------------------------------
+                if summary_status in {"berhasil", "ready"}:
+                    log_info("Row summary.", **summary_fields)
+                elif summary_status in {"gagal", "skipped"} or scan_only:
+                    log_warn("Row summary.", **summary_fields)
+                else:
+                    log_error("Row summary.", **summary_fields)
 
-            if progress_callback:
-                try:
-                    progress_callback(
-                        stats["processed"],
-                        selected_rows,
-                        excel_row,
+                # --- PERSISTENT STATE SAVING ---
+                if not scan_only:
+                    try:
+                        state_data = {
+                            "last_excel": str(excel_file),
+                            "last_row": excel_row,
+                            "timestamp": time.time()
+                        }
+                        os.makedirs(os.path.dirname(LAST_RUN_STATE_FILE), exist_ok=True)
+                        with open(LAST_RUN_STATE_FILE, "w") as f:
+                            json.dump(state_data, f)
+                        # log_info("State saved.", row=excel_row) # Optional debug
+                    except Exception as e:
+                        log_warn("Failed to save state.", error=str(e))
+                # -------------------------------
+
+                emit_row_finished(
+                    batch_index,
+                    excel_row,
+                    idsbr,
+                    status or "error",
+                    note,
+                    started_at=row_started_at,
+                )
+                if page_metrics is not None:
+                    # Busy-server and rate limit waits are not page slowdown.
+                    cooldown_s = clock.total(BUCKET_COOLDOWN) - row_cooldown_at
+                    page_metrics.record_row(
+                        clock.monotonic() - row_started_at - cooldown_s,
+                        status=status,
                     )
-                except Exception:
-                    pass
 
-            # HUMANIZATION: Random delay after processing row (Success or Error)
-            # This does NOT run for rows skipped at the start of the loop.
-            import random
-            time.sleep(random.uniform(2.0, 4.0))
+                # HUMANIZATION: Random delay after processing row (Success or Error)
+                # This does NOT run for rows skipped at the start of the loop,
+                # nor in scan mode.
+                if not scan_only and humanize:
+                    import random
+                    clock.sleep(random.uniform(2.0, 4.0))
 
+    if fingerprints_dirty:
+        try:
+            save_fingerprints(fingerprints, fingerprint_file)
+        except Exception as e:
+            log_warn("Failed to save input fingerprints.", error=str(e))
+
+    if card_index is not None and card_index_dirty:
+        try:
+            save_card_index(card_index, card_index_file)
+        except Exception as e:
+            log_warn("Failed to save card index.", error=str(e))
+
+    try:
+        search_planner.save()
+    except Exception as e:
+        log_warn("Failed to save search history.", error=str(e))
+
+    if journal is not None:
+        journal.close()
+
+    if session is not None:
+        stats["browser_restarts"] = session.restarts - restarts_at_start
+    if page_metrics is not None:
+        stats["page_recycles"] = page_metrics.recycles
+    stats.update(busy_breaker.stats())
+    time_report = clock.report()
+    for bucket, seconds in time_report.items():
+        stats[f"time_{bucket}_s"] = round(seconds, 1)
     log_info("Processing completed.", _spacer=True, _divider=True, **stats)
-    write_run_log(run_log_rows, run_log_path)
+    log_info("Time accounting.", **format_time_report(time_report))
+    run_log.close()
     log_info("Run log saved.", path=str(run_log_path))
+    events.emit(
+        RUN_FINISHED,
+        stats=dict(stats),
+        duration=clock.monotonic() - run_started_at,
+        run_log_path=str(run_log_path),
+    )
+    if progress_handler:
+        events.unsubscribe(progress_handler)
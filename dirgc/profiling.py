@@ -0,0 +1,157 @@
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+from .events import RUN_STARTED
+from .logging_utils import log_info, log_warn
+from .run_logs import build_run_log_path
+
+PROFILE_TOP_FUNCTIONS = 5
+
+# Checked in order; the first matching category wins. Entries are matched
+# against the profiler's "file:function" label.
+PROFILE_CATEGORIES = (
+    ("playwright", ("playwright", "greenlet", "pyee")),
+    ("sleep", ("time.sleep",)),
+    (
+        "matching",
+        ("dirgc/matching.py", "dirgc/match_index.py", "dirgc/card_index.py"),
+    ),
+    ("logging", ("dirgc/logging_utils.py", "logging/")),
+    (
+        "excel",
+        (
+            "dirgc/excel.py",
+            "dirgc/run_logs.py",
+            "openpyxl",
+            "pandas",
+            "/csv.py",
+            "_csv.",
+        ),
+    ),
+    ("dirgc", ("dirgc/",)),
+)
+
+
+def build_profile_path(run_log_path=None):
+    """run3_0930.csv -> run3_0930.prof, next to the run log."""
+    if run_log_path:
+        return Path(run_log_path).with_suffix(".prof")
+    return build_run_log_path(prefix="profile", suffix=".prof")
+
+
+def function_label(func):
+    filename, line, name = func
+    if filename == "~":
+        # Builtins: "<built-in method time.sleep>", "<method 'switch' of ...>"
+        return name
+    return f"{filename.replace(chr(92), '/')}:{line}({name})"
+
+
+def categorize(label):
+    for category, needles in PROFILE_CATEGORIES:
+        if any(needle in label for needle in needles):
+            return category
+    return "other"
+
+
+def summarize_profile(stats, top=PROFILE_TOP_FUNCTIONS):
+    """Group own (self) time by category.
+
+    Returns {category: {"seconds": float, "top": [(seconds, calls, label)]}}
+    sorted by seconds. Time spent blocked on the Playwright driver shows up
+    as self time of greenlet switches, so "playwright" is mostly IPC wait.
+    """
+    totals = defaultdict(float)
+    functions = defaultdict(list)
+    for func, (_, calls, self_time, _, _) in stats.stats.items():
+        label = function_label(func)
+        category = categorize(label)
+        totals[category] += self_time
+        functions[category].append((self_time, calls, label))
+    summary = {}
+    for category in sorted(totals, key=totals.get, reverse=True):
+        summary[category] = {
+            "seconds": totals[category],
+            "top": sorted(functions[category], reverse=True)[:top],
+        }
+    return summary
+
+
+def format_profile_summary(summary):
+    total = sum(item["seconds"] for item in summary.values()) or 1.0
+    lines = []
+    for category, item in summary.items():
+        lines.append(
+            f"{category}: {item['seconds']:.2f}s "
+            f"({item['seconds'] / total:.0%} of profiled time)"
+        )
+        for seconds, calls, label in item["top"]:
+            lines.append(f"  {seconds * 1000:9.1f} ms {calls:>8} calls  {label}")
+    return lines
+
+
+class RunProfiler:
+    """cProfile the processing loop of one run.
+
+    Subscribe it to the run's EventBus so the profile is written next to the
+    run log (run*.prof); start()/stop() bracket the code to profile. stop()
+    saves the file and logs the hottest functions per category.
+    """
+
+    def __init__(self, top=PROFILE_TOP_FUNCTIONS):
+        self.top = top
+        self.path = None
+        self._run_log_path = None
+        self._profile = None
+
+    def __call__(self, event):
+        if event.kind == RUN_STARTED:
+            self._run_log_path = event.get("run_log_path")
+
+    def start(self):
+        # cProfile/pstats load only when profiling is requested.
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self):
+        if self._profile is None:
+            return None
+        import pstats
+
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        self.path = build_profile_path(self._run_log_path)
+        try:
+            profile.dump_stats(str(self.path))
+        except OSError as exc:
+            log_warn("Failed to save profile.", error=str(exc))
+            self.path = None
+        summary = summarize_profile(pstats.Stats(profile), top=self.top)
+        log_info("Profile saved.", path=str(self.path or "-"))
+        for line in format_profile_summary(summary):
+            log_info(line)
+        return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Summarize a run profile (.prof written by --profile)."
+    )
+    parser.add_argument("profile", help="Path to a .prof file.")
+    parser.add_argument("--top", type=int, default=PROFILE_TOP_FUNCTIONS)
+    return parser
+
+
+def main():
+    import pstats
+
+    args = build_parser().parse_args()
+    summary = summarize_profile(pstats.Stats(args.profile), top=args.top)
+    print("\n".join(format_profile_summary(summary)))
+
+
+if __name__ == "__main__":
+    main()
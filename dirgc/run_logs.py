@@ -1,15 +1,27 @@
 import csv
+import os
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
 LOGS_DIR = "logs"
-
-def _next_run_number(date_dir):
+RUN_LOG_COLUMNS = (
+    "no",
+    "idsbr",
+    "nama_usaha",
+    "alamat",
+    "keberadaanusaha_gc",
+    "latitude",
+    "longitude",
+    "status",
+    "catatan",
+)
+
+def _next_run_number(date_dir, prefix="run"):
     max_run = 0
-    # Scan both xlsx (legacy) and csv
-    for path in list(date_dir.glob("run*_*.xlsx")) + list(date_dir.glob("run*_*.csv")):
-        match = re.match(r"run(\d+)_", path.stem)
+    # Scan every extension: xlsx (legacy), csv and the GUI's .log files
+    for path in date_dir.glob(f"{prefix}*_*.*"):
+        match = re.match(rf"{prefix}(\d+)_", path.stem)
         if not match:
             continue
         try:
@@ -21,44 +33,80 @@ def _next_run_number(date_dir):
     return max_run + 1
 
 
-def build_run_log_path(now=None):
+def build_run_log_path(now=None, prefix="run", suffix=".csv"):
     now = now or datetime.now()
     date_folder = now.strftime("%Y%m%d")
     date_dir = Path(LOGS_DIR) / date_folder
     date_dir.mkdir(parents=True, exist_ok=True)
-    run_number = _next_run_number(date_dir)
+    run_number = _next_run_number(date_dir, prefix)
     time_label = now.strftime("%H%M")
-    filename = f"run{run_number}_{time_label}.csv"
+    filename = f"{prefix}{run_number}_{time_label}{suffix}"
     return date_dir / filename
 
 
 def write_run_log(rows, output_path):
-    columns = [
-        "no",
-        "idsbr",
-        "nama_usaha",
-        "alamat",
-        "keberadaanusaha_gc",
-        "latitude",
-        "longitude",
-        "status",
-        "catatan",
-    ]
-
-    # Write CSV using standard library
+    """Write run log rows (dicts or tuples in RUN_LOG_COLUMNS order) as CSV."""
     str_path = str(output_path)
     try:
         with open(str_path, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=columns)
-            writer.writeheader()
+            writer = csv.writer(f)
+            writer.writerow(RUN_LOG_COLUMNS)
             for row in rows:
-                # Ensure all fields exist
-                clean_row = {col: str(row.get(col, "")) for col in columns}
-                writer.writerow(clean_row)
+                if isinstance(row, dict):
+                    # Ensure all fields exist
+                    row = [row.get(col, "") for col in RUN_LOG_COLUMNS]
+                writer.writerow([str(value) for value in row])
     except Exception as e:
         raise RuntimeError(f"Failed to write CSV log: {e}")
 
 
+class RunLogWriter:
+    """Append-only run log: the header once, then one flushed line per row.
+
+    Rows are on disk as soon as they finish (resume reads the log), without
+    rewriting the whole file each time.
+    """
+
+    def __init__(self, output_path):
+        self.path = output_path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def _open(self):
+        str_path = str(self.path)
+        write_header = not os.path.exists(str_path) or os.path.getsize(str_path) == 0
+        self._file = open(str_path, mode="a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(RUN_LOG_COLUMNS)
+
+    def append(self, row):
+        """Write one row (dict or tuple in RUN_LOG_COLUMNS order)."""
+        try:
+            if self._file is None:
+                self._open()
+            if isinstance(row, dict):
+                row = [row.get(col, "") for col in RUN_LOG_COLUMNS]
+            self._writer.writerow([str(value) for value in row])
+            self._file.flush()
+        except Exception as e:
+            raise RuntimeError(f"Failed to write CSV log: {e}")
+        self.count += 1
+
+    def close(self):
+        """Close the file; a run without rows still gets the header."""
+        try:
+            if self._file is None:
+                self._open()
+        except Exception as e:
+            raise RuntimeError(f"Failed to write CSV log: {e}")
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
 def _read_log_file(path):
     """Helper to read log file (CSV or Excel) into DataFrame or list of dicts."""
     path_str = str(path)
@@ -0,0 +1,108 @@
+import json
+import os
+
+from .settings import SEARCH_HISTORY_FILE
+
+PREFIX_LEN = 4
+MIN_SAMPLES = 5
+FAST_UNIQUE_RATE = 0.9
+COMBINED_RATE = 0.7
+# "fast" skips the slow-load recheck; allow it while rechecks rarely help.
+MAX_RECHECK_RATE = 0.05
+# Weight kept by older rows on every new one (~20-row memory), so history
+# follows the server instead of one early recheck deciding the whole run.
+HISTORY_DECAY = 0.95
+# Every Nth row of a pattern uses the default strategy again so a learned
+# shortcut is re-validated when the server behaviour changes.
+EXPLORE_EVERY = 10
+
+
+def pattern_key(idsbr):
+    """IDSBR shape used to group history: length plus leading digits."""
+    idsbr = str(idsbr or "")
+    return f"{len(idsbr)}:{idsbr[:PREFIX_LEN]}"
+
+
+class SearchPlanner:
+    """Pick the cheapest likely-successful apply_filter strategy per row.
+
+    History is kept per IDSBR pattern (pattern_key). Only rows searched by
+    IDSBR first ("default"/"fast") say how often that search is unique on
+    its own, needs the slow-load recheck, or has to fall back to the
+    combined idsbr + nama + alamat query. Counts decay with every new row
+    and only searches that ended in a match count as resolved.
+    """
+
+    def __init__(self, history=None):
+        self.history = history or {}
+        self._uses = {}
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or SEARCH_HISTORY_FILE
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            data = {}
+        return cls(data.get("patterns", {}))
+
+    def save(self, path=None):
+        path = path or SEARCH_HISTORY_FILE
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"patterns": self.history}, handle, indent=2)
+        os.replace(temp_path, path)
+
+    def choose(self, idsbr, has_details):
+        if not idsbr:
+            return "default"
+        key = pattern_key(idsbr)
+        stats = self.history.get(key)
+        if not stats or stats.get("samples", 0) < MIN_SAMPLES:
+            return "default"
+        uses = self._uses.get(key, 0) + 1
+        self._uses[key] = uses
+        if uses % EXPLORE_EVERY == 0:
+            return "default"
+
+        samples = stats["samples"]
+        if has_details and stats.get("combined", 0) / samples >= COMBINED_RATE:
+            return "combined"
+        if (
+            stats.get("unique_first", 0) / samples >= FAST_UNIQUE_RATE
+            and stats.get("recheck_resolved", 0) / samples <= MAX_RECHECK_RATE
+        ):
+            return "fast"
+        return "default"
+
+    def record(self, idsbr, outcome, matched):
+        """Update history from apply_filter's outcome for one row."""
+        if not idsbr:
+            return
+        steps = outcome.get("steps") or []
+        if not steps:
+            return
+        stats = self.history.setdefault(pattern_key(idsbr), {"samples": 0})
+        resolved_by = steps[-1]
+        if steps[0] == "combined":
+            stats["combined_direct"] = stats.get("combined_direct", 0) + 1
+            if matched:
+                stats["combined_direct_ok"] = stats.get("combined_direct_ok", 0) + 1
+            return
+
+        for name in ("samples", "unique_first", "recheck_resolved", "combined"):
+            if name in stats:
+                stats[name] = round(stats[name] * HISTORY_DECAY, 4)
+        stats["samples"] += 1
+        if not matched:
+            return
+        if resolved_by == "idsbr":
+            stats["unique_first"] = stats.get("unique_first", 0) + 1
+        elif resolved_by == "recheck":
+            stats["recheck_resolved"] = stats.get("recheck_resolved", 0) + 1
+        elif resolved_by == "combined":
+            stats["combined"] = stats.get("combined", 0) + 1
@@ -0,0 +1,271 @@
+import os
+import re
+import time
+
+from .logging_utils import log_info, log_warn
+from .settings import DEFAULT_WEB_TIMEOUT_S, LOGIN_PATH, MATCHAPRO_HOST
+
+MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 12; M2010J19CG Build/SKQ1.211202.001; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/143.0.7499.192 Mobile Safari/537.36"
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-infobars',
+    '--window-position=-5,-5',
+    '--disable-extensions',
+    f'--user-agent={MOBILE_USER_AGENT}',
+]
+
+# CONTEXT ANDROID WEBVIEW
+CONTEXT_OPTIONS = {
+    "viewport": {'width': 390, 'height': 844},
+    "screen": {'width': 1080, 'height': 2340},
+    "device_scale_factor": 2.625,
+    "is_mobile": True,
+    "has_touch": True,
+    "user_agent": MOBILE_USER_AGENT,
+    "extra_http_headers": {
+        "Sec-Ch-Ua": '"Android WebView";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
+        "Sec-Ch-Ua-Mobile": "?1",
+        "Sec-Ch-Ua-Platform": '"Android"',
+    },
+    "java_script_enabled": True,
+    "permissions": ["geolocation"],
+}
+
+# STEALTH SCRIPTS - HAPUS SEMUA DETECTION FLAGS
+STEALTH_SCRIPT = """
+    // Hapus webdriver flag
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    
+    // Override Chrome detection
+    window.chrome = {runtime: {}};
+    
+    // Permissions & languages Android
+    Object.defineProperty(navigator, 'permissions', {
+        get: () => ({query: () => Promise.resolve({state: 'granted'})})});
+    
+    // Plugins empty (mobile)
+    Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
+    
+    // Languages Indonesia
+    Object.defineProperty(navigator, 'languages', {get: () => ['id-ID', 'id', 'en-US', 'en']});
+    
+    // WebGL fingerprint spoof
+    const getParameter = WebGLRenderingContext.getParameter;
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) return 'Intel Inc.';
+        if (parameter === 37446) return 'Intel(R) UHD Graphics 630';
+        return getParameter(parameter);
+    };
+"""
+
+
+HEALTH_CHECK_TIMEOUT_MS = 5000
+MAX_BROWSER_RESTARTS = 5
+
+
+# Only DIRGC traffic goes into a HAR: the SSO and /login form POSTs carry
+# the plaintext password.
+HAR_URL_FILTER = re.compile(
+    rf"^https?://{re.escape(MATCHAPRO_HOST)}(?!{re.escape(LOGIN_PATH)}(?:[/?#]|$))(?:[/?#]|$)"
+)
+
+
+def har_state_path(har_path):
+    """Cookies saved next to a recorded HAR: session.har -> session.har.state.json."""
+    return f"{har_path}.state.json"
+
+
+class BrowserSession:
+    """Owns the browser, context and page of a run and rebuilds them.
+
+    The page is watched for "crash" and "close" events, and check_health()
+    also probes it with a trivial wait_for_function so a hung renderer is
+    caught. restart() carries cookies over when the context can still be
+    read, then opens a fresh page. Hooks from add_page_hook() run on every
+    new page, and the attached ActivityMonitor is re-pointed, so callers
+    just re-read session.page after a restart.
+
+    With `record_har_path` the DIRGC requests of the context (not the
+    login) are written to a HAR file on close, plus the session cookies
+    next to it; `replay_har_path` serves
+    such a recording through route_from_har and aborts anything not in it,
+    so a run can be repeated offline.
+    """
+
+    def __init__(
+        self,
+        playwright,
+        headless=False,
+        web_timeout_s=DEFAULT_WEB_TIMEOUT_S,
+        max_restarts=MAX_BROWSER_RESTARTS,
+        record_har_path=None,
+        replay_har_path=None,
+    ):
+        self._playwright = playwright
+        self.headless = headless
+        self.web_timeout_s = web_timeout_s
+        self.max_restarts = max_restarts
+        self.record_har_path = record_har_path
+        self.replay_har_path = replay_har_path
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.restarts = 0
+        self._page_hooks = []
+        self._monitor = None
+        self._broken_reason = None
+
+    def start(self):
+        self.browser = self._launch_browser()
+        self._open_page()
+        return self.page
+
+    def _launch_browser(self):
+        return self._playwright.chromium.launch(
+            headless=self.headless, args=BROWSER_ARGS
+        )
+
+    def _open_page(self, storage_state=None):
+        options = dict(CONTEXT_OPTIONS)
+        if self.replay_har_path and storage_state is None:
+            state_path = har_state_path(self.replay_har_path)
+            if os.path.exists(state_path):
+                storage_state = state_path
+        if storage_state:
+            options["storage_state"] = storage_state
+        if self.record_har_path:
+            har_path = self.record_har_path
+            if self.restarts:
+                # The previous context already wrote its HAR on close.
+                stem, suffix = os.path.splitext(har_path)
+                har_path = f"{stem}_{self.restarts}{suffix}"
+            options["record_har_path"] = har_path
+            options["record_har_url_filter"] = HAR_URL_FILTER
+        self.context = self.browser.new_context(**options)
+        if self.replay_har_path:
+            self.context.route_from_har(self.replay_har_path, not_found="abort")
+        self._open_page_in_context()
+
+    def _open_page_in_context(self):
+        page = self.context.new_page()
+        page.set_default_timeout(self.web_timeout_s * 1000)
+        page.set_default_navigation_timeout(self.web_timeout_s * 1000)
+        page.add_init_script(STEALTH_SCRIPT)
+        page.on("crash", lambda crashed: self._mark_broken("crash", crashed))
+        page.on("close", lambda closed: self._mark_broken("close", closed))
+        self.page = page
+        self._broken_reason = None
+        if self._monitor is not None:
+            self._monitor.page = page
+        for hook in self._page_hooks:
+            hook(page)
+
+    def _mark_broken(self, reason, page):
+        # Events from pages we already replaced are ignored.
+        if page is self.page and self._broken_reason is None:
+            self._broken_reason = reason
+
+    def attach_monitor(self, monitor):
+        self._monitor = monitor
+        monitor.page = self.page
+
+    def add_page_hook(self, hook, apply_now=True):
+        """Run hook(page) for the current page (optionally) and every new one."""
+        self._page_hooks.append(hook)
+        if apply_now and self.page is not None:
+            hook(self.page)
+
+    def check_health(self):
+        """Return None when the page responds, else the reason it does not."""
+        if self._broken_reason:
+            return self._broken_reason
+        if self.page is None or self.page.is_closed():
+            return "close"
+        if not self.browser.is_connected():
+            return "disconnected"
+        try:
+            self.page.wait_for_function(
+                "() => true", timeout=HEALTH_CHECK_TIMEOUT_MS
+            )
+        except Exception:
+            return "unresponsive"
+        return None
+
+    def restart(self, reason):
+        if self.restarts >= self.max_restarts:
+            raise RuntimeError(
+                f"Browser failed again ({reason}) after {self.restarts} restarts."
+            )
+        self.restarts += 1
+        log_warn("Restarting browser context.", reason=reason, count=self.restarts)
+        started = time.monotonic()
+        storage_state = None
+        if self.context is not None:
+            try:
+                storage_state = self.context.storage_state()
+            except Exception:
+                storage_state = None
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        if not self.browser.is_connected():
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = self._launch_browser()
+        self._open_page(storage_state)
+        log_info(
+            "Browser context restarted.",
+            count=self.restarts,
+            cookies="kept" if storage_state else "new",
+            duration=f"{time.monotonic() - started:.1f}s",
+        )
+        return self.page
+
+    def recycle_page(self, reason):
+        """Swap in a fresh page on the same context (cookies stay)."""
+        log_info("Recycling page.", reason=reason)
+        old_page = self.page
+        self._open_page_in_context()
+        try:
+            old_page.close()
+        except Exception:
+            pass
+        return self.page
+
+    def ensure_healthy(self):
+        """Restart when the page is gone or hung; return True if it did."""
+        reason = self.check_health()
+        if reason is None:
+            return False
+        self.restart(reason)
+        return True
+
+    def close(self):
+        if self.record_har_path and self.context is not None:
+            state_path = har_state_path(self.record_har_path)
+            try:
+                self.context.storage_state(path=state_path)
+                # Session cookies in plain text: owner-only.
+                os.chmod(state_path, 0o600)
+            except Exception as exc:
+                log_warn("Failed to save HAR cookies.", error=str(exc))
+            else:
+                log_warn(
+                    "HAR recording contains session cookies; do not share it.",
+                    har=self.record_har_path,
+                    cookies=state_path,
+                )
+        for target in (self.context, self.browser):
+            if target is None:
+                continue
+            try:
+                target.close()
+            except Exception:
+                pass
@@ -26,3 +26,10 @@ VALID_HASIL_GC_CODES = set(HASIL_GC_LABELS.keys())
 MAX_MATCH_LOGS = 3
 
 BLOCK_UI_SELECTOR = ".blockUI.blockOverlay"
+
+INPUT_FINGERPRINT_FILE = os.path.join("config", "input_fingerprints.csv")
+CARD_INDEX_FILE = os.path.join("config", "card_index.json")
+CARD_INDEX_MAX_AGE_H = 24
+MATCH_CORPUS_DIR = os.path.join("logs", "match_corpus")
+SEARCH_HISTORY_FILE = os.path.join("config", "search_history.json")
+ROW_JOURNAL_FILE = os.path.join("config", "row_journal.jsonl")
@@ -0,0 +1,96 @@
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("playwright", "pandas", "openpyxl")
+DEFAULT_TARGETS = (
+    ("gui", "import dirgc.gui.app", 400),
+    ("cli --help", "import sys; sys.argv = ['dirgc', '--help']\n"
+     "from dirgc.cli import main\n"
+     "try:\n    main()\nexcept SystemExit:\n    pass", 100),
+)
+
+
+def measure_imports(code, python=None):
+    """Run `code` under -X importtime; return (total_ms, imported module names)."""
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total_us = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Only top-level entries carry the full cumulative cost.
+        if not name.startswith("  "):
+            total_us += int(parts[1])
+        modules.append(name.strip())
+    return total_us / 1000.0, modules
+
+
+def check_target(label, code, budget_ms, python=None):
+    """Return a list of budget violations for one startup path."""
+    total_ms, modules = measure_imports(code, python)
+    heavy = sorted(
+        {
+            name.split(".")[0]
+            for name in modules
+            if name.split(".")[0] in HEAVY_MODULES
+        }
+    )
+    print(f"{label}: {total_ms:.1f} ms imports (budget {budget_ms} ms)")
+    problems = []
+    if heavy:
+        problems.append(f"{label}: heavy modules imported at startup: {', '.join(heavy)}")
+    if total_ms > budget_ms:
+        problems.append(f"{label}: {total_ms:.1f} ms exceeds {budget_ms} ms")
+    return problems
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure import time of the GUI and CLI entry points with "
+            "-X importtime and fail when they exceed the startup budget or "
+            "load playwright/pandas/openpyxl eagerly."
+        )
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget (for slow machines or the packaged exe).",
+    )
+    parser.add_argument(
+        "--skip-gui",
+        action="store_true",
+        help="Only check the CLI (e.g. when PyQt5 is not installed).",
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    problems = []
+    for label, code, budget_ms in DEFAULT_TARGETS:
+        if args.skip_gui and label == "gui":
+            continue
+        try:
+            problems.extend(check_target(label, code, budget_ms * args.scale))
+        except RuntimeError as exc:
+            problems.append(f"{label}: import failed: {exc}")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()